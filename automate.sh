@@ -111,16 +111,16 @@ compile_timed() {
 }
 
 watch_all() {
-    local profile="${1:-default}"
-    log_info "Watching both thesis and sample chapter with profile: $profile"
+    local profiles=("${@:-default}")
+    log_info "Watching both thesis and sample chapter with profile(s): ${profiles[*]}"
     log_info "Note: This will run in foreground. Use Ctrl+C to stop."
 
-    watch_thesis "$profile" > >(sed 's/^/[THESIS] /') &
-    pid1=$!
-    watch_sample "$profile" > >(sed 's/^/[SAMPLE] /') &
-    pid2=$!
-
-    wait $pid1 $pid2
+    local args=(--target "$THESIS_FILE" --target "$SAMPLE_FILE")
+    local profile
+    for profile in "${profiles[@]}"; do
+        args+=(--profile "$profile")
+    done
+    python scripts/watch.py "${args[@]}"
 }
 
 watch_sample() {
@@ -223,7 +223,7 @@ Commands:
     compare                 Compare build performance across all profiles
     watch [profile]          Watch thesis for changes and recompile
     watch-sample [profile]   Watch sample chapter for changes and recompile
-    watch-all [profile]      Watch both files simultaneously
+    watch-all [profile...]   Watch both files, rebuilding only what a change affects
     monitor [profile] [duration] Monitor and auto-compile on changes (default duration: 60s)
     deps [profile]           Analyze project dependencies
     clean                   Remove build directory
@@ -650,7 +650,7 @@ case "$1" in
         watch_sample "$2"
         ;;
     watch-all)
-        watch_all "$2"
+        watch_all "${@:2}"
         ;;
     monitor)
         monitor_build "$2" "$3"
@@ -0,0 +1,17 @@
+"""Compile-scaling benchmarks for the thesis template.
+
+Synthetic theses are generated on top of `lib.typ`'s `thesis()` and compiled
+under each build profile across a sweep of sizes; see `python -m benchmarks
+--help`. The generators reuse the writers in `scripts/`, which are standalone
+modules rather than a package, so that directory is put on the import path.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,179 @@
+"""Compile-scaling benchmark for the thesis template.
+
+Generates synthetic theses that grow along one dimension at a time (chapters,
+figures per chapter, citations, abbreviations, glossary entries, index marks),
+compiles each under every build profile and writes the curves of compile
+time, CPU time, peak memory, PDF size and page count to CSV and JSON. Any
+dimension along which a metric grows faster than linearly is flagged.
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks --profiles draft --dimensions glossary_entries index_marks --scales 1 2 4 8 16
+    python -m benchmarks --stub            # offline, with benchmarks/stub_typst.py
+    python -m benchmarks --self-test       # check the harness itself against the stub
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from . import REPO_ROOT
+from .generate import DIMENSIONS, ThesisSize
+from .sweep import (DEFAULT_SCALES, DEFAULT_THRESHOLD, PROFILES, BenchmarkError, Growth, Measurement,
+                    find_growth, run_sweep, write_csv, write_json)
+
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "build" / "benchmarks"
+STUB_TYPST = Path(__file__).resolve().parent / "stub_typst.py"
+
+
+def typst_command(args: argparse.Namespace) -> List[str]:
+    if args.stub:
+        return [sys.executable, str(STUB_TYPST)]
+    return [args.typst]
+
+
+def typst_version(command: Sequence[str]) -> str:
+    try:
+        process = subprocess.run(list(command) + ["--version"], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, text=True, check=False)
+    except OSError as exc:
+        raise BenchmarkError(f"Cannot run {command[-1]}: {exc}; install Typst or pass --stub") from exc
+    return process.stdout.strip()
+
+
+def _print_measurement(measurement: Measurement) -> None:
+    rss = "-" if measurement.max_rss_bytes is None else f"{measurement.max_rss_bytes / 1048576:.0f} MiB"
+    print(f"{measurement.profile:8} {measurement.dimension:20} x{measurement.scale:<3} "
+          f"{measurement.wall_seconds:8.3f}s  {rss:>8}  {measurement.pages or '-':>5} pages", flush=True)
+
+
+def _print_growth(growth: List[Growth], threshold: float) -> None:
+    flagged = [entry for entry in growth if entry.superlinear]
+    if not flagged:
+        print(f"No superlinear growth (threshold: exponent > {threshold:g}).")
+        return
+    print(f"Superlinear growth (exponent > {threshold:g}):")
+    for entry in flagged:
+        print(f"  - {entry.profile}/{entry.dimension}: {entry.metric} grows as scale^{entry.exponent:.2f}")
+
+
+def run_benchmark(args: argparse.Namespace) -> int:
+    command = typst_command(args)
+    base = replace(ThesisSize(), **{name: value for name, value in vars(args).items()
+                                    if name in DIMENSIONS and value is not None})
+    version = typst_version(command)
+    print(f"Benchmarking with {version}")
+    measurements = run_sweep(command, args.output_dir / "projects", args.profiles, args.dimensions,
+                             args.scales, base, args.repeat, args.timeout, _print_measurement)
+    growth = find_growth(measurements, args.threshold)
+    write_csv(args.output_dir / "results.csv", measurements)
+    write_json(args.output_dir / "results.json", measurements, growth, {
+        "typst": version,
+        "base_size": base.as_dict(),
+        "scales": list(args.scales),
+        "threshold": args.threshold,
+    })
+    print(f"Wrote {args.output_dir / 'results.csv'} and {args.output_dir / 'results.json'}")
+    _print_growth(growth, args.threshold)
+    if args.strict and any(entry.superlinear for entry in growth):
+        return 1
+    return 0
+
+
+def self_test(output_dir: Path) -> int:
+    """Run small sweeps against the stub and check the growth detection.
+
+    The stub's cost is linear in source size by default and quadratic with
+    ``BENCH_STUB_EXPONENT=2``; only the second must be flagged.
+    """
+    command = [sys.executable, str(STUB_TYPST)]
+    base = ThesisSize(glossary_entries=500)
+    scales = (1, 2, 4, 8)
+    failures = []
+    previous = os.environ.get("BENCH_STUB_EXPONENT")
+    try:
+        for exponent, expect_flag in (("1", False), ("2", True)):
+            os.environ["BENCH_STUB_EXPONENT"] = exponent
+            work_dir = output_dir / "self-test" / f"exponent-{exponent}"
+            measurements = run_sweep(command, work_dir, ("default",), ("glossary_entries",), scales, base)
+            write_csv(work_dir / "results.csv", measurements)
+            if len(measurements) != len(scales):
+                failures.append(f"exponent {exponent}: expected {len(scales)} cases, got {len(measurements)}")
+            pages = [measurement.pages for measurement in measurements]
+            if pages != sorted(pages) or pages[0] == pages[-1]:
+                failures.append(f"exponent {exponent}: page counts do not grow with size: {pages}")
+            for entry in find_growth(measurements):
+                if entry.metric == "wall_seconds" and entry.superlinear != expect_flag:
+                    failures.append(f"exponent {exponent}: {entry.profile} wall time fitted as "
+                                    f"scale^{entry.exponent}, expected {'super' if expect_flag else ''}linear")
+    finally:
+        if previous is None:
+            os.environ.pop("BENCH_STUB_EXPONENT", None)
+        else:
+            os.environ["BENCH_STUB_EXPONENT"] = previous
+        shutil.rmtree(output_dir / "self-test", ignore_errors=True)
+
+    if failures:
+        print("Benchmark self-test failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("Benchmark self-test passed")
+    return 0
+
+
+def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Measure how compile time and memory scale with thesis size.")
+    parser.add_argument("--typst", default="typst", help="Typst executable (default: typst)")
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub compiler instead of Typst")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES),
+                        help="Profiles to compile (default: all)")
+    parser.add_argument("--dimensions", nargs="+", choices=DIMENSIONS, default=list(DIMENSIONS),
+                        help="Dimensions to sweep, one at a time (default: all)")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES),
+                        help="Multiples of the base size to compile (default: 1 2 4 8)")
+    defaults = ThesisSize()
+    for name in DIMENSIONS:
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int,
+                            help=f"Base {name.replace('_', ' ')} (default: {getattr(defaults, name)})")
+    parser.add_argument("--repeat", type=int, default=1, help="Compiles per case; the median time is kept")
+    parser.add_argument("--timeout", type=float, help="Kill a compile after this many seconds")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Growth exponent above which a curve is flagged (default: {DEFAULT_THRESHOLD:g})")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help="Where projects and results are written (default: build/benchmarks)")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero when any growth is superlinear")
+    parser.add_argument("--self-test", action="store_true",
+                        help="Check the harness against the stub compiler and exit")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str]) -> int:
+    args = parse_args(argv)
+    if args.self_test:
+        return self_test(args.output_dir)
+    if args.repeat < 1:
+        print("Error: --repeat must be at least 1", file=sys.stderr)
+        return 2
+    if min(args.scales) < 1:
+        print("Error: --scales must be at least 1", file=sys.stderr)
+        return 2
+    if any(getattr(args, name) is not None and getattr(args, name) < 0 for name in DIMENSIONS) or args.chapters == 0:
+        print("Error: base sizes must not be negative, and a thesis needs at least one chapter", file=sys.stderr)
+        return 2
+    try:
+        return run_benchmark(args)
+    except BenchmarkError as exc:
+        print(f"Benchmark failed: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,241 @@
+"""Generate synthetic theses of a given size on top of the template.
+
+A project is a copy of the files `thesis.typ` can read (found with
+`typst_deps`), plus:
+
+- `bench-thesis.typ`, calling `thesis()` with the glossary, abbreviation
+  list, bibliography and index enabled
+- `chapters/chapter-NNN.typ` with body text, figures, citations,
+  abbreviation and glossary uses and `index-term` marks
+- `synthetic.bib` with the cited entries
+- synthetic abbreviations and glossary entries appended to the copied
+  `config/abbreviations.typ` and `config/glossary.typ`, with their
+  precomputed modules and `config/index-terms.typ` regenerated the way the
+  scripts in `scripts/` would
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from . import REPO_ROOT
+from build_index import build_table, render_module, scan_sources
+from manage_abbreviations import compiled_module_path, render_compiled_module
+from manage_terms import build_glossary_layout, render_glossary_layout
+from term_records import Abbreviation, GlossaryTerm
+from typst_data import atomic_write_text, format_entry, format_string, parse_array, render_array
+from typst_deps import DependencyGraph
+
+MAIN_DOCUMENT = "bench-thesis.typ"
+BIBLIOGRAPHY = "synthetic.bib"
+GLOSSARY_CATEGORIES = ("Method", "Theory", "Data", "Tooling")
+SECTIONS_PER_CHAPTER = 3
+# Distinct index terms per mark; repeated marks exercise page-list merging
+INDEX_TERM_RATIO = 3
+
+
+@dataclass(frozen=True)
+class ThesisSize:
+    """How much of each feature a synthetic thesis contains."""
+
+    chapters: int = 4
+    figures_per_chapter: int = 2
+    citations: int = 20
+    abbreviations: int = 25
+    glossary_entries: int = 25
+    index_marks: int = 60
+
+    def scaled(self, dimension: str, factor: int) -> "ThesisSize":
+        """Return a copy with ``dimension`` multiplied by ``factor``."""
+        return replace(self, **{dimension: getattr(self, dimension) * factor})
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+DIMENSIONS = tuple(field.name for field in fields(ThesisSize))
+
+
+def _copy_template(destination: Path, template_root: Path) -> None:
+    graph = DependencyGraph(template_root)
+    closure = graph.closure(template_root / "thesis.typ")
+    paths = set(closure.paths)
+    if closure.dynamic:
+        paths |= graph.assets()
+    graph.save()
+    for path in sorted(paths):
+        if not path.is_file():
+            continue
+        target = destination / path.relative_to(graph.root)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+
+
+def _synthetic_abbreviations(count: int) -> List[Abbreviation]:
+    return [
+        Abbreviation(f"Synthetic Measure {index}", f"SYN{index}",
+                     f"A synthetic abbreviation used to benchmark the list of abbreviations ({index}).",
+                     GLOSSARY_CATEGORIES[index % len(GLOSSARY_CATEGORIES)])
+        for index in range(count)
+    ]
+
+
+def _synthetic_glossary(count: int) -> List[GlossaryTerm]:
+    return [
+        GlossaryTerm(f"Synthetic Term {index}",
+                     f"A synthetic glossary entry used to benchmark glossary layout and lookup ({index}).",
+                     GLOSSARY_CATEGORIES[index % len(GLOSSARY_CATEGORIES)],
+                     (f"Synthetic Term {index - 1}",) if index else ())
+        for index in range(count)
+    ]
+
+
+def _append_entries(path: Path, binding: str, entries: Iterable[Dict]) -> List[Dict]:
+    """Append ``entries`` to the array bound to ``binding``; return the whole array."""
+    source = path.read_text(encoding="utf-8")
+    parsed = parse_array(source, binding)
+    elements = [(index, source[start:end]) for index, (start, end) in enumerate(parsed.spans)]
+    added = list(entries)
+    elements += [(None, format_entry(entry)) for entry in added]
+    text, _ = render_array(source, parsed, elements)
+    atomic_write_text(path, text)
+    return parsed.entries + added
+
+
+def _chapter(number: int, size: ThesisSize, citations: List[int], abbreviations: List[int],
+             glossary: List[int], marks: List[int]) -> str:
+    lines = [
+        f"// Synthetic chapter {number}; generated by benchmarks/generate.py.",
+        '#import "../lib.typ": *',
+        '#import "../config/abbreviations.typ": abbrev',
+        '#import "../config/glossary.typ": term',
+        "",
+        f"= Synthetic Chapter {number} <chapter-{number}>",
+        "",
+    ]
+    for section in range(SECTIONS_PER_CHAPTER):
+        lines += [f"== Section {number}.{section + 1}", "", "#lorem(120)", ""]
+        for figure in range(section, size.figures_per_chapter, SECTIONS_PER_CHAPTER):
+            label = f"fig-{number}-{figure + 1}"
+            lines += [
+                "#figure(",
+                f"  rect(width: 80%, height: 3cm, fill: luma(230))[Figure {number}.{figure + 1}],",
+                f"  caption: [Synthetic figure {number}.{figure + 1}.],",
+                f") <{label}>",
+                "",
+                f"As @{label} shows, the synthetic results are consistent.",
+                "",
+            ]
+    uses = []
+    uses += [f"@synthetic-{index}" for index in citations]
+    uses += [f'#abbrev("SYN{index}")' for index in abbreviations]
+    uses += [f'#term("Synthetic Term {index}")' for index in glossary]
+    distinct = max(1, size.index_marks // INDEX_TERM_RATIO)
+    uses += [f'#index-term("Synthetic Concept {index % distinct}")' for index in marks]
+    # Ten uses per paragraph, so paragraphs grow with every dimension
+    for start in range(0, len(uses), 10):
+        lines += ["Synthetic text " + " and ".join(uses[start:start + 10]) + ".", ""]
+    return "\n".join(lines) + "\n"
+
+
+def _bibliography(count: int) -> str:
+    entries = []
+    for index in range(max(1, count)):
+        entries.append(
+            f"@article{{synthetic-{index},\n"
+            f"  title={{Synthetic Article {index}}},\n"
+            f"  author={{Author, Synthetic and Writer, Example}},\n"
+            f"  journal={{Journal of Benchmarks}},\n"
+            f"  volume={{{index % 40 + 1}}},\n"
+            f"  year={{{2000 + index % 25}}}\n"
+            f"}}\n"
+        )
+    return "\n".join(entries)
+
+
+def _main_document(size: ThesisSize) -> str:
+    includes = [f'#include "chapters/chapter-{number:03d}.typ"' for number in range(1, size.chapters + 1)]
+    return "\n".join([
+        "// Synthetic thesis for compile-scaling benchmarks; generated by benchmarks/generate.py.",
+        f"// Size: {', '.join(f'{name}={value}' for name, value in size.as_dict().items())}",
+        '#import "lib.typ": *',
+        "",
+        "#show: thesis.with(",
+        '  title: "A Synthetic Thesis for Benchmarking",',
+        '  author: "Benchmark Author",',
+        '  degree: "Doctor of Philosophy",',
+        '  department: "Department of Benchmarks",',
+        '  school: "School of Synthetic Studies",',
+        '  university: "The University of Melbourne",',
+        "  submission_date: datetime(year: 2025, month: 1, day: 1),",
+        "  abstract: [#lorem(150)],",
+        f"  bibliography_path: {format_string(BIBLIOGRAPHY)},",
+        "  include_glossary: true,",
+        "  include_abbreviations: true,",
+        "  include_index: true,",
+        ")",
+        "",
+        *includes,
+        "",
+    ])
+
+
+def _spread(count: int, buckets: int) -> List[List[int]]:
+    """Deal ``count`` indices round-robin into ``buckets`` lists."""
+    spread: List[List[int]] = [[] for _ in range(buckets)]
+    for index in range(count):
+        spread[index % buckets].append(index)
+    return spread
+
+
+def generate_project(size: ThesisSize, destination: Path, template_root: Path = REPO_ROOT) -> Path:
+    """Write a synthetic thesis of ``size`` to ``destination``; return its main document."""
+    if size.chapters < 1:
+        raise ValueError("A synthetic thesis needs at least one chapter")
+    if destination.exists():
+        shutil.rmtree(destination)
+    destination.mkdir(parents=True)
+    _copy_template(destination, template_root)
+
+    config = destination / "config"
+    abbreviations = [Abbreviation.from_dict(entry) for entry in _append_entries(
+        config / "abbreviations.typ", "abbreviations",
+        (entry.to_dict() for entry in _synthetic_abbreviations(size.abbreviations)))]
+    atomic_write_text(compiled_module_path(config / "abbreviations.typ"),
+                      render_compiled_module(abbreviations, "abbreviations.typ",
+                                             (config / "abbreviations.typ").stat().st_size))
+
+    glossary = [GlossaryTerm.from_dict(entry) for entry in _append_entries(
+        config / "glossary.typ", "glossary-entries",
+        (entry.to_dict() for entry in _synthetic_glossary(size.glossary_entries)))]
+    atomic_write_text(config / "glossary-compiled.typ",
+                      render_glossary_layout(build_glossary_layout(glossary), len(glossary),
+                                             (config / "glossary.typ").stat().st_size))
+
+    chapters = destination / "chapters"
+    chapters.mkdir()
+    per_chapter = zip(_spread(size.citations, size.chapters), _spread(size.abbreviations, size.chapters),
+                      _spread(size.glossary_entries, size.chapters), _spread(size.index_marks, size.chapters))
+    for number, (citations, abbreviation_uses, glossary_uses, marks) in enumerate(per_chapter, start=1):
+        (chapters / f"chapter-{number:03d}.typ").write_text(
+            _chapter(number, size, citations, abbreviation_uses, glossary_uses, marks), encoding="utf-8")
+
+    (destination / BIBLIOGRAPHY).write_text(_bibliography(size.citations), encoding="utf-8")
+    main = destination / MAIN_DOCUMENT
+    main.write_text(_main_document(size), encoding="utf-8")
+
+    records, _ = scan_sources(sorted(chapters.glob("*.typ")), jobs=1)
+    atomic_write_text(config / "index-terms.typ", render_module(build_table(records), "en"))
+    return main
+
+
+def source_bytes(project: Path) -> int:
+    """Total size of the Typst sources and bibliography in ``project``."""
+    total = 0
+    for dirpath, _, filenames in os.walk(project):
+        total += sum(os.path.getsize(os.path.join(dirpath, name))
+                     for name in filenames if name.endswith((".typ", ".bib")))
+    return total
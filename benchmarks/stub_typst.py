@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Stand-in for the `typst` CLI, so the benchmark harness runs offline.
+
+Accepts `typst --version` and
+`typst compile [--root DIR] [--input K=V]... SOURCE OUTPUT`. Instead of
+compiling, it models a compiler whose cost grows with the amount of source:
+with ``S`` the size in MiB of the `.typ` and `.bib` files under the root, it
+holds about ``S`` x 4 MiB of memory and takes
+``BASE_SECONDS + SECONDS_PER_MIB x S ** exponent`` seconds. The exponent comes
+from ``BENCH_STUB_EXPONENT`` (default 1), so the growth check can be tested
+against both linear and superlinear behaviour. The output is a minimal PDF
+with one page per 4 KiB of source. A source calling ``#panic(`` fails at
+once, as a document that panics does.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+BASE_SECONDS = 0.02
+SECONDS_PER_MIB = 1.0
+MEMORY_PER_SOURCE_BYTE = 4
+BYTES_PER_PAGE = 4096
+
+
+def _source_bytes(root: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        total += sum(os.path.getsize(os.path.join(dirpath, name))
+                     for name in filenames if name.endswith((".typ", ".bib")))
+    return total
+
+
+def _pdf(pages: int) -> bytes:
+    objects = [b"<</Type /Catalog /Pages 2 0 R>>",
+               b"<</Type /Pages /Count %d>>" % pages]
+    objects += [b"<</Type /Page /Parent 2 0 R>>"] * pages
+    body = b"".join(b"%d 0 obj %s endobj\n" % (number, data) for number, data in enumerate(objects, start=1))
+    return b"%PDF-1.7\n" + body + b"%%EOF\n"
+
+
+def main(argv: list) -> int:
+    if argv[:1] == ["--version"]:
+        print("typst 0.0.0 (benchmark stub)")
+        return 0
+    if argv[:1] != ["compile"]:
+        print(f"stub typst: unsupported arguments {argv}", file=sys.stderr)
+        return 2
+
+    root = "."
+    positional = []
+    arguments = iter(argv[1:])
+    for argument in arguments:
+        if argument == "--root":
+            root = next(arguments)
+        elif argument in ("--input", "--font-path"):
+            next(arguments)
+        else:
+            positional.append(argument)
+    if len(positional) != 2:
+        print("stub typst: expected SOURCE OUTPUT", file=sys.stderr)
+        return 2
+    source, output = positional
+    if not os.path.isfile(source):
+        print(f"error: file not found: {source}", file=sys.stderr)
+        return 1
+
+    with open(source, encoding="utf-8") as handle:
+        if "#panic(" in handle.read():
+            print(f"error: panicked in {source}", file=sys.stderr)
+            return 1
+
+    size = _source_bytes(root)
+    mebibytes = size / (1 << 20)
+    exponent = float(os.environ.get("BENCH_STUB_EXPONENT", "1"))
+    # Touch every page so the memory shows up in the peak RSS
+    memory = bytearray(size * MEMORY_PER_SOURCE_BYTE)
+    for offset in range(0, len(memory), 4096):
+        memory[offset] = 1
+    time.sleep(BASE_SECONDS + SECONDS_PER_MIB * mebibytes ** exponent)
+    with open(output, "wb") as handle:
+        handle.write(_pdf(1 + size // BYTES_PER_PAGE))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,230 @@
+"""Run profile x size sweeps and detect superlinear growth.
+
+Each case compiles one synthetic thesis under one profile. Timing and
+memory come from `preflight.run`, which reaps the compiler with `wait4` so
+the CPU time and peak RSS belong to that compile alone.
+
+Growth is judged per profile, dimension and metric by fitting
+``value = a + b * scale ** p`` to the sweep: ``a`` absorbs the fixed cost of
+the template, and ``p`` is the growth exponent. ``p`` near 1 is linear; a
+sweep whose fitted ``p`` exceeds the threshold, and which a straight line
+fits measurably worse, is flagged as superlinear.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .generate import ThesisSize, generate_project, source_bytes
+from preflight import count_pdf_pages, max_rss_bytes, run
+
+PROFILES = ("default", "draft", "screen", "print")
+DEFAULT_SCALES = (1, 2, 4, 8)
+GROWTH_METRICS = ("wall_seconds", "cpu_seconds", "max_rss_bytes")
+DEFAULT_THRESHOLD = 1.2
+# Sweeps that change a metric by less than this are too flat to fit: noise
+# would decide the exponent
+MIN_RELATIVE_CHANGE = 0.1
+MIN_SECONDS_CHANGE = 0.05
+# A curve is only called superlinear if a straight line misses it by more
+# than this (relative to the largest value, and in seconds for timings)
+MIN_RELATIVE_MISFIT = 0.02
+MIN_SECONDS_MISFIT = 0.025
+_EXPONENTS = [step / 100 for step in range(25, 301)]
+
+
+class BenchmarkError(Exception):
+    """Raised when a benchmark compile fails."""
+
+
+@dataclass
+class Measurement:
+    """One case of the sweep; timings are medians and memory the maximum over repeats."""
+
+    profile: str
+    dimension: str
+    scale: int
+    chapters: int
+    figures_per_chapter: int
+    citations: int
+    abbreviations: int
+    glossary_entries: int
+    index_marks: int
+    source_bytes: int
+    wall_seconds: float
+    cpu_seconds: Optional[float]
+    max_rss_bytes: Optional[int]
+    pdf_bytes: int
+    pages: Optional[int]
+
+
+@dataclass
+class Growth:
+    """The fitted growth exponent of one metric along one dimension."""
+
+    profile: str
+    dimension: str
+    metric: str
+    exponent: Optional[float]
+    superlinear: bool
+
+
+def compile_case(typst: Sequence[str], document: Path, profile: str, output: Path,
+                 timeout: Optional[float] = None) -> Tuple[float, Optional[float], Optional[int]]:
+    """Compile ``document`` once; return wall seconds, CPU seconds and peak RSS in bytes."""
+    command = list(typst) + ["compile", "--root", str(document.parent)]
+    if profile != "default":
+        command += ["--input", f"profile={profile}"]
+    command += [str(document), str(output)]
+    started = time.perf_counter()
+    try:
+        status, log, usage = run(command, cwd=document.parent, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise BenchmarkError(f"{document} ({profile}): {exc}") from exc
+    elapsed = time.perf_counter() - started
+    if status != 0:
+        raise BenchmarkError(f"{document} ({profile}) failed:\n{log}")
+    if usage is None:
+        return elapsed, None, None
+    return elapsed, usage.ru_utime + usage.ru_stime, max_rss_bytes(usage)
+
+
+def run_sweep(typst: Sequence[str], work_dir: Path, profiles: Iterable[str], dimensions: Iterable[str],
+              scales: Sequence[int], base: ThesisSize = ThesisSize(), repeat: int = 1,
+              timeout: Optional[float] = None,
+              on_result: Optional[Callable[[Measurement], None]] = None) -> List[Measurement]:
+    """Generate and compile every dimension x scale case under every profile.
+
+    Each project is generated once and compiled under all profiles, so
+    profiles are compared on identical sources.
+    """
+    profiles = list(profiles)
+    measurements: List[Measurement] = []
+    for dimension in dimensions:
+        for scale in scales:
+            size = base.scaled(dimension, scale)
+            project = work_dir / f"{dimension}-x{scale}"
+            document = generate_project(size, project)
+            for profile in profiles:
+                output = project / f"{profile}.pdf"
+                runs = [compile_case(typst, document, profile, output, timeout) for _ in range(repeat)]
+                cpu = [seconds for _, seconds, _ in runs if seconds is not None]
+                rss = [peak for _, _, peak in runs if peak is not None]
+                measurement = Measurement(
+                    profile=profile,
+                    dimension=dimension,
+                    scale=scale,
+                    **size.as_dict(),
+                    source_bytes=source_bytes(project),
+                    wall_seconds=round(statistics.median(wall for wall, _, _ in runs), 4),
+                    cpu_seconds=round(statistics.median(cpu), 4) if cpu else None,
+                    max_rss_bytes=max(rss) if rss else None,
+                    pdf_bytes=output.stat().st_size,
+                    pages=count_pdf_pages(output),
+                )
+                measurements.append(measurement)
+                if on_result is not None:
+                    on_result(measurement)
+    return measurements
+
+
+def _fit(xs: Sequence[float], values: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares line through ``(xs, values)``; returns slope and intercept."""
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(values)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values)) / spread
+    return slope, mean_y - slope * mean_x
+
+
+def growth_exponent(scales: Sequence[float], values: Sequence[float]) -> Optional[float]:
+    """Fit ``value = a + b * scale ** p`` by least squares and return ``p``.
+
+    Returns None when there are fewer than three distinct scales, and 0 when
+    the values do not grow.
+    """
+    if len(set(scales)) < 3:
+        return None
+    best: Optional[Tuple[float, float]] = None
+    for exponent in _EXPONENTS:
+        xs = [scale ** exponent for scale in scales]
+        slope, intercept = _fit(xs, values)
+        if slope <= 0:
+            continue
+        error = sum((intercept + slope * x - y) ** 2 for x, y in zip(xs, values))
+        if best is None or error < best[0]:
+            best = (error, exponent)
+    return 0.0 if best is None else best[1]
+
+
+def linear_misfit(scales: Sequence[float], values: Sequence[float]) -> float:
+    """Largest distance between ``values`` and the straight line fitted to them."""
+    slope, intercept = _fit(scales, values)
+    return max(abs(intercept + slope * scale - value) for scale, value in zip(scales, values))
+
+
+def _grows(metric: str, values: Sequence[float]) -> bool:
+    if not values or min(values) <= 0:
+        return False
+    change = max(values) - min(values)
+    if metric.endswith("_seconds") and change < MIN_SECONDS_CHANGE:
+        return False
+    return change / min(values) >= MIN_RELATIVE_CHANGE
+
+
+def _misfit_is_significant(metric: str, scales: Sequence[float], values: Sequence[float]) -> bool:
+    misfit = linear_misfit(scales, values)
+    if metric.endswith("_seconds") and misfit < MIN_SECONDS_MISFIT:
+        return False
+    return misfit >= MIN_RELATIVE_MISFIT * max(values)
+
+
+def find_growth(measurements: Iterable[Measurement], threshold: float = DEFAULT_THRESHOLD) -> List[Growth]:
+    """Fit every profile, dimension and metric in ``measurements``.
+
+    A curve is flagged when its exponent exceeds ``threshold`` and a straight
+    line fits it measurably worse, so timing noise on a nearly flat curve is
+    not reported.
+    """
+    series: Dict[Tuple[str, str], List[Measurement]] = {}
+    for measurement in measurements:
+        series.setdefault((measurement.profile, measurement.dimension), []).append(measurement)
+
+    results = []
+    for (profile, dimension), cases in series.items():
+        cases.sort(key=lambda case: case.scale)
+        for metric in GROWTH_METRICS:
+            points = [(case.scale, getattr(case, metric)) for case in cases if getattr(case, metric) is not None]
+            values = [value for _, value in points]
+            scales = [scale for scale, _ in points]
+            exponent = growth_exponent(scales, values) if _grows(metric, values) else None
+            superlinear = (exponent is not None and exponent > threshold
+                           and _misfit_is_significant(metric, scales, values))
+            results.append(Growth(profile, dimension, metric, exponent, superlinear))
+    return results
+
+
+def write_csv(path: Path, measurements: Iterable[Measurement]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=[field.name for field in fields(Measurement)])
+        writer.writeheader()
+        for measurement in measurements:
+            writer.writerow(asdict(measurement))
+
+
+def write_json(path: Path, measurements: Iterable[Measurement], growth: Iterable[Growth],
+               info: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        **info,
+        "measurements": [asdict(measurement) for measurement in measurements],
+        "growth": [asdict(entry) for entry in growth],
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,39 @@
+// Precomputed lookup tables for abbreviations.typ.
+// Generated by scripts/manage_abbreviations.py compile; do not edit by hand.
+
+#let abbreviation-count = 10
+#let abbreviation-source-size = 16520
+
+#let short-index = (
+  "ML": 0,
+  "DL": 1,
+  "NN": 2,
+  "Algo": 3,
+  "AI": 4,
+  "NLP": 5,
+  "CV": 6,
+  "SVM": 7,
+  "RF": 8,
+  "GB": 9,
+)
+
+#let key-index = (
+  "Machine Learning": 0,
+  "Deep Learning": 1,
+  "Neural Network": 2,
+  "Algorithm": 3,
+  "Artificial Intelligence": 4,
+  "Natural Language Processing": 5,
+  "Computer Vision": 6,
+  "Support Vector Machine": 7,
+  "Random Forest": 8,
+  "Gradient Boosting": 9,
+)
+
+#let order-by-key = (3, 4, 6, 1, 9, 0, 5, 2, 8, 7)
+#let order-by-short = (4, 3, 6, 1, 9, 0, 5, 2, 8, 7)
+#let order-by-long = (2, 6, 9, 0, 3, 5, 1, 7, 8, 4)
+
+#let category-groups = (
+  "General": (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+)
@@ -51,8 +51,74 @@
   )
 )
 
+// Lookup tables: positions into `abbreviations` keyed by short form and key,
+// sort orders and category groups. `abbreviations-compiled.typ` is generated
+// by `python scripts/manage_abbreviations.py compile` and records the entry
+// count and byte size of this file; when either differs, the tables are
+// rebuilt here once per document. Typst cannot test whether a file exists,
+// so without the module compile with `--input abbreviation-tables=inline`.
+#let _compiled = if sys.inputs.at("abbreviation-tables", default: "compiled") != "inline" {
+  import "abbreviations-compiled.typ" as compiled
+  compiled
+}
+
+#let _build-abbrev-tables(entries) = {
+  let positions = range(entries.len())
+  let short-index = (:)
+  let key-index = (:)
+  let category-groups = (:)
+  for i in positions {
+    let entry = entries.at(i)
+    // First entry wins, as with `abbreviations.find(...)`
+    if entry.short not in short-index {
+      short-index.insert(entry.short, i)
+    }
+    if entry.key not in key-index {
+      key-index.insert(entry.key, i)
+    }
+    let category = entry.at("category", default: "General")
+    if category not in category-groups {
+      category-groups.insert(category, ())
+    }
+    category-groups.at(category).push(i)
+  }
+
+  (
+    short-index: short-index,
+    key-index: key-index,
+    order-by-key: positions.sorted(key: i => entries.at(i).key),
+    order-by-short: positions.sorted(key: i => entries.at(i).short),
+    order-by-long: positions.sorted(key: i => entries.at(i).long),
+    category-groups: category-groups
+  )
+}
+
+#let _abbrev-tables = if (
+  _compiled != none
+    and _compiled.abbreviation-count == abbreviations.len()
+    and _compiled.abbreviation-source-size == read("abbreviations.typ").len()
+) {
+  _compiled
+} else {
+  _build-abbrev-tables(abbreviations)
+}
+
+// An edit that keeps the file size can leave the tables stale, so a hit is
+// checked against the entry and a miss falls back to a scan
+#let _abbrev-lookup(index, value, field: "short") = {
+  if type(value) != str {
+    return none
+  }
+  let i = index.at(value, default: none)
+  if i != none and abbreviations.at(i).at(field) == value {
+    abbreviations.at(i)
+  } else {
+    abbreviations.find(entry => entry.at(field) == value)
+  }
+}
+
 #let get-abbreviation(short) = {
-  let entry = abbreviations.find(e => e.short == short)
+  let entry = _abbrev-lookup(_abbrev-tables.short-index, short)
   if entry != none {
     entry.key
   } else {
@@ -61,7 +127,7 @@
 }
 
 #let get-full-form(key) = {
-  let entry = abbreviations.find(e => e.key == key)
+  let entry = _abbrev-lookup(_abbrev-tables.key-index, key, field: "key")
   if entry != none {
     entry.long
   } else {
@@ -123,7 +189,7 @@
       if short not in used {
         // First use - expand full form
         _abbrev-used.update(used => used + ((short): true))
-        let entry = abbreviations.find(e => e.short == short)
+        let entry = _abbrev-lookup(_abbrev-tables.short-index, short)
         if entry != none {
           [#entry.key (#entry.short)]
         } else {
@@ -142,7 +208,7 @@
 
 // Get abbreviation with fallback
 #let get-abbrev(short, fallback: none) = {
-  let entry = abbreviations.find(e => e.short == short)
+  let entry = _abbrev-lookup(_abbrev-tables.short-index, short)
   if entry != none {
     entry
   } else {
@@ -163,12 +229,10 @@
 
 // Get all abbreviations sorted by field
 #let get-sorted-abbreviations(sort-by: "key", reverse: false) = {
-  let sorted = abbreviations.sorted(key: e => {
-    if sort-by == "key" { e.key }
-    else if sort-by == "short" { e.short }
-    else if sort-by == "long" { e.long }
-    else { e.key }
-  })
+  let order = if sort-by == "short" { _abbrev-tables.order-by-short }
+              else if sort-by == "long" { _abbrev-tables.order-by-long }
+              else { _abbrev-tables.order-by-key }
+  let sorted = order.map(i => abbreviations.at(i))
   if reverse {
     sorted.rev()
   } else {
@@ -333,12 +397,8 @@
 #let create-abbrev-groups() = {
   let groups = (:)
 
-  for entry in abbreviations {
-    let category = entry.at("category", default: "General")
-    if category not in groups {
-      groups.insert(category, ())
-    }
-    groups.at(category).push(entry)
+  for pair in _abbrev-tables.category-groups.pairs() {
+    groups.insert(pair.at(0), pair.at(1).map(i => abbreviations.at(i)))
   }
 
   groups
@@ -346,7 +406,7 @@
 
 // Get abbreviations by category
 #let get-abbrevs-by-category(category) = {
-  abbreviations.filter(entry => entry.at("category", default: "General") == category)
+  _abbrev-tables.category-groups.at(category, default: ()).map(i => abbreviations.at(i))
 }
 
 // Add category information to abbreviations (enhancement)
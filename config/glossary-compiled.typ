@@ -0,0 +1,20 @@
+// Sorted and grouped glossary layout (locale: en, collation: unicode).
+// Generated by scripts/manage_terms.py build; do not edit by hand.
+
+#let glossary-locale = "en"
+#let page-size = 40
+#let glossary-count = 10
+#let glossary-source-size = 26451
+
+#let order-by-term = (7, 9, 8, 5, 3, 2, 1, 4, 6, 0)
+#let order-by-category = (0, 4, 5, 6, 7, 8, 9, 1, 2, 3)
+#let category-order = ("Academic", "Research")
+
+#let category-groups = (
+  "Academic": (7, 9, 8, 5, 4, 6, 0),
+  "Research": (3, 2, 1),
+)
+
+#let pages = (
+  (7, 9, 8, 5, 3, 2, 1, 4, 6, 0),
+)
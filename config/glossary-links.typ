@@ -0,0 +1,19 @@
+// Reverse links between glossary terms.
+// Generated by scripts/manage_terms.py check-related; do not edit by hand.
+
+#let glossary-link-source = (
+  ("Thesis", ("Dissertation", "Research")),
+  ("Methodology", ("Method", "Approach")),
+  ("Literature Review", ("Review", "Bibliography")),
+  ("Hypothesis", ("Theory", "Proposition")),
+  ("Peer Review", ("Review", "Evaluation")),
+  ("Citation", ("Reference", "Bibliography")),
+  ("Plagiarism", ("Academic Integrity", "Ethics")),
+  ("Abstract", ("Summary", "Synopsis")),
+  ("Bibliography", ("References", "Works Cited")),
+  ("Appendix", ("Supplement", "Addendum")),
+)
+
+#let glossary-backlinks = (
+  "Bibliography": ("Literature Review", "Citation"),
+)
@@ -1,4 +1,6 @@
 #import "../utils/style.typ": *
+#import "glossary-links.typ" as _links
+#import "glossary-compiled.typ" as _layout
 
 // Glossary System for Academic Writing
 // Provides comprehensive glossary management with cross-referencing and validation
@@ -67,6 +69,69 @@
   )
 )
 
+// Lookup tables built once per compile; the first entry wins for repeated terms
+#let _glossary-by-term = glossary-entries.rev().map(e => (e.term, e)).to-dict()
+
+// Reverse related-term links: term -> terms that list it as related.
+// Uses the map generated by `manage_terms.py check-related --output
+// config/glossary-links.typ` while it matches the entries above.
+#let glossary-backlinks = if _links.glossary-link-source == glossary-entries.map(e => (e.term, e.at("related", default: ()))) {
+  _links.glossary-backlinks
+} else {
+  let backlinks = (:)
+  for entry in glossary-entries {
+    for related in entry.at("related", default: ()) {
+      if related in _glossary-by-term {
+        backlinks.insert(related, backlinks.at(related, default: ()) + (entry.term,))
+      }
+    }
+  }
+  backlinks
+}
+
+// Sort orders, category groups and page-sized chunks as positions into
+// `glossary-entries`. Uses the layout generated by `manage_terms.py build
+// --type glossary` (collated for its locale) while its entry count and the
+// size of this file still match, and otherwise builds the same tables once.
+// The fallback compares case-insensitively like the build's collation
+// without ICU, which it matches for unaccented English terms; `build
+// --check` reports a stale layout.
+#let _build-glossary-layout(entries, page-size) = {
+  let positions = range(entries.len())
+  // Stable sorts: by text, then by lowercased text
+  let by-text = positions.sorted(key: i => entries.at(i).term)
+  let order-by-term = by-text.sorted(key: i => lower(entries.at(i).term))
+  let category-groups = (:)
+  for i in order-by-term {
+    let category = entries.at(i).at("category", default: "General")
+    if category not in category-groups {
+      category-groups.insert(category, ())
+    }
+    category-groups.at(category).push(i)
+  }
+  let by-category = positions.sorted(key: i => entries.at(i).at("category", default: ""))
+  by-category = by-category.sorted(key: i => lower(entries.at(i).at("category", default: "")))
+
+  (
+    order-by-term: order-by-term,
+    // Entries without a category last, in config order
+    order-by-category: by-category.filter(i => "category" in entries.at(i))
+      + by-category.filter(i => "category" not in entries.at(i)),
+    category-order: category-groups.keys().sorted().sorted(key: lower),
+    category-groups: category-groups,
+    pages: order-by-term.chunks(page-size)
+  )
+}
+
+#let _glossary-layout = if (
+  _layout.glossary-count == glossary-entries.len()
+    and _layout.glossary-source-size == read("glossary.typ").len()
+) {
+  _layout
+} else {
+  _build-glossary-layout(glossary-entries, _layout.page-size)
+}
+
 // State for tracking extracted terms and their page references
 #let _extracted-terms = state("extracted-terms", (:))
 #let _term-page-references = state("term-page-references", (:))
@@ -161,28 +226,41 @@
   })
 }
 
-// Generate comprehensive glossary including both manual and auto-extracted terms
-#let generate-full-glossary(include-auto-extracted: true, include-page-refs: true) = {
-  locate(loc => {
-    let manual-terms = glossary-entries
-    let auto-terms = if include-auto-extracted { get-extracted-glossary() } else { (:) }
-
-    // Combine and deduplicate (manual takes precedence)
-    let all-terms = (:)
-    for entry in manual-terms {
-      all-terms.insert(entry.term, entry)
-    }
+// Combine manual and extracted terms (manual takes precedence), sorted by
+// term. The precomputed layout applies only when the manual terms are the
+// whole glossary, no extracted terms were added and no term is repeated.
+#let _combine-glossary(manual-terms, auto-terms, whole-glossary) = {
+  let all-terms = (:)
+  for entry in manual-terms {
+    all-terms.insert(entry.term, entry)
+  }
 
-    for (term, entry) in auto-terms {
-      if term not in all-terms {
-        all-terms.insert(term, entry)
-      }
+  let added = 0
+  for (term, entry) in auto-terms {
+    if term not in all-terms {
+      all-terms.insert(term, entry)
+      added += 1
     }
+  }
 
-    // Convert to sorted array
-    let sorted-terms = all-terms.values().sorted(key: e => e.term)
+  let precomputed = whole-glossary and added == 0 and all-terms.len() == manual-terms.len()
+  let terms = if precomputed {
+    _glossary-layout.order-by-term.map(i => glossary-entries.at(i))
+  } else {
+    // Same order as the fallback layout
+    all-terms.values().sorted(key: e => e.term).sorted(key: e => lower(e.term))
+  }
+  (terms: terms, precomputed: precomputed)
+}
 
-    sorted-terms
+// Generate comprehensive glossary including both manual and auto-extracted terms.
+// `entries` replaces the manual terms, e.g. with the `glossary-entries` of a
+// per-category shard from config/glossary/ (see `manage_terms.py shard`).
+#let generate-full-glossary(include-auto-extracted: true, include-page-refs: true, entries: none) = {
+  locate(loc => {
+    let manual-terms = if entries == none { glossary-entries } else { entries }
+    let auto-terms = if include-auto-extracted { get-extracted-glossary() } else { (:) }
+    _combine-glossary(manual-terms, auto-terms, entries == none).terms
   })
 }
 
@@ -269,7 +347,7 @@
 
 // Get glossary entry by term
 #let get-glossary-term(term) = {
-  glossary-entries.find(e => e.term == term)
+  _glossary-by-term.at(term, default: none)
 }
 
 // Search glossary by pattern
@@ -296,11 +374,9 @@
 
 // Get sorted glossary entries
 #let get-sorted-glossary(sort-by: "term", reverse: false) = {
-  let sorted = glossary-entries.sorted(key: e => {
-    if sort-by == "term" { e.term }
-    else if sort-by == "category" { e.at("category", default: "ZZZ") }
-    else { e.term }
-  })
+  let order = if sort-by == "category" { _glossary-layout.order-by-category }
+              else { _glossary-layout.order-by-term }
+  let sorted = order.map(i => glossary-entries.at(i))
   if reverse {
     sorted.rev()
   } else {
@@ -308,6 +384,19 @@
   }
 }
 
+// Get glossary entries sorted by term, grouped by category
+#let get-sorted-glossary-groups() = {
+  _glossary-layout.category-order.map(category => (
+    category,
+    _glossary-layout.category-groups.at(category).map(i => glossary-entries.at(i))
+  ))
+}
+
+// Get glossary entries sorted by term in page-sized chunks
+#let get-glossary-pages() = {
+  _glossary-layout.pages.map(page => page.map(i => glossary-entries.at(i)))
+}
+
 // Get related terms for a glossary entry
 #let get-related-terms(term) = {
   let entry = get-glossary-term(term)
@@ -318,19 +407,22 @@
   }
 }
 
+// Get the terms that list a glossary entry as related
+#let get-glossary-backlinks(term) = {
+  glossary-backlinks.at(term, default: ())
+}
+
 // Create cross-references between related terms
+// Returns the entries with reverse relationships added to `related`
 #let create-glossary-cross-references() = {
-  for entry in glossary-entries {
-    if "related" in entry {
-      for related in entry.related {
-        let related-entry = get-glossary-term(related)
-        if related-entry != none and "related" not in related-entry {
-          // Add reverse relationship if it doesn't exist
-          related-entry.insert("related", (entry.term,))
-        }
-      }
+  glossary-entries.map(entry => {
+    let related = entry.at("related", default: ())
+    let missing = get-glossary-backlinks(entry.term).filter(t => t not in related)
+    if missing.len() > 0 {
+      entry.insert("related", related + missing)
     }
-  }
+    entry
+  })
 }
 
 // Get glossary statistics
@@ -544,21 +636,28 @@
   include-manual-glossary: true,
   include-extracted-terms: true,
   show-statistics: false,
-  show-validation: false
+  show-validation: false,
+  // Manual entries to list instead of the whole glossary, e.g. a shard's
+  // `glossary-entries` imported from config/glossary/<category>.typ
+  entries: none
 ) = {
   locate(loc => {
     // Get all glossary terms
-    let all-terms = generate-full-glossary(
-      include-auto-extracted: include-auto-extracted,
-      include-page-refs: include-page-refs
-    )
+    let manual-terms = if entries == none { glossary-entries } else { entries }
+    let auto-terms = if include-auto-extracted { get-extracted-glossary() } else { (:) }
+    let combined = _combine-glossary(manual-terms, auto-terms, entries == none)
+    let all-terms = combined.terms
 
-    // Sort terms
-    let sorted-terms = all-terms.sorted(key: e => {
-      if sort-by == "term" { e.term }
-      else if sort-by == "category" { e.at("category", default: "ZZZ") }
-      else { e.term }
-    })
+    // Manual entries only: render the precomputed layout as it is
+    let precomputed = combined.precomputed and sort-by == "term"
+
+    // Sort terms (generate-full-glossary already sorts by term)
+    let sorted-terms = if sort-by == "term" { all-terms } else {
+      all-terms.sorted(key: e => {
+        if sort-by == "category" { e.at("category", default: "ZZZ") }
+        else { e.term }
+      })
+    }
 
     // Create page
     set page(
@@ -595,10 +694,17 @@
 
     // Group by category if requested
     if include-categories {
-      let categories = sorted-terms.map(e => e.at("category", default: "General")).dedup().sorted()
+      let groups = if precomputed { get-sorted-glossary-groups() } else {
+        let categories = sorted-terms.map(e => e.at("category", default: "General")).dedup().sorted().sorted(key: lower)
+        categories.map(category => (
+          category,
+          sorted-terms.filter(e => e.at("category", default: "General") == category)
+        ))
+      }
 
-      for category in categories {
-        let category-terms = sorted-terms.filter(e => e.at("category", default: "General") == category)
+      for group in groups {
+        let category = group.at(0)
+        let category-terms = group.at(1)
 
         if category-terms.len() > 0 {
           heading(category, level: 2, numbering: none)
@@ -614,9 +720,12 @@
       }
     } else {
       // Single alphabetical list
-      for entry in sorted-terms {
-        generate-glossary-entry(entry, include-page-refs: include-page-refs)
-        v(0.3em)
+      let chunks = if precomputed { get-glossary-pages() } else { (sorted-terms,) }
+      for chunk in chunks {
+        for entry in chunk {
+          generate-glossary-entry(entry, include-page-refs: include-page-refs)
+          v(0.3em)
+        }
       }
     }
   })
@@ -0,0 +1,14 @@
+// Glossary entries in category "Academic", split from glossary.typ.
+// Generated by scripts/manage_terms.py shard; do not edit by hand.
+
+#let glossary-category = "Academic"
+
+#let glossary-entries = (
+  (term: "Thesis", definition: "A long piece of writing on a particular subject, especially one that is done for a higher college or university degree.", category: "Academic", related: ("Dissertation", "Research")),
+  (term: "Peer Review", definition: "The evaluation of work by one or more people with similar competencies as the producers of the work.", category: "Academic", related: ("Review", "Evaluation")),
+  (term: "Citation", definition: "A reference to a source of information used in a scholarly work.", category: "Academic", related: ("Reference", "Bibliography")),
+  (term: "Plagiarism", definition: "The practice of taking someone else's work or ideas and passing them off as one's own.", category: "Academic", related: ("Academic Integrity", "Ethics")),
+  (term: "Abstract", definition: "A brief summary of a research article, thesis, review, conference proceeding, or any in-depth analysis of a particular subject.", category: "Academic", related: ("Summary", "Synopsis")),
+  (term: "Bibliography", definition: "A list of the books referred to in a scholarly work, typically printed as an appendix.", category: "Academic", related: ("References", "Works Cited")),
+  (term: "Appendix", definition: "A section at the end of a book or document containing additional information.", category: "Academic", related: ("Supplement", "Addendum")),
+)
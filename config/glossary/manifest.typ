@@ -0,0 +1,22 @@
+// Glossary shards by category, split from glossary.typ.
+// Generated by scripts/manage_terms.py shard; do not edit by hand.
+
+#let glossary-source-digest = "bd0ec3f471e85389270052b575a70167540727a2ab8e40879c9a61269c6a34cd"
+
+#let glossary-shards = (
+  "Academic": (file: "academic.typ", entries: 7),
+  "Research": (file: "research.typ", entries: 3),
+)
+
+#let glossary-term-categories = (
+  "Thesis": "Academic",
+  "Methodology": "Research",
+  "Literature Review": "Research",
+  "Hypothesis": "Research",
+  "Peer Review": "Academic",
+  "Citation": "Academic",
+  "Plagiarism": "Academic",
+  "Abstract": "Academic",
+  "Bibliography": "Academic",
+  "Appendix": "Academic",
+)
@@ -0,0 +1,10 @@
+// Glossary entries in category "Research", split from glossary.typ.
+// Generated by scripts/manage_terms.py shard; do not edit by hand.
+
+#let glossary-category = "Research"
+
+#let glossary-entries = (
+  (term: "Methodology", definition: "The system of methods followed in a particular discipline or field of study.", category: "Research", related: ("Method", "Approach")),
+  (term: "Literature Review", definition: "A scholarly paper that includes the current knowledge including substantive findings, as well as theoretical and methodological contributions to a particular topic.", category: "Research", related: ("Review", "Bibliography")),
+  (term: "Hypothesis", definition: "A supposition or proposed explanation made on the basis of limited evidence as a starting point for further investigation.", category: "Research", related: ("Theory", "Proposition")),
+)
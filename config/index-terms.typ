@@ -0,0 +1,5 @@
+// Index terms marked with index-term(...) in the thesis sources (locale: en).
+// Generated by scripts/build_index.py; do not edit by hand.
+
+#let index-table = (
+)
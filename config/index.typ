@@ -8,52 +8,84 @@
 #import "abbreviations.typ": *
 #import "appendix.typ": *
 #import "contributions.typ": *
+#import "index-terms.typ" as _index-table
 
 // =================================
 // Automated Index System
 // =================================
 
-// State for tracking index terms and their page references
-#let _index-terms = state("index-terms", (:))
-#let _index-page-references = state("index-page-references", (:))
+// Terms marked in the sources with their letters and subterms, sorted by
+// `python scripts/build_index.py`. Marks are collected with a single query
+// when the index is generated, so only page numbers are resolved here.
+#let _index-rank = _index-table.index-table.enumerate().map(pair => (pair.at(1).term, pair.at(0))).to-dict()
 
 // Mark a term for inclusion in the index
 // Usage: #index-term("machine learning") or #index-term("machine learning", category: "AI")
 #let index-term(term, category: none, subterm: none) = {
-  locate(loc => {
-    let page-num = loc.page()
-
-    // Update index terms state
-    _index-terms.update(terms => {
-      if term not in terms in terms {
-        terms.insert(term, (category: category, subterm: subterm, pages: ()))
-      }
+  [#metadata((type: "index-term", term: term, category: category, subterm: subterm)) <index-term>]
+}
 
-      // Add page reference if not already present
-      let current-term = terms.at(term)
-      if page-num not in current-term.pages {
-        current-term.pages.push(page-num)
-        terms.insert(term, current-term)
+// Collect every index mark with its page numbers (requires context).
+// The first category and subterm given for a term are kept; `subterms` maps
+// every subterm to its own pages. Collect once and pass the result to the
+// functions below that take `terms`.
+#let _collect-index-terms() = {
+  let terms = (:)
+  for mark in query(<index-term>) {
+    let data = mark.value
+    let page-num = mark.location().page()
+    let entry = terms.at(data.term, default: (category: data.category, subterm: data.subterm, pages: (), subterms: (:)))
+    if entry.category == none {
+      entry.category = data.category
+    }
+    if entry.subterm == none {
+      entry.subterm = data.subterm
+    }
+    // Marks come back in document order, so repeated pages are adjacent
+    if entry.pages.len() == 0 or entry.pages.last() != page-num {
+      entry.pages.push(page-num)
+    }
+    if data.subterm != none {
+      let pages = entry.subterms.at(data.subterm, default: ())
+      if pages.len() == 0 or pages.last() != page-num {
+        pages.push(page-num)
       }
+      entry.subterms.insert(data.subterm, pages)
+    }
+    terms.insert(data.term, entry)
+  }
+  terms
+}
 
-      terms
-    })
+// Terms of `terms` in index order: the generated table order, followed by
+// any terms it does not know about (computed marks or a stale table)
+#let _index-order(terms) = {
+  let known = _index-table.index-table.map(e => e.term).filter(t => t in terms)
+  if known.len() == terms.len() {
+    known
+  } else {
+    known + terms.keys().filter(t => t not in _index-rank).sorted()
+  }
+}
 
-    // Update page references state for reverse lookup
-    _index-page-references.update(refs => {
-      if page-num not in refs {
-        refs.insert(page-num, ())
-      }
-      if term not in refs.at(page-num) {
-        refs.at(page-num).push(term)
-      }
-      refs
-    })
-  })
+// Subterms of a collected term in index order: the generated table order,
+// followed by any it does not know about
+#let _index-subterms(term, data) = {
+  let rank = _index-rank.at(term, default: none)
+  let known = if rank == none { () } else {
+    _index-table.index-table.at(rank).subterms.filter(s => s in data.subterms)
+  }
+  known + data.subterms.keys().filter(s => s not in known).sorted()
+}
 
-  // Return invisible content to mark the location
-  metadata((type: "index-term", term: term, category: category, subterm: subterm))
-  []
+// Index letter heading for a term
+#let _index-letter(term) = {
+  let rank = _index-rank.at(term, default: none)
+  if rank != none {
+    _index-table.index-table.at(rank).letter
+  } else {
+    upper(term.at(0))
+  }
 }
 
 // Extract potential index terms from content using pattern matching
@@ -98,12 +130,15 @@
 
 // Get all index terms with their page references
 #let get-index-terms() = {
-  _index-terms.get()
+  _collect-index-terms()
 }
 
-// Get page references for a specific term
-#let get-term-references(term) = {
-  let terms = _index-terms.get()
+// Get page references for a specific term; `terms` reuses a previous
+// `get-index-terms()` result instead of querying the marks again
+#let get-term-references(term, terms: none) = {
+  if terms == none {
+    terms = _collect-index-terms()
+  }
   if term in terms {
     terms.at(term).pages.sorted()
   } else {
@@ -161,9 +196,12 @@
 #let generate-index(
   include-categories: true,
   include-subentries: true,
-  sort-by: "term"  // "term" or "category"
+  sort-by: "term",  // "term" or "category"
+  terms: none  // a `get-index-terms()` result to reuse
 ) = {
-  let terms = _index-terms.get()
+  if terms == none {
+    terms = _collect-index-terms()
+  }
   let sorted-terms = ()
 
   if sort-by == "category" {
@@ -180,14 +218,14 @@
       by-category.at(cat).push((term, data))
     }
 
-    // Sort categories and terms within each category
+    // Sort categories; terms within each category keep index order
     for cat in by-category.keys().sorted() {
-      let cat-terms = by-category.at(cat).map(item => item.at(0)).sorted()
-      sorted-terms += cat-terms
+      let cat-terms = by-category.at(cat).map(item => item.at(0))
+      sorted-terms += _index-order(cat-terms.map(t => (t, true)).to-dict())
     }
   } else {
-    // Sort alphabetically by term
-    sorted-terms = terms.keys().sorted()
+    // Alphabetical, in the order of the generated term table
+    sorted-terms = _index-order(terms)
   }
 
   // Generate the index structure
@@ -200,6 +238,14 @@
   index-data
 }
 
+// Index page lines for a term: its pages, then each subterm with its pages
+#let _index-entry-lines(term, data) = {
+  block[*#term* — #format-page-references(data.pages)]
+  for subterm in _index-subterms(term, data) {
+    block(inset: (left: 1em))[#subterm — #format-page-references(data.subterms.at(subterm))]
+  }
+}
+
 // Generate index page with automatic formatting
 #let generate-index-page(
   title: "Index",
@@ -237,10 +283,11 @@
       ```
     ]
   } else {
-    // Group terms by first letter for better organization
+    // Group terms by first letter; terms come in index order, so the
+    // letters do too
     let grouped-terms = (:)
-    for term in index-data.keys().sorted() {
-      let first-letter = upper(term.at(0))
+    for term in index-data.keys() {
+      let first-letter = _index-letter(term)
       if first-letter not in grouped-terms {
         grouped-terms.insert(first-letter, ())
       }
@@ -250,12 +297,10 @@
     // Display index in columns
     if columns == 1 {
       // Single column layout
-      for letter in grouped-terms.keys().sorted() {
+      for letter in grouped-terms.keys() {
         heading(letter, level: 3, numbering: none)
         for term in grouped-terms.at(letter) {
-          let data = index-data.at(term)
-          let formatted-refs = format-page-references(data.pages)
-          block[*#term*#if data.subterm != none [, #data.subterm] — #formatted-refs]
+          _index-entry-lines(term, index-data.at(term))
           v(0.3em)
         }
         v(0.5em)
@@ -263,12 +308,10 @@
     } else {
       // Multi-column layout
       columns(columns, gutter: 1em)[
-        for letter in grouped-terms.keys().sorted() {
+        for letter in grouped-terms.keys() {
           heading(letter, level: 3, numbering: none)
           for term in grouped-terms.at(letter) {
-            let data = index-data.at(term)
-            let formatted-refs = format-page-references(data.pages)
-            block[*#term*#if data.subterm != none [, #data.subterm] — #formatted-refs]
+            _index-entry-lines(term, index-data.at(term))
             v(0.3em)
           }
           v(0.5em)
@@ -290,9 +333,11 @@
   }
 }
 
-// Validate index terms and references
-#let validate-index() = {
-  let terms = _index-terms.get()
+// Validate index terms and references; `terms` as for `generate-index`
+#let validate-index(terms: none) = {
+  if terms == none {
+    terms = _collect-index-terms()
+  }
   let errors = ()
   let warnings = ()
 
@@ -315,8 +360,8 @@
 }
 
 // Get index statistics
-#let get-index-stats() = {
-  let validation = validate-index()
+#let get-index-stats(terms: none) = {
+  let validation = validate-index(terms: terms)
   (
     total: validation.total-terms,
     references: validation.total-references,
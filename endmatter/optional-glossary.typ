@@ -1,8 +1,9 @@
 // Optional Glossary Generation Module
-// This module provides automatic glossary generation from abbreviation data
+// This module provides automatic glossary generation from the glossary and abbreviation data
 // Include this in your thesis configuration to enable optional glossary features
 
 #import "../config/abbreviations.typ": abbreviations, validate-abbreviations-detailed, get-sorted-abbreviations, get-abbreviation-stats
+#import "../config/glossary.typ": glossary-entries, get-glossary-pages
 #import "../utils/style.typ": colors
 
 // Generate optional glossary page with automatic content from abbreviations
@@ -31,9 +32,21 @@
     }
   }
 
+  // Glossary terms in the precomputed order (see `manage_terms.py build`)
+  for chunk in get-glossary-pages() {
+    for entry in chunk {
+      block[
+        *#entry.term*: #entry.definition
+      ]
+      v(0.5em)
+    }
+  }
+
   // Check if we have abbreviations to display
   if abbreviations.len() == 0 {
-    text(fill: gray)[No glossary terms defined. Add abbreviations using the abbreviation management system.]
+    if glossary-entries.len() == 0 {
+      text(fill: gray)[No glossary terms defined. Add abbreviations using the abbreviation management system.]
+    }
   } else {
     // Generate glossary from abbreviations, sorted alphabetically by full term
     let sorted-abbrevs = get-sorted-abbreviations(sort-by: "key")
@@ -148,11 +161,17 @@
       }
     }
 
-    if abbreviations.len() == 0 {
+    if abbreviations.len() == 0 and glossary-entries.len() == 0 {
       text(fill: gray)[No glossary terms or abbreviations defined.]
     } else {
       // Glossary section
       heading("Glossary of Terms", level: 2, numbering: none)
+      for chunk in get-glossary-pages() {
+        for entry in chunk {
+          block[*#entry.term*: #entry.definition]
+          v(0.3em)
+        }
+      }
       let sorted-by-key = get-sorted-abbreviations(sort-by: "key")
       for entry in sorted-by-key {
         block[*#entry.key* (#entry.short): #entry.long]
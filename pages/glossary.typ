@@ -1,6 +1,6 @@
 #import "../utils/style.typ": *
 #import "../config/abbreviations.typ": abbreviations, validate-abbreviations-detailed, print-validation-report, get-sorted-abbreviations, get-abbreviation-stats, abbreviations-with-categories, get-abbrevs-by-category, create-abbrev-groups
-#import "../config/glossary.typ": glossary-entries, validate-glossary, get-sorted-glossary, get-glossary-categories, get-glossary-stats, get-glossary-by-category, generate-glossary-page, generate-full-glossary, get-extracted-glossary, get-combined-stats
+#import "../config/glossary.typ": glossary-entries, validate-glossary, get-sorted-glossary, get-glossary-categories, get-glossary-stats, get-glossary-by-category, get-glossary-pages, generate-glossary-page, generate-full-glossary, get-extracted-glossary, get-combined-stats
 
 #let glossary-page() = {
   set page(
@@ -25,6 +25,16 @@
     return
   }
 
+  // Glossary terms in the precomputed order (see `manage_terms.py build`)
+  for chunk in get-glossary-pages() {
+    for entry in chunk {
+      block[
+        *#entry.term*: #entry.definition
+      ]
+      v(0.5em)
+    }
+  }
+
   if abbreviations.len() == 0 {
     text("No abbreviations defined.")
   } else {
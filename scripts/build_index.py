@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Build the index term table from `index-term(...)` marks in the thesis sources.
+
+Every `.typ` file under the given paths is scanned for `index-term` calls
+whose arguments are literals (the term string plus optional `category:` and
+`subterm:`), skipping comments and raw text. The helpers in
+`endmatter/optional-index.typ` mark the terms they are given at run time, so
+their calls are read too: the keys of a literal `custom-entries:`,
+`entries:` (with subterms) or `index-entries:` dictionary become marks just
+as those helpers create them. The marks are merged into one entry per term,
+sorted with the same collation as the glossary build and written to
+`config/index-terms.typ`. `config/index.typ` takes term order, letters and
+subterm order from that module, so at compile time it only has to resolve
+page numbers.
+
+Calls with computed arguments (for example inside helper functions) cannot be
+resolved statically; they are counted and still appear in the index, sorted
+in code point order after the ones known here.
+
+With ``--incremental`` the marks found in each file are kept in a manifest
+under `.typst-cache/index/` and only files whose size or modification time
+changed are read again.
+
+Usage:
+    python scripts/build_index.py
+    python scripts/build_index.py --incremental --paths chapters appendices
+    python scripts/build_index.py --check
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from manage_terms import GLOSSARY_LOCALES, collation_key
+from typst_data import TypstParseError, atomic_write_text, blank_comments, format_value, parse_arguments
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = REPO_ROOT / "config" / "index-terms.typ"
+MANIFEST_PATH = REPO_ROOT / ".typst-cache" / "index" / "manifest.json"
+MANIFEST_VERSION = 2
+SKIP_DIRS = {".git", ".typst-cache", "build", "docs", "node_modules", "scripts", "__pycache__"}
+# Files below this total size are scanned in-process; spawning workers costs more
+PARALLEL_SCAN_BYTES = 1 << 20
+# Files changed this recently may change again within the same mtime tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Helpers from endmatter/optional-index.typ that call `index-term` for every
+# key of a dictionary argument: argument name, the category they give the
+# marks and whether the values hold subterms
+ENTRY_HELPERS = {
+    "optional-index-page": ("custom-entries", None, False),
+    "optional-index-with-subentries": ("entries", None, True),
+    "optional-index-glossary-page": ("index-entries", "manual", False),
+}
+_CALL = re.compile(rf"(?<![\w.-])(index-term|{'|'.join(map(re.escape, ENTRY_HELPERS))})\(")
+
+# (term, category, subterm, line)
+Mark = Tuple[str, Optional[str], Optional[str], int]
+
+
+def _optional_string(value: Any) -> bool:
+    return value is None or isinstance(value, str)
+
+
+def _call_marks(name: str, positional: List[Any], named: Dict[str, Any], line: int) -> Optional[List[Mark]]:
+    """Return the marks a call with literal arguments creates, or None if they are not known."""
+    if name == "index-term":
+        category, subterm = named.get("category"), named.get("subterm")
+        if (len(positional) != 1 or not isinstance(positional[0], str)
+                or not _optional_string(category) or not _optional_string(subterm)):
+            return None
+        return [(positional[0], category, subterm, line)]
+
+    argument, category, nested = ENTRY_HELPERS[name]
+    entries = named.get(argument, {})
+    if not isinstance(entries, dict):
+        return None
+    marks: List[Mark] = []
+    for term, value in entries.items():
+        if not nested:
+            marks.append((term, category, None, line))
+        elif isinstance(value, dict):
+            marks += [(term, category, subterm, line) for subterm in value]
+        else:
+            return None
+    return marks
+
+
+def scan_file(path: str) -> Tuple[str, List[Mark], int]:
+    """Return the literal index marks in ``path`` and the number of other calls."""
+    marks: List[Mark] = []
+    dynamic = 0
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return path, marks, dynamic
+
+    text = blank_comments(text, raw=True)
+    line = 1
+    scanned = 0
+    for match in _CALL.finditer(text):
+        start = match.start()
+        line += text.count("\n", scanned, start)
+        scanned = start
+        if text[text.rfind("\n", 0, start) + 1:start].rstrip().endswith("let"):
+            continue
+        try:
+            positional, named, _ = parse_arguments(text, match.end())
+        except TypstParseError:
+            found = None
+        else:
+            found = _call_marks(match.group(1), positional, named, line)
+        if found is None:
+            dynamic += 1
+        else:
+            marks += found
+    return path, marks, dynamic
+
+
+def find_sources(paths: Iterable[Path], output: Path) -> List[Path]:
+    files = []
+    for root in paths:
+        if root.is_file():
+            files.append(root)
+            continue
+        for path in sorted(root.rglob("*.typ")):
+            relative = path.relative_to(root).parts[:-1]
+            if any(part in SKIP_DIRS or part.startswith(".") for part in relative):
+                continue
+            files.append(path)
+    output = output.resolve()
+    return [path for path in files if path.resolve() != output]
+
+
+def _relative(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(files: Dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps({"version": MANIFEST_VERSION, "files": files}, ensure_ascii=False))
+
+
+def scan_sources(files: List[Path], previous: Optional[Dict[str, Any]] = None,
+                 jobs: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+    """Scan ``files`` and return manifest records keyed by path and the number rescanned.
+
+    Records from ``previous`` are reused for files whose size and
+    modification time are unchanged.
+    """
+    previous = previous or {}
+    now = time.time_ns()
+    records: Dict[str, Any] = {}
+    stale: List[Tuple[str, Path, os.stat_result]] = []
+    for path in files:
+        name = _relative(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        record = previous.get(name)
+        if (record is not None and record["mtime_ns"] == stat.st_mtime_ns
+                and record["size"] == stat.st_size and now - stat.st_mtime_ns > _RACY_WINDOW_NS):
+            records[name] = record
+        else:
+            stale.append((name, path, stat))
+
+    paths = [str(path) for _, path, _ in stale]
+    total_bytes = sum(stat.st_size for _, _, stat in stale)
+    if jobs != 1 and len(paths) > 1 and total_bytes >= PARALLEL_SCAN_BYTES:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(scan_file, paths, chunksize=8))
+    else:
+        results = [scan_file(path) for path in paths]
+
+    for (name, _, stat), (_, marks, dynamic) in zip(stale, results):
+        records[name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "marks": [list(mark) for mark in marks],
+            "dynamic": dynamic,
+        }
+    # Keep file order stable so the output does not depend on which files changed
+    return {name: records[name] for name in sorted(records)}, len(stale)
+
+
+def _letter(term: str) -> str:
+    first = unicodedata.normalize("NFKD", term.lstrip()[:1])[:1]
+    return first.upper() if first.isalpha() else "#"
+
+
+def build_table(records: Dict[str, Any], locale: str = "en") -> List[Dict[str, Any]]:
+    """Merge marks into one entry per term, sorted for ``locale``.
+
+    The first category given for a term wins, matching `index-term`;
+    subterms are collected and sorted.
+    """
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name, record in records.items():
+        for term, category, subterm, line in record["marks"]:
+            entry = entries.get(term)
+            if entry is None:
+                entry = entries[term] = {"category": category, "subterms": set(), "marks": 0}
+            elif entry["category"] is None:
+                entry["category"] = category
+            if subterm is not None:
+                entry["subterms"].add(subterm)
+            entry["marks"] += 1
+
+    key, _ = collation_key(locale)
+    table = []
+    for term in sorted(entries, key=key):
+        entry = entries[term]
+        table.append({
+            "term": term,
+            "category": entry["category"],
+            "subterms": sorted(entry["subterms"], key=key),
+            "letter": _letter(term),
+            "marks": entry["marks"],
+        })
+    return table
+
+
+def render_module(table: List[Dict[str, Any]], locale: str) -> str:
+    lines = [
+        f"// Index terms marked with index-term(...) in the thesis sources (locale: {locale}).",
+        "// Generated by scripts/build_index.py; do not edit by hand.",
+        "",
+        "#let index-table = (",
+    ]
+    lines += [f"  {format_value(entry)}," for entry in table]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", nargs="+", type=Path, default=[REPO_ROOT],
+                        help="Files or directories to scan (default: the repository)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Generated Typst module")
+    parser.add_argument("--locale", choices=GLOSSARY_LOCALES, default="en", help="Collation locale")
+    parser.add_argument("--jobs", type=int, help="Worker processes for large scans (default: CPU count)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only rescan files changed since the last run")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if the generated module is out of date instead of writing it")
+    parser.add_argument("--json", action="store_true", dest="emit_json",
+                        help="Print the term table as JSON")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str]) -> int:
+    args = parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        return 2
+
+    files = find_sources(args.paths, args.output)
+    previous = load_manifest() if args.incremental else None
+    records, rescanned = scan_sources(files, previous, args.jobs)
+    if args.incremental:
+        save_manifest(records)
+
+    try:
+        table = build_table(records, args.locale)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    dynamic = sum(record["dynamic"] for record in records.values())
+    text = render_module(table, args.locale)
+
+    if args.emit_json:
+        print(json.dumps(table, indent=2, ensure_ascii=False))
+
+    try:
+        current = args.output.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+
+    summary = (f"{len(table)} terms from {sum(len(r['marks']) for r in records.values())} marks "
+               f"in {len(records)} files ({rescanned} scanned)")
+    if dynamic:
+        summary += f"; {dynamic} calls with computed arguments are resolved at compile time"
+
+    if args.check:
+        if current != text:
+            print(f"{args.output} is out of date: {summary}", file=sys.stderr)
+            return 1
+        if not args.emit_json:
+            print(f"{args.output} is up to date: {summary}")
+        return 0
+
+    if current == text:
+        if not args.emit_json:
+            print(f"{args.output} is up to date: {summary}")
+        return 0
+    atomic_write_text(args.output, text)
+    if not args.emit_json:
+        print(f"Wrote {args.output}: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
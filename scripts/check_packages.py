@@ -10,12 +10,21 @@ import requests
 import re
 from pathlib import Path
 
+from typst_deps import DependencyGraph
+
+def reachable_typst_files():
+    """Return the .typ files reachable from the build targets."""
+    graph = DependencyGraph()
+    files = [Path(os.path.relpath(path)) for path in graph.sources()]
+    graph.save()
+    return files
+
 def check_typst_packages():
     """Check for Typst packages used in the template."""
     packages = {}
 
-    # Scan all .typ files for package imports
-    typst_files = list(Path('.').rglob('*.typ'))
+    # Scan the .typ files the thesis, sample chapter and examples actually reach
+    typst_files = reachable_typst_files()
 
     for file_path in typst_files:
         try:
@@ -61,7 +70,7 @@ def validate_package_usage():
     issues = []
 
     # Check for common package usage issues
-    typst_files = list(Path('.').rglob('*.typ'))
+    typst_files = reachable_typst_files()
 
     for file_path in typst_files:
         try:
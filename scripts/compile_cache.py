@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""Content-addressed cache for Typst compilations.
+
+A compiled PDF is stored under a key that hashes everything the compilation
+can depend on:
+
+- the sources reachable from the document through `#import`/`#include`
+- the files they reference: `image`, `bibliography`, `read` and the data
+  loaders, plus string literals naming an existing asset or `.bib` file
+- the `--input` values (profile, locale, font_theme, ...)
+- the output of `typst --version`
+
+The reachable files come from the dependency graph in `typst_deps.py`.
+When a reference cannot be resolved statically (a path computed at compile
+time), every asset and bibliography file in the project is hashed instead, so
+a stale PDF is never served. File digests are memoised by size and mtime, so
+an unchanged tree is keyed without rereading it.
+
+Entries live in `.typst-cache/compile/` and are evicted least recently used
+first once the cache grows past its size cap.
+
+Usage:
+    python scripts/compile_cache.py compile thesis.typ thesis.pdf --input profile=draft
+    python scripts/compile_cache.py stats
+    python scripts/compile_cache.py clear
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from typst_data import atomic_write_text
+from typst_deps import DependencyGraph
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = REPO_ROOT / ".typst-cache" / "compile"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+KEY_VERSION = "typst-compile-cache-1"
+# Files changed this recently may change again within the same mtime tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def typst_version(executable: str = "typst") -> str:
+    """Return `typst --version` output, or a marker when it cannot be run."""
+    try:
+        process = subprocess.run([executable, "--version"], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, text=True, check=False)
+    except OSError:
+        return "unavailable"
+    return process.stdout.strip()
+
+
+class CompileCache:
+    """PDFs keyed by the content of everything their compilation reads.
+
+    Safe to share between threads: shared state is only touched under a
+    lock (files are hashed outside it), and entries are written atomically.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 root: Path = REPO_ROOT, typst: str = "typst"):
+        self.cache_dir = cache_dir
+        self.objects = cache_dir / "objects"
+        self.max_bytes = max_bytes
+        self.root = root.resolve()
+        self.typst = typst
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._graph = DependencyGraph(self.root)
+        self._digests_path = cache_dir / "digests.json"
+        self._digests: Dict[str, list] = self._load_digests()
+        self._digests_dirty = False
+
+    def _load_digests(self) -> Dict[str, list]:
+        try:
+            return json.loads(self._digests_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _digest(self, path: Path) -> str:
+        name = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return "missing"
+        with self._lock:
+            record = self._digests.get(name)
+        if record is not None and record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+            return record[2]
+        # Hashed without the lock so parallel jobs do not wait on each other
+        digest = file_digest(path)
+        if time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS:
+            with self._lock:
+                self._digests[name] = [stat.st_mtime_ns, stat.st_size, digest]
+                self._digests_dirty = True
+        return digest
+
+    def key(self, document: Path, inputs: Optional[Mapping[str, str]] = None) -> str:
+        """Return the cache key for compiling ``document`` with ``inputs``."""
+        document = document.resolve()
+        with self._lock:
+            if self._version is None:
+                self._version = typst_version(self.typst)
+            closure = self._graph.closure(document)
+            files, packages = closure.paths, closure.packages
+            if closure.dynamic:
+                files = files | self._graph.assets()
+
+        digest = hashlib.sha256()
+        digest.update(f"{KEY_VERSION}\0{self._version}\0{self._relative(document)}\0".encode())
+        for name, value in sorted((inputs or {}).items()):
+            digest.update(f"input\0{name}\0{value}\0".encode())
+        for package in sorted(packages):
+            digest.update(f"package\0{package}\0".encode())
+        for path in sorted(files):
+            digest.update(f"file\0{self._relative(path)}\0{self._digest(path)}\0".encode())
+        return digest.hexdigest()
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _entry(self, key: str) -> Path:
+        return self.objects / key[:2] / f"{key}.pdf"
+
+    def refresh(self) -> None:
+        """Relist project assets on the next key; for long-running callers such as watch mode."""
+        with self._lock:
+            self._graph.forget_assets()
+
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """Copy the cached PDF for ``key`` to ``output_path``; return whether it existed."""
+        entry = self._entry(key)
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry, output_path)
+            # Last use drives eviction
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, output_path: Path) -> None:
+        """Add a freshly compiled PDF to the cache and enforce the size cap."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        temporary = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            shutil.copyfile(output_path, temporary)
+            os.replace(temporary, entry)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.stores += 1
+            self._evict()
+
+    def entries(self) -> List[Tuple[Path, os.stat_result]]:
+        found = []
+        if self.objects.is_dir():
+            for path in self.objects.glob("*/*.pdf"):
+                try:
+                    found.append((path, path.stat()))
+                except OSError:
+                    pass
+        return found
+
+    def _evict(self) -> None:
+        entries = sorted(self.entries(), key=lambda item: item[1].st_mtime_ns)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= stat.st_size
+            self.evictions += 1
+
+    def clear(self) -> int:
+        removed = 0
+        for path, _ in self.entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def save(self) -> None:
+        """Persist memoised file digests and add this run's counters to the totals.
+
+        Digests of files that no longer exist are dropped.
+        """
+        self._graph.save()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            for name in [name for name in self._digests if not os.path.exists(name)]:
+                del self._digests[name]
+                self._digests_dirty = True
+            if self._digests_dirty:
+                atomic_write_text(self._digests_path, json.dumps(self._digests))
+                self._digests_dirty = False
+        totals = self.totals()
+        for name, value in self.run_stats().items():
+            if name in ("hits", "misses", "stores", "evictions"):
+                totals[name] = totals.get(name, 0) + value
+        atomic_write_text(self.cache_dir / "stats.json", json.dumps(totals, indent=2, sort_keys=True) + "\n")
+
+    def totals(self) -> Dict[str, int]:
+        try:
+            return json.loads((self.cache_dir / "stats.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def run_stats(self) -> Dict[str, int]:
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for _, stat in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def parse_inputs(values: Iterable[str]) -> Dict[str, str]:
+    inputs = {}
+    for value in values:
+        name, sep, text = value.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Expected KEY=VALUE for --input, got '{value}'")
+        inputs[name] = text
+    return inputs
+
+
+def compile_cached(cache: Optional[CompileCache], source: Path, output: Path,
+                   inputs: Mapping[str, str], root: Path) -> Tuple[int, str, bool]:
+    """Compile ``source`` unless the cache already holds the result.
+
+    Returns the exit status, the compiler output and whether the PDF came
+    from the cache.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(source, inputs)
+        if cache.fetch(key, output):
+            return 0, "", True
+    command = ["typst", "compile", "--root", str(root)]
+    for name, value in inputs.items():
+        command += ["--input", f"{name}={value}"]
+    command += [str(source), str(output)]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             text=True, check=False)
+    if process.returncode == 0 and cache is not None:
+        cache.store(key, output)
+    return process.returncode, process.stdout, False
+
+
+def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compile Typst documents through a content-addressed cache.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Cache directory")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size cap in MiB (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser("compile", help="Compile a document, reusing a cached PDF if possible")
+    compile_parser.add_argument("source", type=Path)
+    compile_parser.add_argument("output", type=Path)
+    compile_parser.add_argument("--input", action="append", default=[], metavar="KEY=VALUE",
+                                help="Value passed to `typst compile --input` (repeatable)")
+    compile_parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Project root")
+    compile_parser.add_argument("--no-cache", action="store_true", help="Always compile")
+
+    commands.add_parser("stats", help="Show cache size and hit statistics")
+    commands.add_parser("clear", help="Remove every cached PDF")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str]) -> int:
+    args = parse_args(argv)
+    if args.max_size < 1:
+        print("Error: --max-size must be at least 1 MiB", file=sys.stderr)
+        return 2
+    root = args.root if args.command == "compile" else REPO_ROOT
+    cache = CompileCache(args.cache_dir, args.max_size * 1024 * 1024, root=root)
+
+    if args.command == "stats":
+        stats = cache.run_stats()
+        totals = cache.totals()
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        print(f"{stats['entries']} cached PDFs, {stats['bytes'] / 1048576:.1f} of "
+              f"{stats['max_bytes'] / 1048576:.0f} MiB")
+        print(f"{totals.get('hits', 0)} hits, {totals.get('misses', 0)} misses"
+              + (f" ({100 * totals.get('hits', 0) / lookups:.0f}% hit rate)" if lookups else "")
+              + f", {totals.get('evictions', 0)} evictions")
+        return 0
+
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} cached PDFs")
+        return 0
+
+    try:
+        inputs = parse_inputs(args.input)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    if not args.source.exists():
+        print(f"Error: {args.source} does not exist", file=sys.stderr)
+        return 1
+
+    status, output, cached = compile_cached(None if args.no_cache else cache,
+                                            args.source, args.output, inputs, args.root)
+    if not args.no_cache:
+        cache.save()
+    if output:
+        print(output, end="" if output.endswith("\n") else "\n")
+    if cached:
+        print(f"{args.output} is up to date (cached)")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -14,29 +14,469 @@ Commands:
     list        List all abbreviations
     validate    Validate abbreviations file
     export      Export abbreviations to different formats
-    import      Import abbreviations from CSV/JSON
+    import      Import abbreviations from CSV/JSON/JSON Lines
     stats       Show abbreviation statistics
+    batch       Apply add/remove/update operations from JSON Lines in one transaction
+    serve       Keep abbreviations and glossary in memory behind a Unix socket (see term_daemon.py)
+    compile     Generate the precomputed lookup tables (<config>-compiled.typ) used by the template
+    usage       Report where abbreviations are used, unused and undefined
 
 Examples:
     python manage_abbreviations.py add --key "Machine Learning" --short "ML" --long "A method of data analysis..."
     python manage_abbreviations.py list --sort short
     python manage_abbreviations.py validate
+    python manage_abbreviations.py usage --paths examples/chapters
     python manage_abbreviations.py export --format csv --output abbreviations.csv
+    python manage_abbreviations.py export --format jsonl --fields short,key --sort short
+    python manage_abbreviations.py import --input vocabulary.csv --on-conflict overwrite
+    python manage_abbreviations.py batch --input edits.jsonl
+
+Batch operations are JSON objects, one per line:
+    {"op": "add", "key": "Natural Language Processing", "short": "NLP", "long": "..."}
+    {"op": "update", "short": "NLP", "long": "...", "new_short": "NLProc"}
+    {"op": "remove", "short": "NLProc"}
 """
 
 import argparse
+import csv
+import json
+import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from typst_data import (
+    PARSE_CACHE_DIR,
+    ParsedArray,
+    TypstParseError,
+    atomic_write_text,
+    format_entry,
+    format_string,
+    format_value,
+    load_array_cached,
+    render_array,
+    source_digest,
+    store_cached_array,
+)
+from term_records import Abbreviation
+from typst_deps import DependencyGraph
+
+# Index value: one entry id, or a list of ids when a value is shared
+IdSet = Union[int, List[int]]
+
+ABBREVIATION_FORMAT = re.compile(r'^[A-Z]{2,8}$')
+
+
+IMPORT_FORMATS = ('csv', 'json', 'jsonl')
+EXPORT_FIELDS = ('key', 'short', 'long', 'category')
+DEFAULT_EXPORT_FIELDS = ('key', 'short', 'long')
+EXPORT_HEADERS = {'key': 'Key', 'short': 'Abbreviation', 'long': 'Description', 'category': 'Category'}
+CONFLICT_POLICIES = ('skip', 'overwrite', 'fail')
+BATCH_OPERATIONS = ('add', 'remove', 'update')
+
+# CSV headers accepted by `import`, covering both this script's export format
+# and the lower-case field names written by manage_terms.py
+CSV_COLUMNS = {
+    'key': 'key',
+    'term': 'key',
+    'short': 'short',
+    'abbreviation': 'short',
+    'long': 'long',
+    'description': 'long',
+    'definition': 'long',
+    'category': 'category',
+}
+
+
+# Directories skipped when scanning the thesis sources for abbreviation usage
+USAGE_SKIP_DIRS = {'.git', '.typst-cache', 'build', 'docs', 'node_modules', '__pycache__'}
+# Header line of the modules written by the scripts; those repeat every key
+# and short form, so scanning them would count every entry as used
+GENERATED_MARKER = 'do not edit by hand'
+# Upper-case tokens that look like abbreviations when they are not defined
+UNDEFINED_TOKEN = r'[A-Z][A-Z0-9]{1,7}\b'
+# Files below this total size are scanned in-process; spawning workers costs more
+PARALLEL_SCAN_BYTES = 1 << 20
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex matching any of ``words``, shaped as a character trie.
+
+    Unlike a flat ``a|b|c`` alternation, which the regex engine retries word
+    by word at every position, the trie form decides each character once, so
+    matching cost depends on the text rather than on the number of words.
+    Longer words are preferred over their prefixes.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return ('(?:' + body + ')?') if len(branches) > 1 or len(body) > 1 else body + '?'
+        return body
+
+    return build(trie) if trie else '(?!)'
+
+
+_usage_pattern: Optional['re.Pattern[str]'] = None
+
+
+def _init_usage_worker(pattern: str) -> None:
+    global _usage_pattern
+    _usage_pattern = re.compile(pattern)
+
+
+def _scan_usage_file(path: str) -> Tuple[str, Dict[str, int], Dict[str, int], Dict[str, int]]:
+    """Count short-form, key and undefined-token matches in one file."""
+    shorts: Dict[str, int] = {}
+    keys: Dict[str, int] = {}
+    undefined: Dict[str, int] = {}
+    try:
+        text = Path(path).read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return path, shorts, keys, undefined
+    for match in _usage_pattern.finditer(text):
+        group = match.lastgroup
+        if group in ('comment', 'literal'):
+            continue
+        target = shorts if group == 'short' else keys if group == 'key' else undefined
+        value = match.group(group)
+        if group == 'key':
+            value = value.casefold()
+        target[value] = target.get(value, 0) + 1
+    return path, shorts, keys, undefined
+
+
+def is_generated(path: Path) -> bool:
+    """Return whether ``path`` is a module written by one of the scripts."""
+    try:
+        with path.open(encoding='utf-8', errors='replace') as handle:
+            head = [handle.readline() for _ in range(3)]
+    except OSError:
+        return False
+    return any(GENERATED_MARKER in line for line in head)
+
+
+def compiled_module_path(config_path: Path) -> Path:
+    """Return where the generated lookup module for ``config_path`` lives."""
+    return config_path.with_name(f"{config_path.stem}-compiled.typ")
+
+
+def _typst_dict_lines(name: str, pairs: Iterable[Tuple[str, str]]) -> List[str]:
+    lines = [f"#let {name} = ("]
+    lines += [f"  {key}: {value}," for key, value in pairs]
+    if len(lines) == 1:
+        return [f"#let {name} = (:)"]
+    return lines + [")"]
+
+
+def render_compiled_module(entries: List[Abbreviation], config_name: str, source_size: int) -> str:
+    """Render the precomputed lookup tables for ``entries`` as a Typst module.
+
+    Tables refer to entries by their position in the config array. The
+    module records the entry count and the size in bytes of the config file
+    it was built from (``source_size``); the config only uses the tables
+    while both still match.
+    """
+    short_index: Dict[str, int] = {}
+    key_index: Dict[str, int] = {}
+    groups: Dict[str, List[int]] = {}
+    for position, entry in enumerate(entries):
+        # The first entry wins, matching `abbreviations.find(...)`
+        short_index.setdefault(entry.short, position)
+        key_index.setdefault(entry.key, position)
+        groups.setdefault(entry.category or 'General', []).append(position)
+
+    positions = range(len(entries))
+    lines = [
+        f"// Precomputed lookup tables for {config_name}.",
+        "// Generated by scripts/manage_abbreviations.py compile; do not edit by hand.",
+        "",
+        f"#let abbreviation-count = {len(entries)}",
+        f"#let abbreviation-source-size = {source_size}",
+        "",
+    ]
+    lines += _typst_dict_lines("short-index", ((format_string(k), str(v)) for k, v in short_index.items()))
+    lines.append("")
+    lines += _typst_dict_lines("key-index", ((format_string(k), str(v)) for k, v in key_index.items()))
+    lines.append("")
+    for field in ('key', 'short', 'long'):
+        order = sorted(positions, key=lambda position: str(getattr(entries[position], field)))
+        lines.append(f"#let order-by-{field} = {format_value(order)}")
+    lines.append("")
+    lines += _typst_dict_lines("category-groups",
+                               ((format_string(k), format_value(v)) for k, v in groups.items()))
+    return "\n".join(lines) + "\n"
+
+
+class ImportConflict(Exception):
+    """Raised when an imported row conflicts and the policy is 'fail'."""
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[Dict]:
+    """Yield abbreviation rows from a CSV stream, mapping known header names."""
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [CSV_COLUMNS.get(name.strip().lower()) for name in header]
+    for row in reader:
+        yield {field: value for field, value in zip(columns, row) if field}
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = 65536) -> Iterator[Dict]:
+    """Yield the objects of a top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+        return bool(chunk)
+
+    def skip_whitespace() -> None:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if buffer[position:position + 1] != '[':
+        raise ValueError("JSON input must be an array of objects")
+    position += 1
+
+    expect_item = True
+    while True:
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON input")
+        char = buffer[position]
+        if char == ']':
+            return
+        if not expect_item:
+            if char != ',':
+                raise ValueError(f"Expected ',' in JSON array, found {char!r}")
+            position += 1
+            expect_item = True
+            continue
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                # The object may simply be cut off at the chunk boundary
+                if eof or not fill():
+                    raise
+        position = end
+        expect_item = False
+        yield item
+
+
+def iter_jsonl_rows(stream: TextIO) -> Iterator[Dict]:
+    """Yield one object per non-empty line of a JSON Lines stream."""
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON on line {number}: {exc}") from exc
+
+
+def iter_import_rows(stream: TextIO, format_type: str) -> Iterator[Dict]:
+    """Yield raw abbreviation rows from a stream in the given format."""
+    if format_type == 'csv':
+        return iter_csv_rows(stream)
+    if format_type == 'json':
+        return iter_json_array(stream)
+    if format_type == 'jsonl':
+        return iter_jsonl_rows(stream)
+    raise ValueError(f"Unsupported format: {format_type}")
+
+
+class AbbreviationStore:
+    """Ordered abbreviation records indexed by short form, key and folded short form.
+
+    Ids are positions in an append-only list; a removed entry leaves ``None``
+    behind. Entries loaded from disk may contain duplicates, so each index
+    maps a value to the id of the entry carrying it, or to a list of ids once
+    several do; the common unique case needs no list per entry. Lookups,
+    appends and removals are O(1) in the number of entries.
+    """
+
+    def __init__(self, entries: Iterable[Abbreviation] = ()):
+        self._entries: List[Optional[Abbreviation]] = []
+        self._count = 0
+        self._by_short: Dict[str, IdSet] = {}
+        self._by_key: Dict[str, IdSet] = {}
+        self._by_folded: Dict[str, IdSet] = {}
+        for entry in entries:
+            self.append(entry)
+
+    def __iter__(self) -> Iterator[Abbreviation]:
+        return (entry for entry in self._entries if entry is not None)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _index_add(index: Dict[str, IdSet], value: str, entry_id: int) -> None:
+        ids = index.get(value)
+        if ids is None:
+            index[value] = entry_id
+        elif type(ids) is int:
+            index[value] = [ids, entry_id]
+        else:
+            ids.append(entry_id)
+
+    @staticmethod
+    def _index_remove(index: Dict[str, IdSet], value: str, entry_id: int) -> None:
+        ids = index[value]
+        if type(ids) is int:
+            del index[value]
+            return
+        ids.remove(entry_id)
+        if len(ids) == 1:
+            index[value] = ids[0]
+
+    def _first(self, index: Dict[str, IdSet], value: str) -> Optional[int]:
+        ids = index.get(value)
+        if ids is None or type(ids) is int:
+            return ids
+        return ids[0]
+
+    def _index_entry(self, entry: Abbreviation, entry_id: int) -> None:
+        self._index_add(self._by_short, entry.short, entry_id)
+        self._index_add(self._by_key, entry.key, entry_id)
+        self._index_add(self._by_folded, entry.short.casefold(), entry_id)
+
+    def _unindex_entry(self, entry: Abbreviation, entry_id: int) -> None:
+        self._index_remove(self._by_short, entry.short, entry_id)
+        self._index_remove(self._by_key, entry.key, entry_id)
+        self._index_remove(self._by_folded, entry.short.casefold(), entry_id)
+
+    def append(self, entry: Abbreviation) -> int:
+        """Add an entry and return its id."""
+        entry_id = len(self._entries)
+        self._entries.append(entry)
+        self._count += 1
+        self._index_entry(entry, entry_id)
+        return entry_id
+
+    def items(self) -> Iterator[Tuple[int, Abbreviation]]:
+        """Iterate over ``(id, entry)`` pairs in order."""
+        return ((entry_id, entry) for entry_id, entry in enumerate(self._entries) if entry is not None)
+
+    def get(self, short: str) -> Optional[Abbreviation]:
+        """Return the first entry with the given short form."""
+        entry_id = self._first(self._by_short, short)
+        return None if entry_id is None else self._entries[entry_id]
+
+    def get_by_key(self, key: str) -> Optional[Abbreviation]:
+        """Return the first entry with the given key."""
+        entry_id = self._first(self._by_key, key)
+        return None if entry_id is None else self._entries[entry_id]
+
+    def find_folded(self, short: str) -> List[Abbreviation]:
+        """Return every entry whose short form matches ignoring case."""
+        ids = self._by_folded.get(short.casefold(), ())
+        if type(ids) is int:
+            ids = (ids,)
+        return [self._entries[i] for i in ids]
+
+    def remove(self, short: str) -> Optional[Abbreviation]:
+        """Remove and return the first entry with the given short form."""
+        entry_id = self._first(self._by_short, short)
+        if entry_id is None:
+            return None
+        entry = self._entries[entry_id]
+        self._entries[entry_id] = None
+        self._count -= 1
+        self._unindex_entry(entry, entry_id)
+        return entry
+
+    def replace(self, short: str, entry: Abbreviation) -> Optional[Abbreviation]:
+        """Swap the first entry with the given short form for ``entry`` in place."""
+        entry_id = self._first(self._by_short, short)
+        if entry_id is None:
+            return None
+        old = self._entries[entry_id]
+        self._unindex_entry(old, entry_id)
+        self._entries[entry_id] = entry
+        self._index_entry(entry, entry_id)
+        return old
+
+    def snapshot(self) -> List[Optional[Abbreviation]]:
+        """Capture the current entries so a later ``restore`` can undo changes."""
+        return list(self._entries)
+
+    def restore(self, snapshot: List[Optional[Abbreviation]]) -> None:
+        """Return to a snapshot, keeping the original entry ids and order."""
+        self._entries = list(snapshot)
+        self._count = 0
+        self._by_short = {}
+        self._by_key = {}
+        self._by_folded = {}
+        for entry_id, entry in enumerate(self._entries):
+            if entry is not None:
+                self._count += 1
+                self._index_entry(entry, entry_id)
+
+    def duplicate_shorts(self) -> Dict[str, int]:
+        """Return short forms used by more than one entry, with their counts."""
+        return {short: len(ids) for short, ids in self._by_short.items() if type(ids) is list}
+
+    def duplicate_keys(self) -> Dict[str, int]:
+        """Return keys used by more than one entry, with their counts."""
+        return {key: len(ids) for key, ids in self._by_key.items() if type(ids) is list}
+
+    def case_variants(self) -> List[List[str]]:
+        """Return groups of distinct short forms that differ only by case."""
+        groups = []
+        for ids in self._by_folded.values():
+            if type(ids) is list:
+                shorts = list(dict.fromkeys(self._entries[i].short for i in ids))
+                if len(shorts) > 1:
+                    groups.append(shorts)
+        return groups
 
 
 class AbbreviationManager:
     """Manages abbreviations in the Typst template."""
 
-    def __init__(self, config_path: Path):
+    def __init__(self, config_path: Path, use_cache: bool = True):
         self.config_path = config_path
-        self.abbreviations = []
+        self.use_cache = use_cache
+        self.abbreviations = AbbreviationStore()
+        # Content hash and element spans from the last load or save. For each
+        # store id present at that point, the record that was parsed and the
+        # index of its span; saves copy the text of ids still holding it.
+        self._digest: Optional[str] = None
+        self._parsed: Optional[ParsedArray] = None
+        self._loaded: List[Optional[Abbreviation]] = []
+        self._loaded_index = array('q')
+        # Elements that are not entries, as (index, value); saves keep them in place
+        self._skipped: List[Tuple[int, Any]] = []
         self.load_abbreviations()
 
     def load_abbreviations(self) -> None:
@@ -45,82 +485,142 @@ class AbbreviationManager:
             print(f"Error: Config file not found at {self.config_path}")
             return
 
-        content = self.config_path.read_text()
-
-        # Extract the abbreviations array using regex
-        # Match from #let abbreviations = ( to the closing ) followed by newline
-        array_match = re.search(r'#let abbreviations = \((.*?)\)\s*$', content, re.MULTILINE | re.DOTALL)
-        if not array_match:
-            print("Error: Could not find abbreviations array in config file")
+        cache_dir = PARSE_CACHE_DIR if self.use_cache else None
+        try:
+            parsed, digest = load_array_cached(self.config_path, 'abbreviations', cache_dir)
+        except TypstParseError as exc:
+            print(f"Error: Could not parse abbreviations array in config file: {exc}")
             return
 
-        array_content = array_match.group(1)
-
-        # Parse individual entries
-        entries = []
-        current_entry = {}
-        in_entry = False
-        paren_depth = 0
-
-        lines = array_content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('//'):
+        store = AbbreviationStore()
+        loaded_index = array('q')
+        skipped = []
+        from_dict = Abbreviation.from_dict
+        for index, entry in enumerate(parsed.entries):
+            if not isinstance(entry, dict):
+                print(f"Warning: Skipping non-dictionary abbreviation entry: {entry!r}")
+                skipped.append((index, entry))
                 continue
+            store.append(from_dict(entry))
+            loaded_index.append(index)
+
+        parsed.entries = []
+        self.abbreviations = store
+        self._loaded = store.snapshot()
+        self._loaded_index = loaded_index
+        self._skipped = skipped
+        self._digest = digest
+        self._parsed = parsed
+
+    def save_abbreviations(self) -> bool:
+        """Save abbreviations back to the config file.
+
+        Only entries that were added or changed since loading are rendered;
+        everything else is copied from the existing source by span. The file
+        is replaced atomically and left untouched when nothing changed.
+        Returns True if the file was written.
+        """
+        if self._parsed is None or self._digest is None:
+            print("Error: Refusing to save, abbreviations were not loaded successfully")
+            return False
 
-            if line.startswith('('):
-                in_entry = True
-                current_entry = {}
-                paren_depth = 0
-
-            if in_entry:
-                paren_depth += line.count('(') - line.count(')')
-
-                # Extract key-value pairs
-                key_match = re.search(r'key:\s*"([^"]*)"', line)
-                short_match = re.search(r'short:\s*"([^"]*)"', line)
-                long_match = re.search(r'long:\s*"([^"]*)"', line)
-
-                if key_match:
-                    current_entry['key'] = key_match.group(1)
-                if short_match:
-                    current_entry['short'] = short_match.group(1)
-                if long_match:
-                    current_entry['long'] = long_match.group(1)
-
-                if paren_depth == 0 and current_entry:
-                    entries.append(current_entry)
-                    current_entry = {}
-                    in_entry = False
-
-        self.abbreviations = entries
-
-    def save_abbreviations(self) -> None:
-        """Save abbreviations back to the config file."""
-        if not self.config_path.exists():
-            print(f"Error: Config file not found at {self.config_path}")
-            return
-
-        content = self.config_path.read_text()
-
-        # Generate new abbreviations array
-        abbr_lines = ['#let abbreviations = (']
-        for entry in self.abbreviations:
-            abbr_lines.append('  (')
-            abbr_lines.append(f'    key: "{entry["key"]}",')
-            abbr_lines.append(f'    short: "{entry["short"]}",')
-            abbr_lines.append(f'    long: "{entry["long"]}"')
-            abbr_lines.append('  ),')
-        abbr_lines.append(')')
-
-        new_abbreviations = '\n'.join(abbr_lines)
+        try:
+            source = self.config_path.read_text(encoding='utf-8')
+        except OSError as exc:
+            print(f"Error: Could not read {self.config_path}: {exc}")
+            return False
+        if source_digest(source) != self._digest:
+            print(f"Error: {self.config_path} changed on disk since it was loaded; "
+                  "reload and reapply the change")
+            return False
 
-        # Replace the old abbreviations array
-        pattern = r'#let abbreviations = \((.*?)\)'
-        new_content = re.sub(pattern, new_abbreviations, content, flags=re.DOTALL)
+        # Skipped elements go back before the first surviving entry that
+        # followed them, or ahead of the new entries
+        elements = []
+        values: List[Any] = []
+        skipped = deque(self._skipped)
+
+        def keep_skipped(before: Optional[int]) -> None:
+            while skipped and (before is None or skipped[0][0] < before):
+                index, value = skipped.popleft()
+                start, end = self._parsed.spans[index]
+                elements.append((index, source[start:end]))
+                values.append(value)
+
+        loaded = self._loaded
+        for entry_id, entry in self.abbreviations.items():
+            if entry_id < len(loaded) and loaded[entry_id] is entry:
+                index = self._loaded_index[entry_id]
+                keep_skipped(index)
+                start, end = self._parsed.spans[index]
+                elements.append((index, source[start:end]))
+            else:
+                keep_skipped(None)
+                elements.append((None, format_entry(entry.to_dict())))
+            values.append(entry)
+        keep_skipped(None)
+
+        new_content, parsed = render_array(source, self._parsed, elements)
+        if new_content == source:
+            print(f"No changes to save in {self.config_path}")
+            return False
 
-        self.config_path.write_text(new_content)
+        atomic_write_text(self.config_path, new_content)
+
+        # The written text becomes the new baseline for further saves, and
+        # the parse cache is refreshed so the next call starts warm. The store
+        # is compacted so ids line up with the new spans again.
+        self.abbreviations = AbbreviationStore(self.abbreviations)
+        self._loaded = self.abbreviations.snapshot()
+        self._loaded_index = array('q', (index for index, value in enumerate(values)
+                                         if isinstance(value, Abbreviation)))
+        self._skipped = [(index, value) for index, value in enumerate(values)
+                         if not isinstance(value, Abbreviation)]
+        self._digest = source_digest(new_content)
+        self._parsed = parsed
+        if self.use_cache:
+            parsed.entries = [value.to_dict() if isinstance(value, Abbreviation) else value
+                              for value in values]
+            store_cached_array(self.config_path, parsed, self._digest)
+            parsed.entries = []
         print(f"Saved {len(self.abbreviations)} abbreviations to {self.config_path}")
+        if compiled_module_path(self.config_path).exists():
+            self.compile_abbreviations()
+        return True
+
+    def compile_abbreviations(self, output_path: Optional[Path] = None) -> Optional[Path]:
+        """Write the precomputed lookup module used by the template.
+
+        Defaults to ``<config>-compiled.typ`` next to the config file, which
+        `config/abbreviations.typ` imports. Returns the path written, or None
+        if the abbreviations could not be loaded or differ from the file.
+        """
+        if self._parsed is None:
+            print("Error: Refusing to compile, abbreviations were not loaded successfully")
+            return None
+        if self.abbreviations.snapshot() != self._loaded:
+            print("Error: Refusing to compile unsaved changes; save them first")
+            return None
+        try:
+            source = self.config_path.read_bytes()
+        except OSError as exc:
+            print(f"Error: Could not read {self.config_path}: {exc}")
+            return None
+        # The tables describe the file as loaded, so it must not have changed since
+        if source_digest(source.decode('utf-8')) != self._digest:
+            print(f"Error: {self.config_path} changed on disk since it was loaded; compile again")
+            return None
+        output_path = output_path or compiled_module_path(self.config_path)
+        text = render_compiled_module(list(self.abbreviations), self.config_path.name, len(source))
+        try:
+            if output_path.read_text(encoding='utf-8') == text:
+                print(f"Lookup tables in {output_path} are up to date")
+                return output_path
+        except OSError:
+            pass
+        atomic_write_text(output_path, text)
+        print(f"Compiled lookup tables for {len(self.abbreviations)} abbreviations to {output_path}")
+        return output_path
 
     def add_abbreviation(self, key: str, short: str, long_desc: str) -> bool:
         """Add a new abbreviation."""
@@ -130,37 +630,270 @@ class AbbreviationManager:
             return False
 
         # Check for duplicates
-        for abbr in self.abbreviations:
-            if abbr['short'] == short:
-                print(f"Error: Abbreviation '{short}' already exists")
-                return False
-            if abbr['key'] == key:
-                print(f"Error: Key '{key}' already exists")
-                return False
+        if self.abbreviations.get(short) is not None:
+            print(f"Error: Abbreviation '{short}' already exists")
+            return False
+        if self.abbreviations.get_by_key(key) is not None:
+            print(f"Error: Key '{key}' already exists")
+            return False
+
+        for existing in self.abbreviations.find_folded(short):
+            print(f"Warning: Abbreviation '{short}' differs only by case from '{existing.short}'")
 
         # Validate abbreviation format
-        if not re.match(r'^[A-Z]{2,8}$', short):
+        if not ABBREVIATION_FORMAT.match(short):
             print(f"Warning: Abbreviation '{short}' doesn't match recommended format (2-8 uppercase letters)")
 
-        self.abbreviations.append({
-            'key': key,
-            'short': short,
-            'long': long_desc
-        })
+        self.abbreviations.append(Abbreviation(key, short, long_desc))
 
         print(f"Added abbreviation: {key} ({short})")
         return True
 
     def remove_abbreviation(self, short: str) -> bool:
         """Remove an abbreviation by its short form."""
-        for i, abbr in enumerate(self.abbreviations):
-            if abbr['short'] == short:
-                removed = self.abbreviations.pop(i)
-                print(f"Removed abbreviation: {removed['key']} ({short})")
-                return True
+        removed = self.abbreviations.remove(short)
+        if removed is None:
+            print(f"Error: Abbreviation '{short}' not found")
+            return False
 
-        print(f"Error: Abbreviation '{short}' not found")
-        return False
+        print(f"Removed abbreviation: {removed.key} ({short})")
+        return True
+
+    def import_abbreviations(self, rows: Iterable[Dict], on_conflict: str = 'skip',
+                             max_reported: int = 20) -> Dict[str, int]:
+        """Merge rows into the store, resolving conflicts with ``on_conflict``.
+
+        Rows are checked against the store's indexes as they arrive, so rows
+        that clash with each other are caught as well as clashes with the
+        existing file. Nothing is saved here; the caller saves once at the end.
+        """
+        counts = {'added': 0, 'overwritten': 0, 'skipped': 0, 'invalid': 0}
+        reported = 0
+
+        def report(message: str) -> None:
+            nonlocal reported
+            if reported < max_reported:
+                print(f"  - {message}")
+            reported += 1
+
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                counts['invalid'] += 1
+                report(f"Row {number}: expected an object, got {type(row).__name__}")
+                continue
+            key, short, long_desc = (str(row.get(field) or '').strip() for field in ('key', 'short', 'long'))
+            category = str(row['category']).strip() if row.get('category') else None
+            entry = Abbreviation(key, short, long_desc, category and sys.intern(category))
+            if not key or not short:
+                counts['invalid'] += 1
+                report(f"Row {number}: key and abbreviation are required")
+                continue
+
+            by_short = self.abbreviations.get(short)
+            by_key = self.abbreviations.get_by_key(key)
+            if by_short is None and by_key is None:
+                self.abbreviations.append(entry)
+                counts['added'] += 1
+                continue
+
+            if on_conflict == 'fail':
+                raise ImportConflict(
+                    f"Row {number}: '{short}' ({key}) conflicts with an existing entry"
+                )
+            if on_conflict == 'overwrite' and by_short is not None and by_key in (None, by_short):
+                self.abbreviations.replace(short, entry)
+                counts['overwritten'] += 1
+                continue
+
+            counts['skipped'] += 1
+            if by_short is not None:
+                report(f"Row {number}: abbreviation '{short}' already exists")
+            else:
+                report(f"Row {number}: key '{key}' already exists as '{by_key.short}'")
+
+        if reported > max_reported:
+            print(f"  ... and {reported - max_reported} more")
+        return counts
+
+    def _apply_operation(self, op: Dict) -> str:
+        """Apply one batch operation to the store, raising ValueError if it cannot apply."""
+        action = op.get('op')
+        if action not in BATCH_OPERATIONS:
+            raise ValueError(f"unknown op {action!r}, expected one of {', '.join(BATCH_OPERATIONS)}")
+        fields = {field: str(op[field]).strip() for field in ('key', 'short', 'long', 'category')
+                  if op.get(field) is not None}
+        short = fields.get('short')
+        if not short:
+            raise ValueError("'short' is required")
+
+        if action == 'remove':
+            removed = self.abbreviations.remove(short)
+            if removed is None:
+                raise ValueError(f"abbreviation '{short}' not found")
+            return f"removed {removed.key} ({short})"
+
+        if action == 'add':
+            if not fields.get('key'):
+                raise ValueError("'key' is required")
+            if self.abbreviations.get(short) is not None:
+                raise ValueError(f"abbreviation '{short}' already exists")
+            if self.abbreviations.get_by_key(fields['key']) is not None:
+                raise ValueError(f"key '{fields['key']}' already exists")
+            category = fields.get('category')
+            entry = Abbreviation(fields['key'], short, fields.get('long', ''), category and sys.intern(category))
+            self.abbreviations.append(entry)
+            return f"added {entry.key} ({short})"
+
+        existing = self.abbreviations.get(short)
+        if existing is None:
+            raise ValueError(f"abbreviation '{short}' not found")
+        changes = {field: fields[field] for field in ('key', 'long') if field in fields}
+        if 'category' in fields:
+            changes['category'] = sys.intern(fields['category'])
+        new_short = str(op.get('new_short') or '').strip()
+        if new_short:
+            changes['short'] = new_short
+        entry = existing._replace(**changes)
+        if not entry.key:
+            raise ValueError("'key' cannot be empty")
+        if entry.short != short and self.abbreviations.get(entry.short) is not None:
+            raise ValueError(f"abbreviation '{entry.short}' already exists")
+        if self.abbreviations.get_by_key(entry.key) not in (None, existing):
+            raise ValueError(f"key '{entry.key}' already exists")
+        if entry == existing:
+            return f"unchanged {entry.key} ({short})"
+        self.abbreviations.replace(short, entry)
+        return f"updated {entry.key} ({entry.short})"
+
+    def apply_batch(self, operations: Iterable[Dict]) -> Tuple[bool, List[Dict]]:
+        """Apply add/remove/update operations in memory as one transaction.
+
+        Every operation is attempted so the report covers the whole batch;
+        each one sees the effect of those before it. The result is validated
+        once at the end. If any operation fails, or validation finds errors
+        the file did not already have, the store is rolled back. Nothing is
+        saved here; the caller saves once on success.
+        """
+        snapshot = self.abbreviations.snapshot()
+        results = []
+        failed = False
+        for number, op in enumerate(operations, 1):
+            result = {'op': number, 'action': None, 'short': None}
+            try:
+                if not isinstance(op, dict):
+                    raise ValueError(f"expected an object, got {type(op).__name__}")
+                result['action'], result['short'] = op.get('op'), op.get('short')
+                result.update(status='ok', message=self._apply_operation(op))
+            except ValueError as exc:
+                failed = True
+                result.update(status='error', message=str(exc))
+            results.append(result)
+
+        if not failed:
+            errors, _ = self.validate_abbreviations()
+            if errors:
+                # Only reject problems this batch introduced, so a file that
+                # already had issues can still be edited
+                current = self.abbreviations.snapshot()
+                self.abbreviations.restore(snapshot)
+                existing_errors = set(self.validate_abbreviations()[0])
+                self.abbreviations.restore(current)
+                new_errors = [error for error in errors if error not in existing_errors]
+                if new_errors:
+                    failed = True
+                    results.append({'op': None, 'action': 'validate', 'short': None,
+                                    'status': 'error', 'message': '; '.join(new_errors)})
+
+        if failed:
+            self.abbreviations.restore(snapshot)
+        return not failed, results
+
+    def usage_pattern(self) -> str:
+        """Return one regex matching every key, short form and undefined-looking token.
+
+        Keys match case-insensitively; short forms and the fallback token
+        group are case-sensitive. Defined short forms are tried before the
+        fallback, so only undefined tokens reach the ``undefined`` group.
+        """
+        keys = trie_pattern({abbr.key.casefold() for abbr in self.abbreviations})
+        shorts = trie_pattern({abbr.short for abbr in self.abbreviations})
+        # Comments, and keys that are a whole string literal such as
+        # `kind: "algorithm"`, are matched first so they are skipped (`://` is a
+        # URL). Keys must not be part of an identifier such as
+        # `algorithm-counter` or a call or definition such as `algorithm(...)`.
+        return (r'(?P<comment>(?<!:)//[^\n]*|/\*[\s\S]*?\*/)'
+                rf'|(?P<literal>"(?i:{keys})")'
+                rf'|(?<![\w#.-])(?i:(?P<key>{keys}))(?![\w(-])'
+                rf'|(?<![\w#])(?P<short>{shorts})(?!\w)'
+                rf'|(?<![#\w])(?P<undefined>{UNDEFINED_TOKEN})')
+
+    def document_sources(self) -> List[Path]:
+        """Return the sources the thesis, sample chapter and examples can read."""
+        return DependencyGraph(self.config_path.resolve().parent.parent).sources()
+
+    def scan_usage(self, paths: Optional[List[Path]] = None, jobs: Optional[int] = None) -> Dict:
+        """Scan Typst sources once for every abbreviation and report usage.
+
+        By default the sources reachable from the template's documents are
+        scanned. Files in the config directory and generated modules are
+        skipped, as are comments.
+
+        Returns per-file counts keyed by short form, the unused entries and
+        undefined-looking upper-case tokens with their counts.
+        """
+        files = []
+        for root in (paths if paths is not None else self.document_sources()):
+            if root.is_file():
+                files.append(root)
+                continue
+            for path in sorted(root.rglob('*.typ')):
+                relative = path.relative_to(root).parts[:-1]
+                if any(part in USAGE_SKIP_DIRS or part.startswith('.') for part in relative):
+                    continue
+                files.append(path)
+        # The config directory holds the entry data and template helpers, not text
+        config_dir = self.config_path.resolve().parent
+        files = [path for path in files
+                 if config_dir not in path.resolve().parents and not is_generated(path)]
+
+        pattern = self.usage_pattern()
+        names = [str(path) for path in files]
+        total_bytes = sum(path.stat().st_size for path in files)
+        if jobs != 1 and len(files) > 1 and total_bytes >= PARALLEL_SCAN_BYTES:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_usage_worker,
+                                     initargs=(pattern,)) as executor:
+                results = list(executor.map(_scan_usage_file, names, chunksize=8))
+        else:
+            _init_usage_worker(pattern)
+            results = [_scan_usage_file(name) for name in names]
+
+        key_to_short = {}
+        for abbr in self.abbreviations:
+            key_to_short.setdefault(abbr.key.casefold(), abbr.short)
+
+        per_file: Dict[str, Dict[str, int]] = {}
+        totals: Dict[str, int] = {}
+        undefined: Dict[str, Dict[str, int]] = {}
+        for path, shorts, keys, tokens in results:
+            counts = dict(shorts)
+            for key, count in keys.items():
+                short = key_to_short[key]
+                counts[short] = counts.get(short, 0) + count
+            if counts:
+                per_file[path] = counts
+            for short, count in counts.items():
+                totals[short] = totals.get(short, 0) + count
+            for token, count in tokens.items():
+                undefined.setdefault(token, {})[path] = count
+
+        unused = [abbr.to_dict() for abbr in self.abbreviations if abbr.short not in totals]
+        return {
+            'files_scanned': len(files),
+            'per_file': per_file,
+            'totals': totals,
+            'unused': unused,
+            'undefined': undefined,
+        }
 
     def list_abbreviations(self, sort_by: str = 'key', reverse: bool = False) -> None:
         """List all abbreviations."""
@@ -169,44 +902,41 @@ class AbbreviationManager:
             return
 
         # Sort abbreviations
-        sorted_abbr = sorted(self.abbreviations, key=lambda x: x[sort_by], reverse=reverse)
+        sorted_abbr = sorted(self.abbreviations, key=lambda x: getattr(x, sort_by), reverse=reverse)
 
         print(f"{'Key':<30} {'Short':<10} {'Description'}")
         print("-" * 80)
         for abbr in sorted_abbr:
-            desc = abbr['long'][:50] + "..." if len(abbr['long']) > 50 else abbr['long']
-            print(f"{abbr['key']:<30} {abbr['short']:<10} {desc}")
+            desc = abbr.long[:50] + "..." if len(abbr.long) > 50 else abbr.long
+            print(f"{abbr.key:<30} {abbr.short:<10} {desc}")
 
     def validate_abbreviations(self) -> Tuple[List[str], List[str]]:
         """Validate abbreviations and return errors and warnings."""
         errors = []
         warnings = []
 
-        shorts = [abbr['short'] for abbr in self.abbreviations]
-        keys = [abbr['key'] for abbr in self.abbreviations]
-
-        # Check for duplicates
-        for i, short in enumerate(shorts):
-            if shorts.count(short) > 1:
-                errors.append(f"Duplicate abbreviation: {short}")
-
-        for i, key in enumerate(keys):
-            if keys.count(key) > 1:
-                errors.append(f"Duplicate key: {key}")
+        # Duplicates come straight from the store's indexes, one report per value
+        for short in self.abbreviations.duplicate_shorts():
+            errors.append(f"Duplicate abbreviation: {short}")
+        for key in self.abbreviations.duplicate_keys():
+            errors.append(f"Duplicate key: {key}")
+        for variants in self.abbreviations.case_variants():
+            warnings.append(f"Abbreviations differ only by case: {', '.join(variants)}")
 
-        # Check for empty fields
+        # Check for empty fields and abbreviation format
         for abbr in self.abbreviations:
-            if not abbr['key'].strip():
+            wrong_type = [field for field in ('key', 'short', 'long') if not isinstance(getattr(abbr, field), str)]
+            if wrong_type:
+                errors.append(f"Non-string {', '.join(wrong_type)} for: {abbr.key!r} ({abbr.short!r})")
+                continue
+            if not abbr.key.strip():
                 errors.append("Empty key found")
-            if not abbr['short'].strip():
-                errors.append(f"Empty abbreviation for key: {abbr['key']}")
-            if not abbr['long'].strip():
-                warnings.append(f"Empty description for: {abbr['key']} ({abbr['short']})")
-
-        # Check abbreviation format
-        for abbr in self.abbreviations:
-            if not re.match(r'^[A-Z]{2,8}$', abbr['short']):
-                warnings.append(f"Non-standard abbreviation format: {abbr['short']}")
+            if not abbr.short.strip():
+                errors.append(f"Empty abbreviation for key: {abbr.key}")
+            if not abbr.long.strip():
+                warnings.append(f"Empty description for: {abbr.key} ({abbr.short})")
+            if not ABBREVIATION_FORMAT.match(abbr.short):
+                warnings.append(f"Non-standard abbreviation format: {abbr.short}")
 
         return errors, warnings
 
@@ -216,9 +946,9 @@ class AbbreviationManager:
             return {'total': 0}
 
         total = len(self.abbreviations)
-        avg_key_len = sum(len(abbr['key']) for abbr in self.abbreviations) / total
-        avg_short_len = sum(len(abbr['short']) for abbr in self.abbreviations) / total
-        avg_long_len = sum(len(abbr['long']) for abbr in self.abbreviations) / total
+        avg_key_len = sum(len(abbr.key) for abbr in self.abbreviations) / total
+        avg_short_len = sum(len(abbr.short) for abbr in self.abbreviations) / total
+        avg_long_len = sum(len(abbr.long) for abbr in self.abbreviations) / total
 
         return {
             'total': total,
@@ -227,32 +957,88 @@ class AbbreviationManager:
             'avg_description_length': round(avg_long_len, 1)
         }
 
-    def export_abbreviations(self, format_type: str, output_path: Optional[Path] = None) -> str:
-        """Export abbreviations to different formats."""
-        if format_type == 'csv':
-            lines = ['Key,Abbreviation,Description']
-            for abbr in self.abbreviations:
-                # Escape quotes in CSV
-                key = abbr['key'].replace('"', '""')
-                short = abbr['short'].replace('"', '""')
-                long_desc = abbr['long'].replace('"', '""')
-                lines.append(f'"{key}","{short}","{long_desc}"')
-            content = '\n'.join(lines)
-
-        elif format_type == 'json':
-            import json
-            content = json.dumps(self.abbreviations, indent=2)
-
-        else:
+    def iter_export_rows(self, fields: Optional[List[str]] = None, sort_by: Optional[str] = None,
+                         reverse: bool = False) -> Iterator[Dict]:
+        """Yield entries for export, optionally projected and sorted.
+
+        Without sorting, entries are streamed straight from the store. Sorting
+        orders references to the stored records, and each row is converted to
+        a dictionary only as it is written.
+        """
+        entries: Iterable[Abbreviation] = self.abbreviations
+        if sort_by:
+            entries = sorted(entries, key=lambda abbr: getattr(abbr, sort_by) or '', reverse=reverse)
+        elif reverse:
+            entries = reversed(list(entries))
+        for abbr in entries:
+            if fields is None:
+                yield abbr.to_dict()
+            else:
+                yield {field: getattr(abbr, field) or '' for field in fields}
+
+    def export_abbreviations(self, format_type: str, output_path: Optional[Path] = None,
+                             fields: Optional[List[str]] = None, sort_by: Optional[str] = None,
+                             reverse: bool = False) -> int:
+        """Export abbreviations to different formats, writing rows as they are produced.
+
+        Returns the number of rows written.
+        """
+        if format_type not in EXPORT_WRITERS:
             raise ValueError(f"Unsupported format: {format_type}")
+        rows = self.iter_export_rows(fields, sort_by, reverse)
+        write = EXPORT_WRITERS[format_type]
 
         if output_path:
-            output_path.write_text(content)
-            print(f"Exported {len(self.abbreviations)} abbreviations to {output_path}")
+            with open(output_path, 'w', newline='', encoding='utf-8') as stream:
+                count = write(stream, rows, fields)
+            print(f"Exported {count} abbreviations to {output_path}")
         else:
-            print(content)
-
-        return content
+            count = write(sys.stdout, rows, fields)
+            sys.stdout.flush()
+
+        return count
+
+
+def write_csv(stream: TextIO, rows: Iterable[Dict], fields: Optional[List[str]]) -> int:
+    """Write rows as CSV with a header row; returns the number of rows."""
+    fields = fields or list(DEFAULT_EXPORT_FIELDS)
+    header = [EXPORT_HEADERS.get(field, field.title()) for field in fields]
+    csv.writer(stream, lineterminator='\n').writerow(header)
+    writer = csv.writer(stream, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    count = 0
+    for row in rows:
+        writer.writerow([row.get(field, '') for field in fields])
+        count += 1
+    return count
+
+
+def write_json(stream: TextIO, rows: Iterable[Dict], fields: Optional[List[str]]) -> int:
+    """Write rows as an indented JSON array, one element at a time."""
+    count = 0
+    stream.write('[')
+    for row in rows:
+        stream.write(',\n  ' if count else '\n  ')
+        stream.write(json.dumps(row, indent=2).replace('\n', '\n  '))
+        count += 1
+    stream.write('\n]\n' if count else ']\n')
+    return count
+
+
+def write_jsonl(stream: TextIO, rows: Iterable[Dict], fields: Optional[List[str]]) -> int:
+    """Write one JSON object per line."""
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+EXPORT_WRITERS = {
+    'csv': write_csv,
+    'json': write_json,
+    'jsonl': write_jsonl,
+}
 
 
 def main():
@@ -262,12 +1048,15 @@ def main():
         epilog=__doc__
     )
 
-    parser.add_argument('command', choices=['add', 'remove', 'list', 'validate', 'export', 'import', 'stats'],
+    parser.add_argument('command', choices=['add', 'remove', 'list', 'validate', 'export', 'import', 'stats',
+                                            'usage', 'batch', 'serve', 'compile'],
                        help='Command to execute')
 
     # Global options
     parser.add_argument('--config', type=Path, default=Path('config/abbreviations.typ'),
                        help='Path to abbreviations config file')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Parse the config file without using the parse cache')
 
     # Add command options
     add_group = parser.add_argument_group('add command options')
@@ -281,15 +1070,37 @@ def main():
 
     # List command options
     list_group = parser.add_argument_group('list command options')
-    list_group.add_argument('--sort', choices=['key', 'short', 'long'], default='key',
-                           help='Sort by field')
+    list_group.add_argument('--sort', choices=['key', 'short', 'long'],
+                           help='Sort by field (list default: key, export default: file order)')
     list_group.add_argument('--reverse', action='store_true', help='Reverse sort order')
 
     # Export command options
     export_group = parser.add_argument_group('export command options')
-    export_group.add_argument('--format', choices=['csv', 'json'], default='csv',
-                             help='Export format')
-    export_group.add_argument('--output', type=Path, help='Output file path')
+    export_group.add_argument('--format', choices=IMPORT_FORMATS,
+                             help='Export/import format (default: csv, or inferred from --input)')
+    export_group.add_argument('--output', type=Path, help='Output file path (export and compile)')
+    export_group.add_argument('--fields',
+                             help=f"Comma-separated fields to export ({', '.join(EXPORT_FIELDS)})")
+
+    # Import command options
+    import_group = parser.add_argument_group('import and batch command options')
+    import_group.add_argument('--input', help="Input file path ('-' for stdin, the batch default)")
+    import_group.add_argument('--on-conflict', choices=CONFLICT_POLICIES, default='skip',
+                             help='How to handle rows whose abbreviation or key already exists')
+
+    # Usage command options
+    usage_group = parser.add_argument_group('usage command options')
+    usage_group.add_argument('--paths', type=Path, nargs='+',
+                            help='Files or directories to scan (default: sources the documents import or include)')
+    usage_group.add_argument('--jobs', type=int, help='Worker processes for scanning (default: CPU count)')
+    usage_group.add_argument('--json', action='store_true', dest='emit_json',
+                            help='Emit the usage or batch report as JSON')
+
+    # Serve command options
+    serve_group = parser.add_argument_group('serve command options')
+    serve_group.add_argument('--socket', type=Path, help='Unix socket path (default: .typst-cache/term-daemon.sock)')
+    serve_group.add_argument('--glossary', type=Path, default=Path('config/glossary.typ'),
+                            help='Path to glossary config file')
 
     args = parser.parse_args()
 
@@ -300,7 +1111,16 @@ def main():
         repo_root = Path(__file__).parent.parent
         config_path = repo_root / config_path
 
-    manager = AbbreviationManager(config_path)
+    if args.command == 'serve':
+        # The daemon owns its own stores, so skip loading one here
+        import term_daemon
+        glossary_path = args.glossary
+        if not glossary_path.is_absolute():
+            glossary_path = Path(__file__).parent.parent / glossary_path
+        term_daemon.serve(args.socket or term_daemon.DEFAULT_SOCKET, config_path, glossary_path)
+        return
+
+    manager = AbbreviationManager(config_path, use_cache=not args.no_cache)
 
     # Execute command
     if args.command == 'add':
@@ -318,7 +1138,7 @@ def main():
             manager.save_abbreviations()
 
     elif args.command == 'list':
-        manager.list_abbreviations(args.sort, args.reverse)
+        manager.list_abbreviations(args.sort or 'key', args.reverse)
 
     elif args.command == 'validate':
         errors, warnings = manager.validate_abbreviations()
@@ -334,7 +1154,89 @@ def main():
             print("All abbreviations validated successfully!")
 
     elif args.command == 'export':
-        manager.export_abbreviations(args.format, args.output)
+        fields = None
+        if args.fields:
+            fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+            unknown = [field for field in fields if field not in EXPORT_FIELDS]
+            if unknown or not fields:
+                parser.error(f"--fields accepts: {', '.join(EXPORT_FIELDS)}")
+        manager.export_abbreviations(args.format or 'csv', args.output, fields,
+                                     args.sort, args.reverse)
+
+    elif args.command == 'import':
+        if not args.input:
+            parser.error("import command requires --input")
+        format_type = args.format
+        if format_type is None:
+            suffix = Path(args.input).suffix.lower().lstrip('.')
+            format_type = {'ndjson': 'jsonl'}.get(suffix, suffix)
+            if format_type not in IMPORT_FORMATS:
+                parser.error("cannot infer import format, pass --format")
+
+        print(f"Importing abbreviations (on conflict: {args.on_conflict})")
+        try:
+            if args.input == '-':
+                counts = manager.import_abbreviations(
+                    iter_import_rows(sys.stdin, format_type), args.on_conflict)
+            else:
+                with open(args.input, newline='', encoding='utf-8') as stream:
+                    counts = manager.import_abbreviations(
+                        iter_import_rows(stream, format_type), args.on_conflict)
+        except (OSError, ValueError, ImportConflict) as exc:
+            print(f"Error: Import aborted, nothing was saved: {exc}")
+            sys.exit(1)
+
+        print(f"Imported {counts['added']} new, overwrote {counts['overwritten']}, "
+              f"skipped {counts['skipped']} conflicting and {counts['invalid']} invalid rows")
+        if counts['added'] or counts['overwritten']:
+            manager.save_abbreviations()
+
+    elif args.command == 'batch':
+        try:
+            if args.input in (None, '-'):
+                ok, results = manager.apply_batch(iter_jsonl_rows(sys.stdin))
+            else:
+                with open(args.input, encoding='utf-8') as stream:
+                    ok, results = manager.apply_batch(iter_jsonl_rows(stream))
+        except (OSError, ValueError) as exc:
+            print(f"Error: Batch aborted, nothing was saved: {exc}")
+            sys.exit(1)
+
+        if args.emit_json:
+            print(json.dumps({'applied': ok, 'results': results}, indent=2))
+        else:
+            for result in results:
+                label = f"op {result['op']}" if result['op'] is not None else 'validation'
+                print(f"  [{result['status']}] {label}: {result['message']}")
+        if not ok:
+            if not args.emit_json:
+                print("Error: Batch aborted, nothing was saved")
+            sys.exit(1)
+        if not args.emit_json:
+            print(f"Applied {len(results)} operations")
+        manager.save_abbreviations()
+
+    elif args.command == 'usage':
+        report = manager.scan_usage(args.paths, args.jobs)
+        if args.emit_json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"Abbreviation usage across {report['files_scanned']} files:")
+            for path, counts in report['per_file'].items():
+                ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+                print(f"  {path}: " + ', '.join(f"{short} ({count})" for short, count in ranked))
+            print(f"Unused abbreviations ({len(report['unused'])}):")
+            for abbr in report['unused']:
+                print(f"  - {abbr['short']} ({abbr['key']})")
+            undefined = sorted(report['undefined'].items(),
+                               key=lambda item: (-sum(item[1].values()), item[0]))
+            print(f"Possibly undefined abbreviations ({len(undefined)}):")
+            for token, files in undefined:
+                print(f"  - {token}: {sum(files.values())} occurrences in {len(files)} files")
+
+    elif args.command == 'compile':
+        if manager.compile_abbreviations(args.output) is None:
+            sys.exit(1)
 
     elif args.command == 'stats':
         stats = manager.get_statistics()
@@ -350,4 +1252,11 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    try:
+        main()
+    except BrokenPipeError:
+        # Output was piped into something like `head` that stopped reading.
+        # Point stdout at devnull so the interpreter's final flush is silent.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
\ No newline at end of file
@@ -6,82 +6,106 @@ Helps manage abbreviations and glossary entries for the University of Melbourne
 
 import json
 import csv
+import locale as libc_locale
+import math
+import re
 import sys
 import os
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-
-def load_typst_data(file_path: str) -> List[Dict[str, Any]]:
-    """Load data from a Typst file (simplified parsing for tuple arrays)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # This is a simplified parser - in practice, you might want to use a proper Typst parser
-        # For now, we'll extract basic information
-        return []
-
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
-
-def validate_abbreviations(abbrevs: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-    """Validate abbreviation data structure."""
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+from typst_data import (PARSE_CACHE_DIR, atomic_write_text, format_string,
+                        format_value, load_array_cached, source_digest)
+from term_records import Abbreviation, GlossaryTerm
+
+Entry = Union[Abbreviation, GlossaryTerm]
+
+# Name of the `#let` binding holding the entries in each config file
+TYPST_BINDINGS = {
+    "abbreviations.typ": "abbreviations",
+    "glossary.typ": "glossary-entries",
+}
+
+def load_typst_data(file_path: str, binding: Optional[str] = None,
+                    use_cache: bool = True) -> List[Dict[str, Any]]:
+    """Load the entry array from a Typst config file.
+
+    The binding defaults to the one used by the template for the file name
+    (`abbreviations` or `glossary-entries`). Parses are cached on disk and
+    reused while the file is unchanged unless `use_cache` is False.
+
+    Raises OSError if the file cannot be read, TypstParseError if it cannot
+    be parsed and ValueError if the binding is unknown, so a broken file is
+    never mistaken for an empty one.
+    """
+    name = binding or TYPST_BINDINGS.get(Path(file_path).name)
+    if name is None:
+        raise ValueError(f"{file_path}: unknown config file, specify the binding name")
+
+    cache_dir = PARSE_CACHE_DIR if use_cache else None
+    parsed, _ = load_array_cached(Path(file_path), name, cache_dir)
+    return [entry for entry in parsed.entries if isinstance(entry, dict)]
+
+# Record type for each kind of data
+RECORD_TYPES = {
+    "abbreviations": Abbreviation,
+    "glossary": GlossaryTerm,
+}
+
+def load_entries(file_path: str, data_type: str, use_cache: bool = True) -> List[Entry]:
+    """Load a config file as `Abbreviation` or `GlossaryTerm` records."""
+    binding = TYPST_BINDINGS["abbreviations.typ" if data_type == "abbreviations" else "glossary.typ"]
+    from_dict = RECORD_TYPES[data_type].from_dict
+    return [from_dict(entry) for entry in load_typst_data(file_path, binding, use_cache)]
+
+# Field that identifies an entry for duplicate checks, per data type
+UNIQUE_FIELDS = {
+    "abbreviations": "short",
+    "glossary": "term",
+}
+
+def _validate_entries(entries: List[Entry], record_type: type, required_fields: List[str],
+                      unique_field: str, label: str) -> Dict[str, List[str]]:
+    """Check required fields and group entries by `unique_field` in one pass."""
     errors = []
     warnings = []
+    positions: Dict[Any, List[int]] = {}
 
-    if not isinstance(abbrevs, list):
-        errors.append("Abbreviations must be a list")
-        return {"errors": errors, "warnings": warnings}
-
-    for i, entry in enumerate(abbrevs):
-        if not isinstance(entry, dict):
-            errors.append(f"Entry {i} must be a dictionary")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, record_type):
+            errors.append(f"Entry {i} must be a {record_type.__name__} record")
             continue
 
-        required_fields = ["key", "short", "long"]
         for field in required_fields:
-            if field not in entry:
-                errors.append(f"Entry {i} missing required field: {field}")
-            elif not isinstance(entry[field], str) or not entry[field].strip():
+            value = getattr(entry, field)
+            if not isinstance(value, str) or not value.strip():
                 errors.append(f"Entry {i} field '{field}' must be a non-empty string")
 
-        # Check for duplicate abbreviations
-        for j, other in enumerate(abbrevs):
-            if i != j and entry.get("short") == other.get("short"):
-                errors.append(f"Duplicate abbreviation '{entry.get('short')}' in entries {i} and {j}")
+        value = getattr(entry, unique_field)
+        if isinstance(value, str):
+            positions.setdefault(value, []).append(i)
+
+    for value, indices in positions.items():
+        if len(indices) > 1:
+            listed = ", ".join(str(i) for i in indices)
+            errors.append(f"Duplicate {label} '{value}' in entries {listed}")
 
     return {"errors": errors, "warnings": warnings}
 
-def validate_glossary(glossary: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-    """Validate glossary data structure."""
-    errors = []
-    warnings = []
+def validate_abbreviations(abbrevs: List[Abbreviation]) -> Dict[str, List[str]]:
+    """Validate abbreviation data structure."""
+    if not isinstance(abbrevs, list):
+        return {"errors": ["Abbreviations must be a list"], "warnings": []}
+    return _validate_entries(abbrevs, Abbreviation, ["key", "short", "long"], "short", "abbreviation")
 
+def validate_glossary(glossary: List[GlossaryTerm]) -> Dict[str, List[str]]:
+    """Validate glossary data structure."""
     if not isinstance(glossary, list):
-        errors.append("Glossary must be a list")
-        return {"errors": errors, "warnings": warnings}
-
-    for i, entry in enumerate(glossary):
-        if not isinstance(entry, dict):
-            errors.append(f"Entry {i} must be a dictionary")
-            continue
-
-        required_fields = ["term", "definition"]
-        for field in required_fields:
-            if field not in entry:
-                errors.append(f"Entry {i} missing required field: {field}")
-            elif not isinstance(entry[field], str) or not entry[field].strip():
-                errors.append(f"Entry {i} field '{field}' must be a non-empty string")
-
-        # Check for duplicate terms
-        for j, other in enumerate(glossary):
-            if i != j and entry.get("term") == other.get("term"):
-                errors.append(f"Duplicate term '{entry.get('term')}' in entries {i} and {j}")
-
-    return {"errors": errors, "warnings": warnings}
+        return {"errors": ["Glossary must be a list"], "warnings": []}
+    return _validate_entries(glossary, GlossaryTerm, ["term", "definition"], "term", "term")
 
-def export_to_csv(data: List[Dict[str, Any]], output_file: str, data_type: str = "abbreviations"):
+def export_to_csv(data: List[Entry], output_file: str, data_type: str = "abbreviations"):
     """Export data to CSV format."""
     if data_type == "abbreviations":
         fieldnames = ["key", "short", "long", "category"]
@@ -93,17 +117,14 @@ def export_to_csv(data: List[Dict[str, Any]], output_file: str, data_type: str =
         writer.writeheader()
 
         for entry in data:
-            row = {}
-            for field in fieldnames:
-                if field == "related" and field in entry:
-                    row[field] = "; ".join(entry[field]) if isinstance(entry[field], list) else entry[field]
-                else:
-                    row[field] = entry.get(field, "")
+            row = {field: getattr(entry, field) or "" for field in fieldnames}
+            if data_type != "abbreviations":
+                row["related"] = "; ".join(entry.related)
             writer.writerow(row)
 
     print(f"Exported {len(data)} entries to {output_file}")
 
-def import_from_csv(input_file: str, data_type: str = "abbreviations") -> List[Dict[str, Any]]:
+def import_from_csv(input_file: str, data_type: str = "abbreviations") -> List[Entry]:
     """Import data from CSV format."""
     data = []
 
@@ -128,80 +149,610 @@ def import_from_csv(input_file: str, data_type: str = "abbreviations") -> List[D
                     print(f"Warning: Skipping incomplete glossary entry: {entry}")
                     continue
 
-            data.append(entry)
+            data.append(RECORD_TYPES[data_type].from_dict(entry))
 
     print(f"Imported {len(data)} entries from {input_file}")
     return data
 
-def generate_statistics(data: List[Dict[str, Any]], data_type: str = "abbreviations") -> Dict[str, Any]:
+def analyze_entries(data: List[Entry], data_type: str = "abbreviations") -> Dict[str, Any]:
+    """Collect everything statistics, duplicate checks and suggestions need in one pass.
+
+    The result can be passed to `generate_statistics`, `find_duplicates` and
+    `suggest_corrections` so that several reports share a single walk over
+    the entries.
+    """
+    is_abbreviations = data_type == "abbreviations"
+    key_field = UNIQUE_FIELDS[data_type]
+    name_field = "key" if is_abbreviations else "term"
+    text_field = "long" if is_abbreviations else "definition"
+
+    key_length = 0
+    short_length = 0
+    definition_length = 0
+    categories: Dict[str, int] = {}
+    seen = set()
+    duplicates = []
+    suggestions = []
+
+    for i, entry in enumerate(data):
+        # Values of the wrong type are reported by validation; skip them here
+        name = getattr(entry, name_field)
+        if isinstance(name, str):
+            key_length += len(name)
+        text = getattr(entry, text_field)
+        if isinstance(text, str):
+            definition_length += len(text)
+        category = entry.category if isinstance(entry.category, str) and entry.category else "General"
+        categories[category] = categories.get(category, 0) + 1
+
+        unique = getattr(entry, key_field)
+        if isinstance(unique, str):
+            folded = unique.lower()
+            if folded in seen:
+                duplicates.append(entry)
+            else:
+                seen.add(folded)
+
+        if is_abbreviations and isinstance(entry.short, str):
+            short = entry.short
+            short_length += len(short)
+            if short and not short.isupper():
+                suggestions.append(f"Entry {i}: Consider making abbreviation uppercase: '{short}' -> '{short.upper()}'")
+
+            if len(short) > 8:
+                suggestions.append(f"Entry {i}: Abbreviation '{short}' is quite long, consider shortening")
+
+        # Check for missing categories
+        if entry.category is None:
+            suggestions.append(f"Entry {i}: Consider adding a category for better organization")
+
+    return {
+        "data_type": data_type,
+        "total_entries": len(data),
+        "key_length": key_length,
+        "short_length": short_length,
+        "definition_length": definition_length,
+        "categories": categories,
+        "duplicates": duplicates,
+        "suggestions": suggestions,
+    }
+
+def generate_statistics(data: List[Entry], data_type: str = "abbreviations",
+                        analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Generate statistics for the data."""
     if not data:
         return {}
 
+    analysis = analysis or analyze_entries(data, data_type)
+    total = analysis["total_entries"]
     stats = {
-        "total_entries": len(data),
-        "avg_key_length": sum(len(entry.get("key", entry.get("term", ""))) for entry in data) / len(data),
-        "avg_short_length": sum(len(entry.get("short", "")) for entry in data) / len(data) if data_type == "abbreviations" else 0,
-        "avg_definition_length": sum(len(entry.get("long", entry.get("definition", ""))) for entry in data) / len(data),
+        "total_entries": total,
+        "avg_key_length": analysis["key_length"] / total,
+        "avg_short_length": analysis["short_length"] / total if data_type == "abbreviations" else 0,
+        "avg_definition_length": analysis["definition_length"] / total,
+        "categories": len(analysis["categories"]),
     }
 
     if data_type == "abbreviations":
-        categories = set(entry.get("category", "General") for entry in data)
-        stats["categories"] = len(categories)
-        stats["category_breakdown"] = {}
-        for entry in data:
-            cat = entry.get("category", "General")
-            stats["category_breakdown"][cat] = stats["category_breakdown"].get(cat, 0) + 1
-    else:  # glossary
-        categories = set(entry.get("category", "General") for entry in data)
-        stats["categories"] = len(categories)
+        stats["category_breakdown"] = dict(analysis["categories"])
 
     return stats
 
-def find_duplicates(data: List[Dict[str, Any]], data_type: str = "abbreviations") -> List[Dict[str, Any]]:
+def find_duplicates(data: List[Entry], data_type: str = "abbreviations",
+                    analysis: Optional[Dict[str, Any]] = None) -> List[Entry]:
     """Find duplicate entries in the data."""
-    duplicates = []
-    seen = set()
+    analysis = analysis or analyze_entries(data, data_type)
+    return analysis["duplicates"]
 
-    key_field = "short" if data_type == "abbreviations" else "term"
+def suggest_corrections(data: List[Entry], data_type: str = "abbreviations",
+                        analysis: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Suggest corrections for common issues."""
+    analysis = analysis or analyze_entries(data, data_type)
+    return analysis["suggestions"]
+
+# Field compared for near-duplicates, per data type
+NEAR_DUPLICATE_FIELDS = {
+    "abbreviations": "key",
+    "glossary": "term",
+}
+GRAM_SIZE = 3
+_NON_WORD = re.compile(r"[\W_]+")
+
+def term_grams(text: str, size: int = GRAM_SIZE) -> frozenset:
+    """Return the character n-grams of a case-folded, punctuation-free term.
+
+    Punctuation is treated as a word break, so "Peer-review" and
+    "Peer Review" produce the same grams. The term is padded with spaces
+    so that its first and last characters carry their own grams.
+    """
+    normalized = " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+    padded = f" {normalized} "
+    return frozenset(padded[i:i + size] for i in range(max(len(padded) - size + 1, 1)))
+
+def find_near_duplicates(data: List[Entry], data_type: str = "glossary",
+                         threshold: float = 0.75, min_shared_grams: int = 2) -> List[Dict[str, Any]]:
+    """Find pairs of entries whose terms have a trigram Dice similarity >= `threshold`.
+
+    Grams are ordered from rarest to most common and only a prefix of each
+    term's grams is indexed, sized so that any pair reaching the threshold
+    must share a gram in both prefixes. Candidate pairs therefore come
+    from short posting lists of rare grams, and only those are scored.
+    """
+    field = NEAR_DUPLICATE_FIELDS[data_type]
+    terms = [(i, getattr(entry, field)) for i, entry in enumerate(data)]
+    terms = [(i, value) for i, value in terms if isinstance(value, str) and value.strip()]
+    grams = {i: term_grams(value) for i, value in terms}
+    values = dict(terms)
+
+    frequency: Dict[str, int] = {}
+    for gram_set in grams.values():
+        for gram in gram_set:
+            frequency[gram] = frequency.get(gram, 0) + 1
+
+    # Dice >= t is equivalent to Jaccard >= t / (2 - t), which bounds prefixes
+    jaccard = threshold / (2 - threshold) - 1e-9
+    index: Dict[str, List[int]] = {}
+    # Terms are visited shortest first, so each posting list is sorted by
+    # size and entries too short for the current term can be skipped for good
+    starts: Dict[str, int] = {}
+    sizes = {i: len(gram_set) for i, gram_set in grams.items()}
+    pairs = []
+    for i in sorted(grams, key=lambda i: (sizes[i], i)):
+        gram_set = grams[i]
+        size = sizes[i]
+        min_size = jaccard * size
+        ordered = sorted(gram_set, key=lambda gram: (frequency[gram], gram))
+        prefix = ordered[:size - math.ceil(jaccard * size) + 1]
+
+        candidates = set()
+        for gram in prefix:
+            postings = index.get(gram)
+            if postings is None:
+                index[gram] = [i]
+                continue
+            start = starts.get(gram, 0)
+            while start < len(postings) and sizes[postings[start]] < min_size:
+                start += 1
+            starts[gram] = start
+            candidates.update(postings[start:])
+            postings.append(i)
+
+        for j in candidates:
+            shared = len(gram_set & grams[j])
+            if shared < min_shared_grams:
+                continue
+            score = 2 * shared / (size + sizes[j])
+            if score >= threshold:
+                first, second = sorted((i, j))
+                pairs.append({
+                    "entries": [first, second],
+                    "terms": [values[first], values[second]],
+                    "score": round(score, 4),
+                })
+
+    pairs.sort(key=lambda pair: (-pair["score"], pair["entries"]))
+    return pairs
+
+def build_link_index(data: List[GlossaryTerm]) -> Dict[str, Any]:
+    """Index glossary `related` links in one pass over the entries.
+
+    Returns the forward adjacency (first entry wins for duplicated terms),
+    the reverse-link map from each defined term to the entries that list
+    it, and the dangling and asymmetric links.
+    """
+    adjacency: Dict[str, Tuple[str, ...]] = {}
+    categories: Dict[str, str] = {}
+    reverse: Dict[str, List[str]] = {}
+    sources = []
 
     for entry in data:
-        key = entry.get(key_field, "").lower()
-        if key in seen:
-            duplicates.append(entry)
-        else:
-            seen.add(key)
+        term = entry.term
+        if not isinstance(term, str):
+            continue
+        related = entry.related
+        sources.append((term, related))
+        if term not in adjacency:
+            adjacency[term] = related
+            categories[term] = entry.category or "General"
+
+    dangling = []
+    for term, related in sources:
+        for target in related:
+            if target in adjacency:
+                reverse.setdefault(target, []).append(term)
+            else:
+                dangling.append([term, target])
+
+    linked_back = {(source, target) for target, names in reverse.items() for source in names}
+    asymmetric = [[term, target] for term, related in adjacency.items() for target in related
+                  if target in adjacency and (target, term) not in linked_back]
+
+    return {
+        "sources": sources,
+        "adjacency": adjacency,
+        "categories": categories,
+        "reverse": reverse,
+        "dangling": dangling,
+        "asymmetric": asymmetric,
+    }
 
-    return duplicates
+def find_link_cycles(adjacency: Dict[str, Sequence[str]]) -> List[List[str]]:
+    """Return the strongly connected groups of terms that link in a cycle.
 
-def suggest_corrections(data: List[Dict[str, Any]], data_type: str = "abbreviations") -> List[str]:
-    """Suggest corrections for common issues."""
-    suggestions = []
+    Uses an iterative Tarjan traversal so deep link chains cannot hit the
+    recursion limit. Links to undefined terms are ignored.
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    cycles = []
 
-    for i, entry in enumerate(data):
-        if data_type == "abbreviations":
-            short = entry.get("short", "")
-            if short and not short.isupper():
-                suggestions.append(f"Entry {i}: Consider making abbreviation uppercase: '{short}' -> '{short.upper()}'")
+    for root in adjacency:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if position == 0:
+                index[node] = lowlink[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            targets = adjacency[node]
+            while position < len(targets):
+                target = targets[position]
+                position += 1
+                if target not in adjacency:
+                    continue
+                if target not in index:
+                    work.append((node, position))
+                    work.append((target, 0))
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index[target])
+            else:
+                if lowlink[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in adjacency[node]:
+                        cycles.append(group[::-1])
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+    return cycles
+
+def find_link_components(adjacency: Dict[str, Sequence[str]]) -> List[List[str]]:
+    """Group terms connected by links in either direction (union-find)."""
+    parent = {term: term for term in adjacency}
+
+    def find(term: str) -> str:
+        while parent[term] != term:
+            parent[term] = parent[parent[term]]
+            term = parent[term]
+        return term
+
+    for term, related in adjacency.items():
+        for target in related:
+            if target in parent:
+                a, b = find(term), find(target)
+                if a != b:
+                    parent[b] = a
+
+    groups: Dict[str, List[str]] = {}
+    for term in adjacency:
+        groups.setdefault(find(term), []).append(term)
+    return sorted(groups.values(), key=lambda group: (-len(group), group[0]))
+
+def analyze_links(data: List[GlossaryTerm]) -> Dict[str, Any]:
+    """Report dangling, asymmetric and cyclic links, components and isolated categories."""
+    links = build_link_index(data)
+    adjacency = links["adjacency"]
+    categories = links["categories"]
+
+    # A category is isolated when no link crosses into or out of it
+    connected_categories = set()
+    for term, related in adjacency.items():
+        for target in related:
+            if target in categories and categories[target] != categories[term]:
+                connected_categories.update((categories[term], categories[target]))
+    all_categories = sorted(set(categories.values()))
+    isolated = [c for c in all_categories if c not in connected_categories] if len(all_categories) > 1 else []
+
+    return {
+        "terms": len(adjacency),
+        "links": sum(len(related) for related in adjacency.values()),
+        "dangling": links["dangling"],
+        "asymmetric": links["asymmetric"],
+        "cycles": find_link_cycles(adjacency),
+        "components": find_link_components(adjacency),
+        "isolated_categories": isolated,
+        "reverse": links["reverse"],
+        "sources": links["sources"],
+    }
 
-            if len(short) > 8:
-                suggestions.append(f"Entry {i}: Abbreviation '{short}' is quite long, consider shortening")
+def write_backlinks(report: Dict[str, Any], output_file: str):
+    """Write the reverse-link map as JSON or as a Typst module.
 
-        # Check for missing categories
-        if "category" not in entry:
-            suggestions.append(f"Entry {i}: Consider adding a category for better organization")
+    The Typst module also records the `(term, related)` pairs it was built
+    from, so config/glossary.typ can tell whether it is still current.
+    """
+    path = Path(output_file)
+    if path.suffix == ".json":
+        text = json.dumps(report["reverse"], indent=2, ensure_ascii=False) + "\n"
+    else:
+        lines = [
+            "// Reverse links between glossary terms.",
+            "// Generated by scripts/manage_terms.py check-related; do not edit by hand.",
+            "",
+            "#let glossary-link-source = (",
+        ]
+        lines += [f"  ({format_string(term)}, {format_value(related)})," for term, related in report["sources"]]
+        lines += [")", ""]
+        if report["reverse"]:
+            lines.append("#let glossary-backlinks = (")
+            lines += [f"  {format_string(term)}: {format_value(names)},"
+                      for term, names in report["reverse"].items()]
+            lines.append(")")
+        else:
+            lines.append("#let glossary-backlinks = (:)")
+        text = "\n".join(lines) + "\n"
+
+    atomic_write_text(path, text)
+    print(f"Wrote reverse links for {len(report['reverse'])} terms to {output_file}")
+
+# Locales with strings in utils/locales; the glossary build collates for one of them
+GLOSSARY_LOCALES = ("en", "zh")
+DEFAULT_PAGE_SIZE = 40
+# System locales whose C library collation is used when PyICU is missing
+SYSTEM_LOCALES = {"zh": ("zh_CN.UTF-8", "zh_CN.utf8")}
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+def collation_key(locale: str):
+    """Return a sort key function for `locale` and the name of the collation used.
+
+    Uses ICU (PyICU) when it is installed. Otherwise English strings are
+    compared with accents stripped and case folded, ties broken by the
+    original text, which gives dictionary order. Chinese needs pinyin order,
+    so without ICU the C library's collation for a `zh_CN` system locale is
+    used instead; ValueError is raised if neither is available rather than
+    falling back to code point order.
+    """
+    try:
+        import icu
+    except ImportError:
+        icu = None
+    if icu is not None:
+        collator = icu.Collator.createInstance(icu.Locale(locale))
+        return collator.getSortKey, "icu"
+    if locale == "en":
+        return (lambda text: (_fold(text), text)), "unicode"
+    for name in SYSTEM_LOCALES.get(locale, ()):
+        try:
+            # Process-wide, but the build is a one-shot command
+            libc_locale.setlocale(libc_locale.LC_COLLATE, name)
+        except libc_locale.Error:
+            continue
+        return libc_locale.strxfrm, "libc"
+    raise ValueError(f"collating for {locale!r} needs PyICU (pip install PyICU) or one of the "
+                     f"system locales {', '.join(SYSTEM_LOCALES.get(locale, ())) or '(none)'}")
+
+def build_glossary_layout(data: List[GlossaryTerm], locale: str = "en",
+                          page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """Sort, group and paginate glossary entries the way the glossary page shows them.
+
+    Every list holds positions into `data`, so the template can pick entries
+    out of `glossary-entries` without copying them. Entries without a category
+    are grouped under "General" and sort last by category, as in
+    config/glossary.typ.
+    """
+    key, collation = collation_key(locale)
+    term_keys = [key(str(entry.term)) for entry in data]
+    order_by_term = sorted(range(len(data)), key=term_keys.__getitem__)
+
+    groups: Dict[str, List[int]] = {}
+    for position in order_by_term:
+        category = data[position].category
+        groups.setdefault("General" if category is None else category, []).append(position)
+    category_keys = {category: key(category) for category in groups}
+    category_order = sorted(groups, key=category_keys.__getitem__)
+
+    # Stable, so entries keep their config order within a category
+    uncategorised = (1, key(""))
+    order_by_category = sorted(
+        range(len(data)),
+        key=lambda position: (0, category_keys[data[position].category])
+        if data[position].category is not None else uncategorised)
+
+    return {
+        "locale": locale,
+        "collation": collation,
+        "page_size": page_size,
+        "order_by_term": order_by_term,
+        "order_by_category": order_by_category,
+        "category_order": category_order,
+        "category_groups": {category: groups[category] for category in category_order},
+        "pages": [order_by_term[start:start + page_size]
+                  for start in range(0, len(order_by_term), page_size)],
+    }
 
-    return suggestions
+def render_glossary_layout(layout: Dict[str, Any], count: int, source_size: int) -> str:
+    """Render the glossary layout as a Typst module for config/glossary.typ.
+
+    The module records the entry count and the size in bytes of the glossary
+    file it was built from (`source_size`); the template only uses it while
+    both still match.
+    """
+    lines = [
+        f"// Sorted and grouped glossary layout (locale: {layout['locale']}, "
+        f"collation: {layout['collation']}).",
+        "// Generated by scripts/manage_terms.py build; do not edit by hand.",
+        "",
+        f"#let glossary-locale = {format_string(layout['locale'])}",
+        f"#let page-size = {layout['page_size']}",
+        f"#let glossary-count = {count}",
+        f"#let glossary-source-size = {source_size}",
+        "",
+    ]
+    lines.append(f"#let order-by-term = {format_value(layout['order_by_term'])}")
+    lines.append(f"#let order-by-category = {format_value(layout['order_by_category'])}")
+    lines.append(f"#let category-order = {format_value(layout['category_order'])}")
+    lines.append("")
+    if layout["category_groups"]:
+        lines.append("#let category-groups = (")
+        lines += [f"  {format_string(category)}: {format_value(positions)},"
+                  for category, positions in layout["category_groups"].items()]
+        lines.append(")")
+    else:
+        lines.append("#let category-groups = (:)")
+    lines.append("")
+    lines.append("#let pages = (")
+    lines += [f"  {format_value(page)}," for page in layout["pages"]]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+SHARD_MANIFEST = "manifest.typ"
+SHARD_HEADER = "// Generated by scripts/manage_terms.py shard; do not edit by hand."
+
+def shard_file_name(category: str, taken: set) -> str:
+    """Return a unique file name for a category shard, e.g. "machine-learning.typ"."""
+    slug = re.sub(r"[^0-9a-z]+", "-", _fold(category)).strip("-") or "category"
+    name = f"{slug}.typ"
+    suffix = 2
+    while name in taken or name == SHARD_MANIFEST:
+        name = f"{slug}-{suffix}.typ"
+        suffix += 1
+    taken.add(name)
+    return name
+
+def render_glossary_shards(data: List[GlossaryTerm], source_name: str) -> Dict[str, str]:
+    """Split glossary entries into one Typst module per category plus a manifest.
+
+    Returns the text of every module keyed by file name. Each shard binds its
+    entries to `glossary-entries`, in config order, so it can stand in for
+    the full glossary. The manifest maps categories to shard files and terms
+    to categories, and records a digest of the entries it was split from.
+    """
+    groups: Dict[str, List[GlossaryTerm]] = {}
+    for entry in data:
+        groups.setdefault("General" if entry.category is None else entry.category, []).append(entry)
+
+    files: Dict[str, str] = {}
+    shards: Dict[str, Tuple[str, int]] = {}
+    taken: set = set()
+    for category, entries in groups.items():
+        name = shard_file_name(category, taken)
+        shards[category] = (name, len(entries))
+        lines = [f"// Glossary entries in category {format_string(category)}, split from {source_name}.",
+                 SHARD_HEADER, "",
+                 f"#let glossary-category = {format_string(category)}", "",
+                 "#let glossary-entries = ("]
+        lines += [f"  {format_value(entry.to_dict())}," for entry in entries]
+        lines.append(")")
+        files[name] = "\n".join(lines) + "\n"
+
+    digest = source_digest(format_value([entry.to_dict() for entry in data]))
+    lines = [f"// Glossary shards by category, split from {source_name}.", SHARD_HEADER, "",
+             f"#let glossary-source-digest = {format_string(digest)}", ""]
+    if shards:
+        lines.append("#let glossary-shards = (")
+        lines += [f"  {format_string(category)}: (file: {format_string(name)}, entries: {count}),"
+                  for category, (name, count) in shards.items()]
+        lines += [")", "", "#let glossary-term-categories = ("]
+        seen = set()
+        for entry in data:
+            if entry.term not in seen:
+                seen.add(entry.term)
+                category = "General" if entry.category is None else entry.category
+                lines.append(f"  {format_string(str(entry.term))}: {format_string(category)},")
+        lines.append(")")
+    else:
+        lines += ["#let glossary-shards = (:)", "", "#let glossary-term-categories = (:)"]
+    files[SHARD_MANIFEST] = "\n".join(lines) + "\n"
+    return files
+
+def _generated_shards(output_dir: Path) -> List[Path]:
+    paths = []
+    for path in sorted(output_dir.glob("*.typ")):
+        try:
+            with path.open(encoding="utf-8") as handle:
+                head = [handle.readline() for _ in range(2)]
+        except OSError:
+            continue
+        if SHARD_HEADER + "\n" in head:
+            paths.append(path)
+    return paths
+
+def check_glossary_shards(files: Dict[str, str], output_dir: Path) -> List[str]:
+    """Compare generated shards with `output_dir` and describe every difference."""
+    problems = []
+    for name, text in files.items():
+        path = output_dir / name
+        try:
+            current = path.read_text(encoding="utf-8")
+        except OSError:
+            problems.append(f"{path} is missing")
+            continue
+        if current != text:
+            problems.append(f"{path} does not match the glossary")
+    for path in _generated_shards(output_dir):
+        if path.name not in files:
+            problems.append(f"{path} belongs to a category that no longer exists")
+    return problems
+
+def write_glossary_shards(files: Dict[str, str], output_dir: Path) -> int:
+    """Write changed shards, remove generated shards for vanished categories.
+
+    Returns the number of files written or removed.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    changed = 0
+    for name, text in files.items():
+        path = output_dir / name
+        try:
+            if path.read_text(encoding="utf-8") == text:
+                continue
+        except OSError:
+            pass
+        atomic_write_text(path, text)
+        changed += 1
+    for path in _generated_shards(output_dir):
+        if path.name not in files:
+            path.unlink()
+            changed += 1
+    return changed
 
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Manage abbreviations and glossary entries")
-    parser.add_argument("action", choices=["validate", "export", "import", "stats", "check-duplicates", "suggest"], help="Action to perform")
+    parser.add_argument("action", choices=["validate", "export", "import", "stats", "check-duplicates",
+                                           "check-near-duplicates", "check-related", "suggest", "build", "shard"],
+                        help="Action to perform")
     parser.add_argument("--type", choices=["abbreviations", "glossary"], default="abbreviations", help="Type of data to work with")
     parser.add_argument("--input", "-i", help="Input file path")
     parser.add_argument("--output", "-o", help="Output file path")
     parser.add_argument("--config-dir", default="config", help="Configuration directory")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk parse cache")
+    parser.add_argument("--threshold", type=float, default=0.75,
+                        help="Minimum trigram Dice similarity for check-near-duplicates (0-1)")
+    parser.add_argument("--min-shared-grams", type=int, default=2,
+                        help="Minimum trigrams a near-duplicate pair must share")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON where supported")
+    parser.add_argument("--locale", choices=GLOSSARY_LOCALES, default="en",
+                        help="Collation locale for build")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help="Entries per page-sized chunk for build")
+    parser.add_argument("--check", action="store_true",
+                        help="For build and shard: report output that differs from the glossary instead of writing")
 
     args = parser.parse_args()
 
@@ -213,23 +764,26 @@ def main():
 
     input_file = args.input or default_file
 
-    if args.action in ["validate", "export", "stats", "check-duplicates", "suggest"]:
+    if not 0 < args.threshold <= 1:
+        print("Error: --threshold must be between 0 and 1")
+        sys.exit(1)
+
+    if args.page_size < 1:
+        print("Error: --page-size must be at least 1")
+        sys.exit(1)
+
+    if args.action in ["validate", "export", "stats", "check-duplicates", "check-near-duplicates",
+                       "check-related", "suggest", "build", "shard"]:
         if not os.path.exists(input_file):
             print(f"Error: Input file {input_file} does not exist")
             sys.exit(1)
 
-        # For now, we'll create sample data since parsing Typst is complex
-        # In a real implementation, you'd parse the Typst files
-        if args.type == "abbreviations":
-            data = [
-                {"key": "Machine Learning", "short": "ML", "long": "A method of data analysis", "category": "AI"},
-                {"key": "Deep Learning", "short": "DL", "long": "A subset of machine learning", "category": "AI"},
-            ]
-        else:
-            data = [
-                {"term": "Thesis", "definition": "A long piece of writing", "category": "Academic"},
-                {"term": "Methodology", "definition": "The system of methods", "category": "Research"},
-            ]
+        try:
+            data = load_entries(input_file, args.type, use_cache=not args.no_cache)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {input_file}: {e}")
+            sys.exit(1)
+        analysis = analyze_entries(data, args.type)
 
     if args.action == "validate":
         if args.type == "abbreviations":
@@ -247,7 +801,9 @@ def main():
             for warning in result["warnings"]:
                 print(f"  - {warning}")
 
-        if not result["errors"] and not result["warnings"]:
+        if result["errors"]:
+            sys.exit(1)
+        if not result["warnings"]:
             print("Validation passed!")
 
     elif args.action == "export":
@@ -262,7 +818,7 @@ def main():
         print(f"Imported {len(data)} entries")
 
     elif args.action == "stats":
-        stats = generate_statistics(data, args.type)
+        stats = generate_statistics(data, args.type, analysis)
         print(f"Statistics for {args.type}:")
         for key, value in stats.items():
             if key != "category_breakdown":
@@ -273,17 +829,98 @@ def main():
                     print(f"    {cat}: {count}")
 
     elif args.action == "check-duplicates":
-        duplicates = find_duplicates(data, args.type)
+        duplicates = find_duplicates(data, args.type, analysis)
         if duplicates:
             print(f"Found {len(duplicates)} duplicate entries:")
             for dup in duplicates:
-                key = dup.get("short" if args.type == "abbreviations" else "term")
+                key = getattr(dup, UNIQUE_FIELDS[args.type])
                 print(f"  - {key}")
         else:
             print("No duplicates found")
 
+    elif args.action == "check-near-duplicates":
+        pairs = find_near_duplicates(data, args.type, args.threshold, args.min_shared_grams)
+        if args.json:
+            print(json.dumps(pairs, indent=2, ensure_ascii=False))
+        elif pairs:
+            print(f"Found {len(pairs)} near-duplicate pairs:")
+            for pair in pairs:
+                first, second = pair["terms"]
+                print(f"  - '{first}' ~ '{second}' (score {pair['score']:.2f}, "
+                      f"entries {pair['entries'][0]} and {pair['entries'][1]})")
+        else:
+            print("No near-duplicates found")
+
+    elif args.action == "check-related":
+        if args.type != "glossary":
+            print("Error: check-related works on glossary entries (use --type glossary)")
+            sys.exit(1)
+        report = analyze_links(data)
+        if args.json:
+            print(json.dumps({key: value for key, value in report.items() if key != "sources"},
+                             indent=2, ensure_ascii=False))
+        else:
+            print(f"{report['terms']} terms, {report['links']} related links, "
+                  f"{len(report['components'])} connected components")
+            sections = [
+                ("Dangling links", [f"{a} -> {b} (not defined)" for a, b in report["dangling"]]),
+                ("Asymmetric links", [f"{a} -> {b} (no link back)" for a, b in report["asymmetric"]]),
+                ("Cycles", [" -> ".join(cycle + cycle[:1]) for cycle in report["cycles"]]),
+                ("Isolated categories", report["isolated_categories"]),
+            ]
+            for title, items in sections:
+                if items:
+                    print(f"{title} ({len(items)}):")
+                    for item in items:
+                        print(f"  - {item}")
+        if args.output:
+            write_backlinks(report, args.output)
+
+    elif args.action == "build":
+        if args.type != "glossary":
+            print("Error: build works on glossary entries (use --type glossary)")
+            sys.exit(1)
+        try:
+            layout = build_glossary_layout(data, args.locale, args.page_size)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        output_file = Path(args.output or os.path.join(args.config_dir, "glossary-compiled.typ"))
+        text = render_glossary_layout(layout, len(data), os.path.getsize(input_file))
+        summary = (f"{len(data)} entries, {len(layout['category_order'])} categories, "
+                   f"{len(layout['pages'])} page chunks")
+        if args.check:
+            current = output_file.read_text(encoding="utf-8") if output_file.is_file() else None
+            if current != text:
+                print(f"Glossary layout {output_file} is out of date; run build again")
+                sys.exit(1)
+            print(f"Glossary layout {output_file} matches {input_file} ({summary})")
+        else:
+            atomic_write_text(output_file, text)
+            print(f"Wrote glossary layout for {summary} to {output_file}")
+
+    elif args.action == "shard":
+        if args.type != "glossary":
+            print("Error: shard works on glossary entries (use --type glossary)")
+            sys.exit(1)
+        output_dir = Path(args.output or os.path.join(args.config_dir, "glossary"))
+        files = render_glossary_shards(data, Path(input_file).name)
+        categories = len(files) - 1
+        if args.check:
+            problems = check_glossary_shards(files, output_dir)
+            if problems:
+                print(f"Glossary shards in {output_dir} are out of date:")
+                for problem in problems:
+                    print(f"  - {problem}")
+                sys.exit(1)
+            print(f"Glossary shards in {output_dir} match {input_file} ({categories} categories)")
+        else:
+            changed = write_glossary_shards(files, output_dir)
+            print(f"Split {len(data)} glossary entries into {categories} category shards in "
+                  f"{output_dir} ({changed} files updated)")
+
     elif args.action == "suggest":
-        suggestions = suggest_corrections(data, args.type)
+        suggestions = suggest_corrections(data, args.type, analysis)
         if suggestions:
             print("Suggestions:")
             for suggestion in suggestions:
@@ -4,17 +4,33 @@
 The script compiles nominated Typst documents across the configured build
 profiles and performs lightweight metadata sanity checks so that issues can
 be caught prior to submission. It is designed to run locally or in CI.
+
+Every compile records its wall time, CPU time, peak memory, PDF size and page
+count. With ``--baseline`` those are compared against a stored run and the
+check fails when a document got slower or bigger by more than
+``--max-regression`` percent; ``--update-baseline`` stores the current run.
 """
 from __future__ import annotations
 
 import argparse
 import json
+import mmap
 import os
+import re
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from compile_cache import DEFAULT_MAX_BYTES, CompileCache
+from typst_data import atomic_write_text
+from typst_deps import DependencyGraph
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 BUILD_DIR = REPO_ROOT / "build" / "preflight"
@@ -24,6 +40,17 @@ EXTRA_TARGETS = (
     REPO_ROOT / "test-layout-only.typ",
     REPO_ROOT / "sample-chapter.typ",
 )
+BASELINE_VERSION = 1
+DEFAULT_MAX_REGRESSION = 20.0
+# Metrics compared against the baseline; timings and memory only for real compiles
+BASELINE_METRICS = ("wall_seconds", "cpu_seconds", "max_rss_bytes", "pdf_bytes", "pages")
+MEASURED_METRICS = ("wall_seconds", "cpu_seconds", "max_rss_bytes")
+# Timing differences below this are scheduling noise, whatever the percentage
+MIN_TIME_DELTA = 0.1
+# How often a running compile checks for its timeout or a cancellation
+_WATCH_INTERVAL = 0.05
+# Sources at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
 PLACEHOLDER_STRINGS = {
     "<title>",
     "<author>",
@@ -37,17 +64,163 @@ class PreflightError(Exception):
     """Raised when any preflight check fails."""
 
 
-def run(command: List[str], *, cwd: Path | None = None) -> Tuple[int, str]:
-    """Execute a command and return its exit status and combined output."""
-    process = subprocess.run(
+class JobCancelled(PreflightError):
+    """Raised for a compile stopped because another job failed under ``--fail-fast``."""
+
+
+class CompileJob(NamedTuple):
+    """One document compiled under one profile."""
+
+    document: Path
+    profile: str
+
+    @property
+    def inputs(self) -> Dict[str, str]:
+        return {} if self.profile == "default" else {"profile": self.profile}
+
+    @property
+    def name(self) -> Path:
+        """The document's path under the root without its suffix, so documents
+        with the same file name in different directories keep separate artefacts."""
+        document = self.document.resolve()
+        if document.is_relative_to(REPO_ROOT):
+            return document.relative_to(REPO_ROOT).with_suffix("")
+        return document.relative_to(document.anchor).with_suffix("")
+
+    @property
+    def output_path(self) -> Path:
+        suffix = "" if self.profile == "default" else f"-{self.profile}"
+        return BUILD_DIR / self.profile / self.name.parent / f"{self.name.name}{suffix}.pdf"
+
+    @property
+    def log_path(self) -> Path:
+        return BUILD_DIR / self.profile / self.name.parent / f"{self.name.name}.log"
+
+
+class CompileResult(NamedTuple):
+    """A compiled job and what it cost.
+
+    ``cpu_seconds`` and ``max_rss_bytes`` are None when the PDF came from the
+    cache or the platform cannot report usage for a single child process.
+    """
+
+    job: CompileJob
+    output_path: Path
+    cached: bool
+    wall_seconds: float
+    cpu_seconds: Optional[float]
+    max_rss_bytes: Optional[int]
+    pdf_bytes: int
+    pages: Optional[int]
+
+    def metrics(self) -> Dict[str, Any]:
+        document = self.job.document.resolve()
+        return {
+            "document": str(document.relative_to(REPO_ROOT)) if document.is_relative_to(REPO_ROOT) else str(document),
+            "profile": self.job.profile,
+            "cached": self.cached,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": None if self.cpu_seconds is None else round(self.cpu_seconds, 3),
+            "max_rss_bytes": self.max_rss_bytes,
+            "pdf_bytes": self.pdf_bytes,
+            "pages": self.pages,
+        }
+
+
+def run(command: List[str], *, cwd: Path | None = None, timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None) -> Tuple[int, str, Optional[Any]]:
+    """Execute a command and return its exit status, combined output and resource usage.
+
+    The usage is the child's own `struct rusage` from ``os.wait4``, so it is
+    exact even when several compiles run at once; None where ``wait4`` is
+    not available.
+
+    The command runs in its own session. When ``timeout`` seconds pass, or
+    ``cancel`` is set, its whole process group is killed and
+    ``subprocess.TimeoutExpired`` or :class:`JobCancelled` is raised with
+    the output so far.
+    """
+    if not hasattr(os, "wait4"):
+        # No process groups or wait4 here: per-job timeout only, no usage
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True)
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            output, _ = process.communicate()
+            raise subprocess.TimeoutExpired(command, timeout, output=output)
+        return process.returncode, output, None
+
+    process = subprocess.Popen(
         command,
         cwd=cwd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
-        check=False,
+        start_new_session=True,
     )
-    return process.returncode, process.stdout
+    finished = threading.Event()
+    stopped: List[str] = []
+
+    def watch() -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not finished.wait(_WATCH_INTERVAL):
+            if cancel is not None and cancel.is_set():
+                stopped.append("cancelled")
+            elif deadline is not None and time.monotonic() >= deadline:
+                stopped.append("timeout")
+            else:
+                continue
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    with process:
+        try:
+            output = process.stdout.read()
+            _, wait_status, usage = os.wait4(process.pid, 0)
+        finally:
+            finished.set()
+            watcher.join()
+        # Reaped here, so Popen must not wait for the pid again
+        process.returncode = os.waitstatus_to_exitcode(wait_status)
+    if stopped == ["timeout"]:
+        raise subprocess.TimeoutExpired(command, timeout, output=output)
+    if stopped == ["cancelled"]:
+        raise JobCancelled(output)
+    return process.returncode, output, usage
+
+
+def max_rss_bytes(usage: Any) -> int:
+    """Return the peak resident set size recorded in ``usage``, in bytes."""
+    # ru_maxrss is in bytes on macOS and kibibytes elsewhere
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+
+
+def count_pdf_pages(path: Path) -> Optional[int]:
+    """Count the page objects in a PDF, looking inside compressed object streams if needed."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    pages = len(_PAGE_OBJECT.findall(data))
+    if pages:
+        return pages
+    for match in _STREAM.finditer(data):
+        try:
+            pages += len(_PAGE_OBJECT.findall(zlib.decompress(match.group(1))))
+        except zlib.error:
+            continue
+    return pages or None
 
 
 def ensure_typst_available() -> None:
@@ -58,38 +231,268 @@ def ensure_typst_available() -> None:
         )
 
 
-def compile_document(path: Path, profile: str) -> Path:
+def compile_document(path: Path, profile: str, cache: Optional[CompileCache] = None,
+                     timeout: Optional[float] = None,
+                     cancel: Optional[threading.Event] = None) -> CompileResult:
     if not path.exists():
         raise PreflightError(f"Document '{path}' does not exist.")
+    if cancel is not None and cancel.is_set():
+        raise JobCancelled(f"Compilation of '{path}' (profile '{profile}') was cancelled.")
 
-    output_dir = BUILD_DIR / profile
-    output_dir.mkdir(parents=True, exist_ok=True)
-    suffix = "" if profile == "default" else f"-{profile}"
-    output_path = output_dir / f"{path.stem}{suffix}.pdf"
+    job = CompileJob(path, profile)
+    output_path = job.output_path
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = cache.key(path, job.inputs)
+        if cache.fetch(key, output_path):
+            job.log_path.write_text(f"Reused cached PDF {key}\n", encoding="utf-8")
+            return _result(job, True, time.perf_counter() - started, None)
 
     command = ["typst", "compile", str(path), str(output_path)]
-    if profile != "default":
-        command.extend(["--input", f"profile={profile}"])
+    for name, value in job.inputs.items():
+        command.extend(["--input", f"{name}={value}"])
 
-    status, output = run(command, cwd=REPO_ROOT)
+    started = time.perf_counter()
+    try:
+        status, output, usage = run(command, cwd=REPO_ROOT, timeout=timeout, cancel=cancel)
+    except subprocess.TimeoutExpired as exc:
+        output = exc.output or ""
+        job.log_path.write_text(f"$ {' '.join(command)}\n{output}[timed out after {timeout:g}s]\n",
+                                encoding="utf-8")
+        raise PreflightError(
+            f"Typst compilation of '{path}' (profile '{profile}') timed out after {timeout:g}s.\n{output}"
+        ) from None
+    except JobCancelled as exc:
+        job.log_path.write_text(f"$ {' '.join(command)}\n{exc}[cancelled]\n", encoding="utf-8")
+        raise JobCancelled(f"Compilation of '{path}' (profile '{profile}') was cancelled.") from None
+    elapsed = time.perf_counter() - started
+    job.log_path.write_text(f"$ {' '.join(command)}\n{output}", encoding="utf-8")
     if status != 0:
         raise PreflightError(
             f"Typst compilation failed for '{path}' (profile '{profile}').\n{output}"
         )
-    return output_path
+    if cache is not None:
+        cache.store(key, output_path)
+    return _result(job, False, elapsed, usage)
+
+
+def _result(job: CompileJob, cached: bool, elapsed: float, usage: Optional[Any]) -> CompileResult:
+    output_path = job.output_path
+    return CompileResult(
+        job=job,
+        output_path=output_path,
+        cached=cached,
+        wall_seconds=elapsed,
+        cpu_seconds=None if usage is None else usage.ru_utime + usage.ru_stime,
+        max_rss_bytes=None if usage is None else max_rss_bytes(usage),
+        pdf_bytes=output_path.stat().st_size,
+        pages=count_pdf_pages(output_path),
+    )
+
+
+JobOutcome = Union[CompileResult, PreflightError]
+
+
+def compile_all(jobs: List[CompileJob], workers: int, cache: Optional[CompileCache] = None,
+                timeout: Optional[float] = None, fail_fast: bool = False,
+                on_result: Optional[Callable[[CompileJob, JobOutcome], None]] = None) -> List[CompileResult]:
+    """Compile every job on a pool of ``workers`` threads.
+
+    Each job writes its own PDF and log, so jobs never share an output.
+    ``on_result`` is called as each job finishes, in completion order; the
+    returned results are in job order. Each compile is killed after
+    ``timeout`` seconds. Normally all jobs run and failures are reported
+    together; with ``fail_fast`` the first failure cancels queued jobs and
+    kills running ones.
+    """
+    cancel = threading.Event()
+    outcomes: Dict[int, JobOutcome] = {}
+
+    def finish(index: int, outcome: JobOutcome) -> None:
+        outcomes[index] = outcome
+        if on_result is not None:
+            on_result(jobs[index], outcome)
+        if fail_fast and isinstance(outcome, PreflightError) and not isinstance(outcome, JobCancelled):
+            cancel.set()
+
+    def attempt(job: CompileJob) -> JobOutcome:
+        try:
+            return compile_document(job.document, job.profile, cache, timeout, cancel)
+        except PreflightError as exc:
+            return exc
+
+    if workers <= 1 or len(jobs) <= 1:
+        for index, job in enumerate(jobs):
+            if cancel.is_set():
+                break
+            finish(index, attempt(job))
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            pending = {executor.submit(attempt, job): index for index, job in enumerate(jobs)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(pending.pop(future), future.result())
+                    if cancel.is_set():
+                        # Queued jobs never start; running ones are killed and report back
+                        pending = {future: index for future, index in pending.items() if not future.cancel()}
+            except BaseException:
+                # Interrupted: kill running compiles, which are in their own sessions
+                cancel.set()
+                for future in pending:
+                    future.cancel()
+                raise
+
+    failures = [str(outcome).rstrip() for _, outcome in sorted(outcomes.items())
+                if isinstance(outcome, PreflightError) and not isinstance(outcome, JobCancelled)]
+    if failures:
+        skipped = len(jobs) - len(outcomes) + sum(isinstance(outcome, JobCancelled) for outcome in outcomes.values())
+        if skipped:
+            failures.append(f"{skipped} remaining job(s) cancelled by --fail-fast.")
+        raise PreflightError("\n\n".join(failures))
+    return [outcomes[index] for index in range(len(jobs))]
+
+
+class Placeholder(NamedTuple):
+    """A placeholder found in a source file; ``line`` and ``column`` are 1-based."""
+
+    path: Path
+    line: int
+    column: int
+    text: str
+
+    def __str__(self) -> str:
+        path = self.path.relative_to(REPO_ROOT) if self.path.is_relative_to(REPO_ROOT) else self.path
+        return f"{path}:{self.line}:{self.column}: placeholder '{self.text}'"
+
+
+def placeholder_pattern(strings: Iterable[str] = (), regexes: Iterable[str] = ()) -> "re.Pattern[bytes]":
+    """Combine the built-in placeholders, ``strings`` and ``regexes`` into one pattern.
+
+    Literal strings go longest first so a placeholder that contains another
+    is reported whole.
+    """
+    literals = sorted(PLACEHOLDER_STRINGS | set(strings), key=lambda text: (-len(text), text))
+    alternatives = [re.escape(text) for text in literals] + [f"(?:{regex})" for regex in regexes]
+    try:
+        pattern = re.compile("|".join(alternatives).encode("utf-8"))
+    except re.error as exc:
+        raise PreflightError(f"Invalid placeholder pattern: {exc}") from exc
+    if pattern.fullmatch(b""):
+        raise PreflightError("Placeholder patterns must not match the empty string.")
+    return pattern
+
+
+def _scan_file(path: Path, pattern: "re.Pattern[bytes]") -> List[Placeholder]:
+    found: List[Placeholder] = []
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return found
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size >= MMAP_THRESHOLD else handle.read()
+        try:
+            line = 1
+            scanned = 0
+            for match in pattern.finditer(data):
+                start = match.start()
+                line += data[scanned:start].count(b"\n")
+                scanned = start
+                line_start = data.rfind(b"\n", 0, start) + 1
+                column = len(data[line_start:start].decode("utf-8", errors="replace")) + 1
+                found.append(Placeholder(path, line, column, match.group().decode("utf-8", errors="replace")))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    return found
+
+
+def scan_for_placeholders(document: Path, pattern: Optional["re.Pattern[bytes]"] = None,
+                          workers: int = 1) -> List[Placeholder]:
+    """Scan ``document`` and every source it imports or includes for placeholders.
+
+    Files are read on up to ``workers`` threads; findings are ordered by file,
+    then position.
+    """
+    if not document.exists():
+        raise PreflightError(f"Document '{document}' does not exist.")
+    pattern = pattern or placeholder_pattern()
+    graph = DependencyGraph(REPO_ROOT)
+    sources = graph.sources([document])
+    graph.save()
+
+    def scan(path: Path) -> List[Placeholder]:
+        try:
+            return _scan_file(path, pattern)
+        except OSError as exc:
+            raise PreflightError(f"Failed to read '{path}': {exc}") from exc
+
+    if workers <= 1 or len(sources) <= 1:
+        results = [scan(path) for path in sources]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+            results = list(executor.map(scan, sources))
+    return [placeholder for found in results for placeholder in found]
 
 
-def scan_for_placeholders(path: Path) -> List[str]:
+def _metric_key(metrics: Dict[str, Any]) -> str:
+    return f"{metrics['profile']}/{metrics['document']}"
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, Any]]:
     try:
-        content = path.read_text(encoding="utf-8")
+        data = json.loads(path.read_text(encoding="utf-8"))
     except OSError as exc:
-        raise PreflightError(f"Failed to read '{path}': {exc}") from exc
+        raise PreflightError(f"Failed to read baseline '{path}': {exc}") from exc
+    except ValueError as exc:
+        raise PreflightError(f"Baseline '{path}' is not valid JSON: {exc}") from exc
+    if data.get("version") != BASELINE_VERSION:
+        raise PreflightError(f"Baseline '{path}' has unsupported version {data.get('version')!r}.")
+    return data.get("metrics", {})
+
 
-    issues: List[str] = []
-    for placeholder in PLACEHOLDER_STRINGS:
-        if placeholder in content:
-            issues.append(f"Placeholder '{placeholder}' found in {path.name}")
-    return issues
+def write_baseline(path: Path, metrics: List[Dict[str, Any]]) -> None:
+    """Store ``metrics`` as the baseline, keeping entries for jobs not run this time."""
+    try:
+        stored = load_baseline(path)
+    except PreflightError:
+        stored = {}
+    for entry in metrics:
+        if entry["cached"]:
+            # A cache hit says nothing about compile cost; keep the old figures
+            continue
+        stored[_metric_key(entry)] = {name: entry[name] for name in BASELINE_METRICS}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps({"version": BASELINE_VERSION, "metrics": stored}, indent=2, sort_keys=True)
+                      + "\n")
+
+
+def find_regressions(metrics: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                     max_regression: float) -> List[str]:
+    """Return a message for every metric more than ``max_regression`` percent above the baseline."""
+    regressions: List[str] = []
+    for entry in metrics:
+        stored = baseline.get(_metric_key(entry))
+        if stored is None:
+            continue
+        for name in BASELINE_METRICS:
+            if entry["cached"] and name in MEASURED_METRICS:
+                continue
+            current, previous = entry.get(name), stored.get(name)
+            if current is None or not previous:
+                continue
+            if name in ("wall_seconds", "cpu_seconds") and current - previous < MIN_TIME_DELTA:
+                continue
+            change = (current - previous) / previous * 100
+            if change > max_regression:
+                regressions.append(
+                    f"{_metric_key(entry)}: {name} {previous} -> {current} (+{change:.1f}%, "
+                    f"limit {max_regression:g}%)"
+                )
+    return regressions
 
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
@@ -113,6 +516,64 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         type=Path,
         help="Additional Typst sources to compile alongside the primary document.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of compilations to run at once (default: CPU count).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Kill a compilation (and any processes it started) after this many seconds.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failed compilation, cancelling queued and running jobs.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always compile instead of reusing PDFs from .typst-cache/compile.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Compile cache size cap in MiB; least recently used PDFs are evicted first.",
+    )
+    parser.add_argument(
+        "--placeholder",
+        dest="placeholders",
+        action="append",
+        default=[],
+        help="Additional placeholder text to flag (can be supplied multiple times).",
+    )
+    parser.add_argument(
+        "--placeholder-regex",
+        dest="placeholder_regexes",
+        action="append",
+        default=[],
+        help="Regular expression for additional placeholders, e.g. 'TODO|TBD' (can be supplied multiple times).",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="JSON file of stored compile metrics to check this run against.",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help="Fail when a metric exceeds the baseline by more than this percentage "
+             f"(default: {DEFAULT_MAX_REGRESSION:g}).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's metrics to the --baseline file instead of checking against it.",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -122,8 +583,34 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     return parser.parse_args(list(argv))
 
 
+def _describe(entry: Dict[str, Any]) -> str:
+    if entry["cached"]:
+        parts = ["cached"]
+    else:
+        parts = [f"{entry['wall_seconds']:.2f}s"]
+        if entry["cpu_seconds"] is not None:
+            parts.append(f"{entry['cpu_seconds']:.2f}s CPU")
+        if entry["max_rss_bytes"] is not None:
+            parts.append(f"{entry['max_rss_bytes'] / 1048576:.0f} MiB peak")
+    parts.append(f"{entry['pdf_bytes'] / 1024:.0f} KiB")
+    if entry["pages"] is not None:
+        parts.append(f"{entry['pages']} pages")
+    return ", ".join(parts)
+
+
 def main(argv: Iterable[str]) -> int:
     args = parse_args(argv)
+    if args.jobs < 1:
+        raise PreflightError("--jobs must be at least 1.")
+    if args.cache_size < 1:
+        raise PreflightError("--cache-size must be at least 1 MiB.")
+    if args.timeout is not None and args.timeout <= 0:
+        raise PreflightError("--timeout must be positive.")
+    if args.max_regression < 0:
+        raise PreflightError("--max-regression must not be negative.")
+    if args.update_baseline and args.baseline is None:
+        raise PreflightError("--update-baseline needs --baseline FILE.")
+    baseline = load_baseline(args.baseline) if args.baseline and not args.update_baseline else None
     ensure_typst_available()
 
     profiles = tuple(args.profiles) if args.profiles else DEFAULT_PROFILES
@@ -131,34 +618,83 @@ def main(argv: Iterable[str]) -> int:
 
     BUILD_DIR.mkdir(parents=True, exist_ok=True)
 
-    compiled: List[Path] = []
     metadata_warnings: List[str] = []
 
-    # Metadata placeholder checks on the main document only
-    metadata_warnings.extend(scan_for_placeholders(args.document))
+    # Placeholder checks on the main document and every source it pulls in
+    pattern = placeholder_pattern(args.placeholders, args.placeholder_regexes)
+    metadata_warnings.extend(str(found) for found in scan_for_placeholders(args.document, pattern, args.jobs))
 
+    jobs: List[CompileJob] = []
     for profile in profiles:
-        compiled.append(compile_document(args.document, profile))
+        jobs.append(CompileJob(args.document, profile))
         for extra_target in extra:
             if extra_target.exists():
-                compiled.append(compile_document(extra_target, profile))
+                jobs.append(CompileJob(extra_target, profile))
+
+    # Progress goes to stderr with --json so stdout stays a single JSON document
+    progress = sys.stderr if args.emit_json else sys.stdout
+    finished = 0
+
+    def report(job: CompileJob, outcome: JobOutcome) -> None:
+        nonlocal finished
+        finished += 1
+        label = f"[{finished}/{len(jobs)}] {job.profile}/{job.document.name}"
+        if isinstance(outcome, JobCancelled):
+            line = f"{label}: cancelled"
+        elif isinstance(outcome, PreflightError):
+            line = f"{label}: FAILED (see {job.log_path.relative_to(REPO_ROOT)})"
+        else:
+            line = f"[{finished}/{len(jobs)}] {outcome.output_path.relative_to(REPO_ROOT)} ({_describe(outcome.metrics())})"
+        print(line, file=progress, flush=True)
+
+    cache = None if args.no_cache else CompileCache(max_bytes=args.cache_size * 1024 * 1024)
+    try:
+        compiled = compile_all(jobs, args.jobs, cache, args.timeout, args.fail_fast, report)
+    finally:
+        if cache is not None:
+            cache.save()
+
+    metrics = [compiled_result.metrics() for compiled_result in compiled]
+    regressions: List[str] = []
+    if args.update_baseline:
+        write_baseline(args.baseline, metrics)
+    elif baseline is not None:
+        regressions = find_regressions(metrics, baseline, args.max_regression)
 
     result = {
-        "compiled": [str(path.relative_to(REPO_ROOT)) for path in compiled],
+        "compiled": [str(compiled_result.output_path.relative_to(REPO_ROOT)) for compiled_result in compiled],
         "metadata_warnings": metadata_warnings,
+        "metrics": metrics,
         "profiles": profiles,
     }
+    if baseline is not None:
+        result["regressions"] = regressions
+    if cache is not None:
+        result["cache"] = cache.run_stats()
 
     if args.emit_json:
         print(json.dumps(result, indent=2, sort_keys=True))
     else:
-        print("Preflight successful. Compiled artefacts:")
-        for path in result["compiled"]:
-            print(f"  - {path}")
+        print(f"Preflight successful: {len(compiled)} artefacts compiled.")
+        for path, entry in zip(result["compiled"], metrics):
+            print(f"  - {path} ({_describe(entry)})")
+        if cache is not None:
+            stats = result["cache"]
+            print(f"Compile cache: {stats['hits']} reused, {stats['misses']} compiled, "
+                  f"{stats['entries']} entries ({stats['bytes'] / 1048576:.1f} MiB)")
+        if args.update_baseline:
+            print(f"Baseline written to {args.baseline}")
         if metadata_warnings:
             print("Warnings:")
             for warning in metadata_warnings:
                 print(f"  - {warning}")
+        if regressions:
+            print(f"Regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+
+    if regressions:
+        return 3
 
     if metadata_warnings:
         # Return a non-zero code so CI can surface the warnings while still
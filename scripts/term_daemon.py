@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""Resident abbreviation and glossary service for editor integrations.
+
+Running ``manage_abbreviations.py`` for every lookup pays for interpreter
+start-up and a full parse of the config files each time. This daemon keeps
+the parsed abbreviation store and glossary entries in memory and answers
+JSON-RPC 2.0 requests over a Unix domain socket, one JSON object per line.
+Before each request the config files are checked with ``os.stat``; they are
+re-parsed only when their size, mtime or inode changed.
+
+Methods:
+    ping                                  Liveness check
+    lookup   {short | key | term}         Exact lookup of one entry
+    search   {prefix, source?, limit?}    Case-insensitive prefix search
+    validate {source?}                    Validation errors and warnings
+    add      {key, short, long?, category?}  Add an abbreviation and save
+    remove   {short}                      Remove an abbreviation and save
+    reload                                Force both files to be re-parsed
+
+Usage:
+    python scripts/term_daemon.py serve
+    python scripts/term_daemon.py call lookup --params '{"short": "ML"}'
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import contextlib
+import inspect
+import io
+import json
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from manage_abbreviations import AbbreviationManager
+from manage_terms import load_entries, validate_glossary
+from term_records import GlossaryTerm
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOCKET = REPO_ROOT / ".typst-cache" / "term-daemon.sock"
+DEFAULT_ABBREVIATIONS = REPO_ROOT / "config" / "abbreviations.typ"
+DEFAULT_GLOSSARY = REPO_ROOT / "config" / "glossary.typ"
+SOURCES = ("abbreviations", "glossary")
+DEFAULT_SEARCH_LIMIT = 50
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    """An error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """Return the slice of sorted ``keys`` that start with ``prefix``."""
+    start = bisect.bisect_left(keys, prefix)
+    return start, bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+
+
+class TermService:
+    """In-memory abbreviation and glossary data with change-driven reloads.
+
+    Calls are serialised by the server, so the service itself is not
+    thread-safe. Search indexes and validation results are rebuilt lazily
+    the first time they are needed after a change.
+    """
+
+    def __init__(self, abbreviations_path: Path, glossary_path: Path):
+        self.abbreviations_path = abbreviations_path
+        self.glossary_path = glossary_path
+        self._signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self.manager: Optional[AbbreviationManager] = None
+        self.glossary: List[GlossaryTerm] = []
+        self._glossary_by_term: Dict[str, GlossaryTerm] = {}
+        self._prefix_index: Dict[str, Optional[Tuple[List[str], list]]] = {}
+        self._validation: Dict[str, Dict[str, List[str]]] = {}
+        self.refresh()
+
+    def _load_abbreviations(self) -> None:
+        # The manager reports problems on stdout; route them to the log instead
+        with contextlib.redirect_stdout(io.StringIO()) as messages:
+            self.manager = AbbreviationManager(self.abbreviations_path)
+        for line in messages.getvalue().splitlines():
+            print(f"[abbreviations] {line}", file=sys.stderr)
+        self._changed("abbreviations")
+
+    def _load_glossary(self) -> None:
+        try:
+            self.glossary = load_entries(str(self.glossary_path), "glossary")
+        except (OSError, ValueError) as exc:
+            print(f"[glossary] Error loading {self.glossary_path}: {exc}", file=sys.stderr)
+            self.glossary = []
+        self._glossary_by_term = {}
+        for entry in self.glossary:
+            self._glossary_by_term.setdefault(entry.term, entry)
+        self._changed("glossary")
+
+    def _changed(self, source: str) -> None:
+        self._prefix_index[source] = None
+        self._validation.pop(source, None)
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """Reload any config file whose stat signature changed; return what was reloaded."""
+        reloaded = []
+        for source, path, load in (
+            ("abbreviations", self.abbreviations_path, self._load_abbreviations),
+            ("glossary", self.glossary_path, self._load_glossary),
+        ):
+            signature = _file_signature(path)
+            if force or signature != self._signatures.get(source, ()):
+                load()
+                self._signatures[source] = signature
+                reloaded.append(source)
+        return reloaded
+
+    def _index(self, source: str) -> Tuple[List[str], list]:
+        index = self._prefix_index.get(source)
+        if index is None:
+            if source == "abbreviations":
+                # Non-string values are left to validation, as for the glossary
+                pairs = [(value.casefold(), entry) for entry in self.manager.abbreviations
+                         for value in {value for value in (entry.short, entry.key) if isinstance(value, str)}]
+            else:
+                pairs = [(entry.term.casefold(), entry) for entry in self.glossary
+                         if isinstance(entry.term, str)]
+            pairs.sort(key=lambda pair: pair[0])
+            index = ([key for key, _ in pairs], [entry for _, entry in pairs])
+            self._prefix_index[source] = index
+        return index
+
+    # RPC methods
+
+    def ping(self) -> str:
+        return "pong"
+
+    def lookup(self, short: Optional[str] = None, key: Optional[str] = None,
+               term: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if short is not None:
+            entry = self.manager.abbreviations.get(short)
+        elif key is not None:
+            entry = self.manager.abbreviations.get_by_key(key)
+        elif term is not None:
+            entry = self._glossary_by_term.get(term)
+        else:
+            raise RpcError(INVALID_PARAMS, "lookup needs one of 'short', 'key' or 'term'")
+        return None if entry is None else entry.to_dict()
+
+    def search(self, prefix: str, source: str = "all",
+               limit: int = DEFAULT_SEARCH_LIMIT) -> Dict[str, List[Dict[str, Any]]]:
+        if source not in SOURCES + ("all",):
+            raise RpcError(INVALID_PARAMS, f"source must be one of {', '.join(SOURCES)} or all")
+        folded = prefix.casefold()
+        results = {}
+        for name in (SOURCES if source == "all" else (source,)):
+            keys, entries = self._index(name)
+            start, end = _prefix_range(keys, folded)
+            matches = []
+            seen = set()
+            for entry in entries[start:end]:
+                # An abbreviation whose short form and key both match is listed once
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                matches.append(entry.to_dict())
+                if len(matches) == limit:
+                    break
+            results[name] = matches
+        return results
+
+    def validate(self, source: str = "all") -> Dict[str, Dict[str, List[str]]]:
+        if source not in SOURCES + ("all",):
+            raise RpcError(INVALID_PARAMS, f"source must be one of {', '.join(SOURCES)} or all")
+        for name in (SOURCES if source == "all" else (source,)):
+            if name not in self._validation:
+                if name == "abbreviations":
+                    errors, warnings = self.manager.validate_abbreviations()
+                    self._validation[name] = {"errors": errors, "warnings": warnings}
+                else:
+                    self._validation[name] = validate_glossary(self.glossary)
+        if source == "all":
+            return {name: self._validation[name] for name in SOURCES}
+        return {source: self._validation[source]}
+
+    def _edit(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        ok, results = self.manager.apply_batch([operation])
+        if not ok:
+            raise RpcError(SERVER_ERROR, "; ".join(r["message"] for r in results if r["status"] == "error"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            saved = self.manager.save_abbreviations()
+        if not saved:
+            # The file changed underneath us; drop the in-memory edit
+            self.refresh(force=True)
+            raise RpcError(SERVER_ERROR, f"could not save {self.abbreviations_path}, reloaded from disk")
+        self._signatures["abbreviations"] = _file_signature(self.abbreviations_path)
+        self._changed("abbreviations")
+        return {"message": results[0]["message"], "total": len(self.manager.abbreviations)}
+
+    def add(self, key: str, short: str, long: str = "", category: Optional[str] = None) -> Dict[str, Any]:
+        operation = {"op": "add", "key": key, "short": short, "long": long}
+        if category is not None:
+            operation["category"] = category
+        return self._edit(operation)
+
+    def remove(self, short: str) -> Dict[str, Any]:
+        return self._edit({"op": "remove", "short": short})
+
+    def reload(self) -> List[str]:
+        return self.refresh(force=True)
+
+    METHODS = ("ping", "lookup", "search", "validate", "add", "remove", "reload")
+
+    def dispatch(self, method: str, params: Any) -> Any:
+        """Run one RPC method after picking up any config file changes."""
+        if method not in self.METHODS:
+            raise RpcError(METHOD_NOT_FOUND, f"unknown method: {method}")
+        if method != "reload":
+            self.refresh()
+        handler = getattr(self, method)
+        if isinstance(params, dict):
+            args, kwargs = (), params
+        elif params is None or isinstance(params, list):
+            args, kwargs = params or (), {}
+        else:
+            raise RpcError(INVALID_PARAMS, "params must be an object or an array")
+        # Bind first, so a TypeError raised inside the method is not mistaken
+        # for a bad call
+        try:
+            bound = inspect.signature(handler).bind(*args, **kwargs)
+        except TypeError as exc:
+            raise RpcError(INVALID_PARAMS, str(exc)) from exc
+        return handler(*bound.args, **bound.kwargs)
+
+
+def handle_message(service: TermService, lock: threading.Lock, line: bytes) -> Optional[Dict[str, Any]]:
+    """Answer one JSON-RPC request line; notifications (no id) get no reply."""
+    try:
+        request = json.loads(line)
+    except ValueError as exc:
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(exc)}}
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return {"jsonrpc": "2.0", "id": None,
+                "error": {"code": INVALID_REQUEST, "message": "expected a JSON-RPC request object"}}
+
+    request_id = request.get("id")
+    try:
+        with lock:
+            result = service.dispatch(request["method"], request.get("params"))
+        response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+    except RpcError as exc:
+        response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": exc.code, "message": str(exc)}}
+    except Exception as exc:  # keep serving after unexpected failures
+        response = {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": SERVER_ERROR, "message": f"{type(exc).__name__}: {exc}"}}
+    return response if "id" in request else None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = handle_message(self.server.service, self.server.lock, line)
+            if response is not None:
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+
+class TermServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server; requests are serialised through one lock."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, service: TermService):
+        self.service = service
+        self.lock = threading.Lock()
+        super().__init__(str(socket_path), _RequestHandler)
+
+
+def _terminate(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(socket_path: Path = DEFAULT_SOCKET, abbreviations_path: Path = DEFAULT_ABBREVIATIONS,
+          glossary_path: Path = DEFAULT_GLOSSARY) -> None:
+    """Serve requests on ``socket_path`` until interrupted."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            with TermClient(socket_path) as client:
+                client.call("ping")
+        except OSError:
+            socket_path.unlink()  # left behind by a daemon that did not shut down cleanly
+        else:
+            raise SystemExit(f"Error: a term daemon is already listening on {socket_path}")
+
+    service = TermService(abbreviations_path, glossary_path)
+    signal.signal(signal.SIGTERM, _terminate)
+    with TermServer(socket_path, service) as server:
+        print(f"Serving {len(service.manager.abbreviations)} abbreviations and "
+              f"{len(service.glossary)} glossary terms on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(OSError):
+                socket_path.unlink()
+
+
+class TermClient:
+    """Minimal client that keeps one connection open for repeated calls."""
+
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET, timeout: float = 5.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(str(socket_path))
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+        self._next_id = 0
+
+    def call(self, method: str, params: Any = None) -> Any:
+        """Send one request and return its result, raising RpcError on failure."""
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if params is not None:
+            request["params"] = params
+        self._socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("term daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RpcError(response["error"]["code"], response["error"]["message"])
+        return response.get("result")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "TermClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve or query abbreviation and glossary data over a Unix socket")
+    parser.add_argument("command", choices=["serve", "call"], help="Start the daemon or send one request")
+    parser.add_argument("method", nargs="?", help="Method name for call")
+    parser.add_argument("--params", help="JSON object or array of parameters for call")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help="Socket path")
+    parser.add_argument("--config", type=Path, default=DEFAULT_ABBREVIATIONS, help="Abbreviations config file")
+    parser.add_argument("--glossary", type=Path, default=DEFAULT_GLOSSARY, help="Glossary config file")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.config, args.glossary)
+        return 0
+
+    if not args.method:
+        parser.error("call requires a method name")
+    try:
+        params = json.loads(args.params) if args.params else None
+    except ValueError as exc:
+        parser.error(f"--params is not valid JSON: {exc}")
+    try:
+        with TermClient(args.socket) as client:
+            result = client.call(args.method, params)
+    except RpcError as exc:
+        print(f"Error: {exc}")
+        return 1
+    except OSError as exc:
+        print(f"Error: Could not reach the term daemon at {args.socket}: {exc}")
+        return 1
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
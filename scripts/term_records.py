@@ -0,0 +1,110 @@
+"""Compact, immutable entry records shared by the abbreviation and glossary tools.
+
+Entries parsed from `config/abbreviations.typ` and `config/glossary.typ` are
+held as :class:`Abbreviation` and :class:`GlossaryTerm` records rather than
+dictionaries. Both are slotted named tuples: no per-instance ``__dict__``,
+no hash table, and fields fixed at construction. Category names and related
+terms repeat across a glossary, so they are interned and ``related`` is a
+tuple, letting every entry share the same string objects.
+
+Fields the tools do not know about are kept in ``extra`` so nothing is lost
+when an entry is written back. Records convert to plain dictionaries only at
+the boundaries that need them (JSON, CSV and the Typst writer).
+"""
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+Extra = Tuple[Tuple[str, Any], ...]
+
+_intern = sys.intern
+
+
+def _text(value: Any) -> Any:
+    # Non-string values are kept as they are so validation can report them
+    return value if value is not None else ""
+
+
+def _extra(data: Dict[str, Any], known: Tuple[str, ...]) -> Extra:
+    if len(data) <= len(known) and all(name in known for name in data):
+        return ()
+    return tuple((name, value) for name, value in data.items() if name not in known)
+
+
+def _intern_optional(value: Any) -> Any:
+    return _intern(value) if isinstance(value, str) else value
+
+
+class Abbreviation(NamedTuple):
+    """One abbreviation: full term (``key``), short form and description."""
+
+    key: str
+    short: str
+    long: str = ""
+    category: Optional[str] = None
+    extra: Extra = ()
+
+    FIELDS = ("key", "short", "long", "category")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Abbreviation":
+        """Build a record from a parsed or imported dictionary."""
+        get = data.get
+        return cls(
+            _text(get("key")),
+            _text(get("short")),
+            _text(get("long")),
+            _intern_optional(get("category")),
+            _extra(data, cls.FIELDS),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the entry as a dictionary in config field order."""
+        data = {"key": self.key, "short": self.short, "long": self.long}
+        if self.category is not None:
+            data["category"] = self.category
+        data.update(self.extra)
+        return data
+
+
+class GlossaryTerm(NamedTuple):
+    """One glossary entry with its definition and related terms."""
+
+    term: str
+    definition: str = ""
+    category: Optional[str] = None
+    related: Tuple[str, ...] = ()
+    extra: Extra = ()
+
+    FIELDS = ("term", "definition", "category", "related")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GlossaryTerm":
+        """Build a record from a parsed or imported dictionary.
+
+        The term is interned as well, so a related-term reference and the
+        entry it points to share one string.
+        """
+        get = data.get
+        related = get("related") or ()
+        if not isinstance(related, (list, tuple)):
+            related = (related,)
+        return cls(
+            _intern_optional(_text(get("term"))),
+            _text(get("definition")),
+            _intern_optional(get("category")),
+            tuple(_intern_optional(name) for name in related),
+            _extra(data, cls.FIELDS),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the entry as a dictionary in config field order."""
+        data = {"term": self.term, "definition": self.definition}
+        if self.category is not None:
+            data["category"] = self.category
+        if self.related:
+            data["related"] = list(self.related)
+        data.update(self.extra)
+        return data
+
@@ -0,0 +1,679 @@
+"""Parser for the Typst data literals used by the template's config files.
+
+`config/abbreviations.typ` and `config/glossary.typ` store their entries as a
+Typst array of dictionaries bound with ``#let``. This module tokenizes such
+literals in a single left-to-right pass (strings with escapes, line and block
+comments, nested arrays and dictionaries) and records the source span of every
+top-level element so callers can locate or patch individual entries.
+
+Only the literal subset used by the config files is supported: strings,
+numbers, booleans, ``none``/``auto``, arrays and dictionaries. Anything else
+raises :class:`TypstParseError` with the offending line and column.
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+# Parsed arrays are cached next to the Typst cache so `make clean-cache`
+# clears both. Records use marshal, whose format depends on the interpreter
+# version, so the tag includes it.
+PARSE_CACHE_DIR = Path(__file__).resolve().parent.parent / ".typst-cache" / "parse"
+_CACHE_TAG = f"typst-data-3/py{sys.version_info[0]}.{sys.version_info[1]}/m{marshal.version}"
+_RACY_WINDOW_NS = 2_000_000_000
+
+_TRIVIA = r"(?:\s+|//[^\n]*)*"
+_TOKEN = re.compile(
+    _TRIVIA
+    + r"""(?:
+    (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+    | (?P<punct>[(),:])
+    | (?P<ident>[A-Za-z_][A-Za-z0-9_-]*)
+    | (?P<number>-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<comment>/\*)
+    | (?P<spread>\.\.)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+_COLON = re.compile(_TRIVIA + ":")
+
+# Fast path for the common element shape: a dictionary whose values are
+# strings or arrays of strings, with no comments. Such an element is matched
+# and split by a couple of C-level regex calls instead of token by token.
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_FLAT_VALUE = rf"(?:{_STRING}|\(\s*(?:{_STRING}\s*,\s*)*(?:{_STRING}\s*)?\))"
+_FLAT_PAIR_SOURCE = rf"[A-Za-z_][A-Za-z0-9_-]*\s*:\s*{_FLAT_VALUE}"
+_FLAT_ENTRY = re.compile(
+    rf"\(\s*{_FLAT_PAIR_SOURCE}(?:\s*,\s*{_FLAT_PAIR_SOURCE})*\s*,?\s*\)"
+)
+_FLAT_PAIR = re.compile(rf"([A-Za-z_][A-Za-z0-9_-]*)\s*:\s*(?:({_STRING})|\(((?:{_STRING}|[^()\"])*)\))")
+# What may separate the pairs of a flat entry; anything else means the pairs
+# did not cover the entry and the full parser must be used
+_FLAT_GAP = re.compile(r"[\s,]*")
+_FLAT_STRING = re.compile(_STRING)
+_WHITESPACE = re.compile(_TRIVIA)
+_ESCAPE = re.compile(r"\\(u\{([0-9A-Fa-f]{1,6})\}|.)", re.DOTALL)
+_SIMPLE_ESCAPES = {"\\": "\\", '"': '"', "n": "\n", "r": "\r", "t": "\t"}
+_KEYWORDS = {"true": True, "false": False, "none": None, "auto": None}
+# What `blank_comments` steps over: one-line strings, comment openers and
+# backtick runs delimiting raw text
+_LEXEME = re.compile(r'"(?:[^"\\\n]|\\.)*"|//|/\*|`+')
+_NOT_NEWLINE = re.compile(r"[^\n]")
+
+
+class TypstParseError(ValueError):
+    """Raised when a Typst literal cannot be parsed."""
+
+
+class SpanList:
+    """Element spans packed two offsets per span into one integer array.
+
+    Behaves like a read-only list of ``(start, end)`` tuples but stores 16
+    bytes per span instead of a tuple and two int objects, which matters
+    when a parse is kept in memory for a whole session.
+    """
+
+    __slots__ = ("_offsets",)
+
+    def __init__(self, spans: Iterable[Span] = ()):
+        self._offsets = array("q")
+        for span in spans:
+            self._offsets.extend(span)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpanList":
+        spans = cls()
+        spans._offsets.frombytes(data)
+        return spans
+
+    def to_bytes(self) -> bytes:
+        return self._offsets.tobytes()
+
+    def append(self, span: Span) -> None:
+        self._offsets.extend(span)
+
+    def __len__(self) -> int:
+        return len(self._offsets) >> 1
+
+    def __getitem__(self, index: int) -> Span:
+        count = len(self._offsets) >> 1
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("span index out of range")
+        return self._offsets[2 * index], self._offsets[2 * index + 1]
+
+    def __iter__(self) -> Iterator[Span]:
+        offsets = iter(self._offsets)
+        return zip(offsets, offsets)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SpanList):
+            return self._offsets == other._offsets
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SpanList({list(self)!r})"
+
+
+@dataclass
+class ParsedArray:
+    """A top-level ``#let name = (...)`` array and the spans of its elements.
+
+    ``start`` is the offset of the opening parenthesis and ``end`` the offset
+    just past the closing one. ``spans`` holds one ``(start, end)`` pair per
+    element, excluding surrounding whitespace and separators.
+    """
+
+    name: str
+    entries: List[Any] = field(default_factory=list)
+    spans: SpanList = field(default_factory=SpanList)
+    start: int = 0
+    end: int = 0
+
+
+def _position(text: str, offset: int) -> str:
+    line = text.count("\n", 0, offset) + 1
+    column = offset - (text.rfind("\n", 0, offset) + 1) + 1
+    return f"line {line}, column {column}"
+
+
+def _flat_entry(source: str) -> Optional[Dict[str, Any]]:
+    """Build the dictionary for a ``_FLAT_ENTRY`` match, or None to fall back."""
+    entry: Dict[str, Any] = {}
+    position = 1
+    try:
+        for match in _FLAT_PAIR.finditer(source, 1, len(source) - 1):
+            if _FLAT_GAP.fullmatch(source, position, match.start()) is None:
+                return None
+            position = match.end()
+            key, string, array = match.groups()
+            key = sys.intern(key)
+            if string:
+                entry[key] = _unescape(string)
+                continue
+            items = [_unescape(item) for item in _FLAT_STRING.findall(array)]
+            if len(items) == 1 and "," not in array[array.rfind('"'):]:
+                entry[key] = items[0]
+            else:
+                entry[key] = items
+    except ValueError:
+        return None
+    if _FLAT_GAP.fullmatch(source, position, len(source) - 1) is None:
+        return None
+    return entry
+
+
+def _unescape(literal: str) -> str:
+    body = literal[1:-1]
+    if "\\" not in body:
+        return body
+
+    def replace(match: re.Match) -> str:
+        if match.group(2) is not None:
+            return chr(int(match.group(2), 16))
+        char = match.group(1)
+        if char not in _SIMPLE_ESCAPES:
+            raise ValueError(f"unsupported escape sequence '\\{char}'")
+        return _SIMPLE_ESCAPES[char]
+
+    return _ESCAPE.sub(replace, body)
+
+
+class _Parser:
+    """Recursive-descent parser over a token stream produced on demand.
+
+    Each token is matched together with its leading whitespace and line
+    comments by one regular expression, so the source is scanned once.
+    """
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+        self.saw_comma = False
+
+    def error(self, message: str, offset: Optional[int] = None) -> TypstParseError:
+        where = _position(self.text, self.pos if offset is None else offset)
+        return TypstParseError(f"{message} at {where}")
+
+    def skip_block_comment(self, start: int) -> None:
+        # Typst block comments nest, so track depth explicitly.
+        depth = 0
+        pos = start
+        while True:
+            opening = self.text.find("/*", pos)
+            closing = self.text.find("*/", pos)
+            if closing == -1:
+                raise self.error("Unterminated block comment", start)
+            if opening != -1 and opening < closing:
+                depth += 1
+                pos = opening + 2
+            else:
+                depth -= 1
+                pos = closing + 2
+                if depth == 0:
+                    self.pos = pos
+                    return
+
+    def next_token(self) -> Tuple[str, str, int]:
+        """Return ``(kind, text, start)`` for the next significant token."""
+        while True:
+            match = _TOKEN.match(self.text, self.pos)
+            if match is None:
+                self.pos = _WHITESPACE.match(self.text, self.pos).end()
+                if self.pos >= len(self.text):
+                    raise self.error("Unexpected end of input")
+                raise self.error(f"Unexpected character {self.text[self.pos]!r}")
+            kind = match.lastgroup
+            if kind == "comment":
+                self.skip_block_comment(match.start(kind))
+                continue
+            self.pos = match.end()
+            return kind, match.group(kind), match.start(kind)
+
+    def expect(self, value: str) -> None:
+        _, text, start = self.next_token()
+        if text != value:
+            raise self.error(f"Expected '{value}' but found {text!r}", start)
+
+    def string(self, literal: str, start: int) -> str:
+        try:
+            return _unescape(literal)
+        except ValueError as exc:
+            raise self.error(str(exc).capitalize(), start) from None
+
+    def parse_value(self) -> Any:
+        return self.parse_token(*self.next_token())
+
+    def parse_token(self, kind: str, text: str, start: int) -> Any:
+        if kind == "string":
+            return self.string(text, start)
+        if kind == "number":
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if kind == "ident":
+            if text in _KEYWORDS:
+                return _KEYWORDS[text]
+            raise self.error(f"Unsupported identifier '{text}' (only literals are allowed)", start)
+        if kind == "spread":
+            raise self.error("Spread arguments are not supported", start)
+        if text == "(":
+            return self.parse_group(start)
+        raise self.error(f"Unexpected token {text!r}", start)
+
+    def parse_group(self, start: int, spans: Optional[SpanList] = None) -> Any:
+        """Parse the remainder of a parenthesised group after its ``(``.
+
+        When ``spans`` is given the group must be an array and the span of
+        every element is appended to it.
+        """
+        kind, text, token_start = self.next_token()
+        if text == ")":
+            self.saw_comma = False
+            return []
+        if text == ":":
+            self.expect(")")
+            if spans is not None:
+                raise self.error("Expected an array but found a dictionary", start)
+            return {}
+
+        items: List[Any] = []
+        pairs: Dict[str, Any] = {}
+        is_dict: Optional[bool] = None
+        saw_comma = False
+        while True:
+            key = None
+            if kind == "ident" or kind == "string":
+                colon = _COLON.match(self.text, self.pos)
+                if colon is not None:
+                    key = sys.intern(text if kind == "ident" else self.string(text, token_start))
+                    self.pos = colon.end()
+            if is_dict is None:
+                is_dict = key is not None
+                if is_dict and spans is not None:
+                    raise self.error("Expected an array but found a dictionary", start)
+            elif is_dict != (key is not None):
+                raise self.error("Cannot mix named and positional items", token_start)
+
+            if is_dict:
+                pairs[key] = self.parse_value()
+            else:
+                value = None
+                if spans is not None and text == "(":
+                    match = _FLAT_ENTRY.match(self.text, token_start)
+                    if match is not None:
+                        value = _flat_entry(match.group())
+                        if value is not None:
+                            self.pos = match.end()
+                if value is None:
+                    value = self.parse_token(kind, text, token_start)
+                items.append(value)
+                if spans is not None:
+                    spans.append((token_start, self.pos))
+
+            _, text, token_start = self.next_token()
+            if text == ")":
+                break
+            if text != ",":
+                raise self.error(f"Expected ',' or ')' but found {text!r}", token_start)
+            saw_comma = True
+            kind, text, token_start = self.next_token()
+            if text == ")":
+                break
+
+        self.saw_comma = saw_comma
+        if is_dict:
+            return pairs
+        if len(items) == 1 and not saw_comma and spans is None:
+            # `(value)` is a parenthesised expression, not an array.
+            return items[0]
+        return items
+
+
+def format_string(value: str) -> str:
+    """Render ``value`` as a Typst string literal."""
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+    return f'"{escaped}"'
+
+
+def format_value(value: Any) -> str:
+    """Render a scalar or array as an inline Typst literal."""
+    if isinstance(value, str):
+        return format_string(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "none"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        items = [format_value(item) for item in value]
+        if len(items) == 1:
+            return f"({items[0]},)"
+        return f"({', '.join(items)})"
+    if isinstance(value, dict):
+        if not value:
+            return "(:)"
+        pairs = [f"{_format_key(key)}: {format_value(item)}" for key, item in value.items()]
+        return f"({', '.join(pairs)})"
+    raise TypeError(f"Cannot render {type(value).__name__} as a Typst literal")
+
+
+def _format_key(key: str) -> str:
+    return key if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_-]*", key) else format_string(key)
+
+
+def format_entry(entry: Dict[str, Any], indent: str = "  ") -> str:
+    """Render a dictionary entry in the multi-line layout of the config files.
+
+    The opening parenthesis is not indented, since it follows the separator
+    that precedes the element in the array.
+    """
+    fields = [f"{indent}  {_format_key(key)}: {format_value(value)}" for key, value in entry.items()]
+    return "(\n" + ",\n".join(fields) + f"\n{indent})"
+
+
+def render_array(
+    source: str, parsed: ParsedArray, elements: List[Tuple[Optional[int], str]]
+) -> Tuple[str, ParsedArray]:
+    """Rebuild ``source`` with the array in ``parsed`` replaced by ``elements``.
+
+    ``elements`` lists the new array in order as ``(origin, text)`` pairs,
+    where ``origin`` is the index of the element in ``parsed`` the text was
+    taken from (or None for new text). Whitespace, separators and comments
+    around surviving elements are reused, so untouched parts of the array
+    are copied verbatim. Returns the new source and the spans of the result.
+    """
+    spans = parsed.spans
+    count = len(spans)
+    if count:
+        lead = source[parsed.start + 1:spans[0][0]]
+        trail = source[spans[-1][1]:parsed.end - 1]
+    else:
+        lead, trail = "\n  ", "\n"
+    if len(elements) == 1 and "," not in trail:
+        # One element needs a trailing comma to stay an array.
+        trail = "," + trail
+
+    pieces = [source[:parsed.start + 1]]
+    offset = parsed.start + 1
+    new_spans = SpanList()
+    if elements:
+        pieces.append(lead)
+        offset += len(lead)
+    for position, (origin, text) in enumerate(elements):
+        pieces.append(text)
+        new_spans.append((offset, offset + len(text)))
+        offset += len(text)
+        if position + 1 < len(elements):
+            if origin is not None and origin + 1 < count:
+                separator = source[spans[origin][1]:spans[origin + 1][0]]
+            else:
+                separator = ",\n  "
+            pieces.append(separator)
+            offset += len(separator)
+    if elements:
+        pieces.append(trail)
+        offset += len(trail)
+    pieces.append(source[parsed.end - 1:])
+
+    result = ParsedArray(name=parsed.name, spans=new_spans, start=parsed.start, end=offset + 1)
+    return "".join(pieces), result
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` without ever exposing a partial file.
+
+    The content is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target, preserving the target's permissions.
+    """
+    directory = path.parent
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if path.exists():
+            shutil.copymode(path, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def parse_value(text: str) -> Any:
+    """Parse a standalone Typst literal such as ``(a: 1, b: ("x", "y"))``."""
+    parser = _Parser(text)
+    value = parser.parse_value()
+    parser.pos = _WHITESPACE.match(text, parser.pos).end()
+    if parser.pos != len(text):
+        raise parser.error("Unexpected trailing content")
+    return value
+
+
+def parse_arguments(text: str, pos: int) -> Tuple[List[Any], Dict[str, Any], int]:
+    """Parse literal call arguments starting just after the opening ``(`` at ``pos``.
+
+    Returns the positional arguments, the named ones and the offset just past
+    the closing parenthesis. Raises TypstParseError if any argument is not a
+    literal, e.g. a variable or an expression.
+    """
+    parser = _Parser(text, pos)
+    positional: List[Any] = []
+    named: Dict[str, Any] = {}
+    kind, token, start = parser.next_token()
+    while token != ")":
+        colon = _COLON.match(text, parser.pos) if kind == "ident" else None
+        if colon is not None:
+            parser.pos = colon.end()
+            named[token] = parser.parse_value()
+        else:
+            positional.append(parser.parse_token(kind, token, start))
+        _, token, start = parser.next_token()
+        if token == ",":
+            kind, token, start = parser.next_token()
+        elif token != ")":
+            raise parser.error(f"Expected ',' or ')' but found {token!r}", start)
+    return positional, named, parser.pos
+
+
+def blank_comments(text: str, raw: bool = False) -> str:
+    """Return ``text`` with its comments (and raw text if ``raw``) blanked out.
+
+    Blanked characters become spaces and newlines are kept, so offsets and
+    line numbers still match the original. Raw text is never searched for
+    comments, nor is a one-line string, and ``//`` after a colon is taken to
+    be part of a URL.
+    """
+    pieces: List[str] = []
+    done = 0
+    pos = 0
+    while True:
+        match = _LEXEME.search(text, pos)
+        if match is None:
+            break
+        lexeme = match.group()
+        start = match.start()
+        if lexeme.startswith('"'):
+            pos = match.end()
+            continue
+        if lexeme == "//":
+            if start > 0 and text[start - 1] == ":":
+                pos = match.end()
+                continue
+            end = text.find("\n", start)
+            end = len(text) if end == -1 else end
+        elif lexeme == "/*":
+            end = _block_comment_end(text, start)
+        else:
+            closing = re.compile(rf"(?<!`){lexeme}(?!`)").search(text, match.end())
+            end = len(text) if closing is None else closing.end()
+            if not raw:
+                pos = end
+                continue
+        pieces.append(text[done:start])
+        pieces.append(_NOT_NEWLINE.sub(" ", text[start:end]))
+        done = pos = end
+    pieces.append(text[done:])
+    return "".join(pieces)
+
+
+def _block_comment_end(text: str, start: int) -> int:
+    """Return the offset past the (nested) block comment at ``start``, or the end of ``text``."""
+    depth = 0
+    pos = start
+    while True:
+        opening = text.find("/*", pos)
+        closing = text.find("*/", pos)
+        if closing == -1:
+            return len(text)
+        if opening != -1 and opening < closing:
+            depth += 1
+            pos = opening + 2
+        else:
+            depth -= 1
+            pos = closing + 2
+            if depth == 0:
+                return pos
+
+
+def find_binding(text: str, name: str) -> Optional[int]:
+    """Return the offset of the value bound by ``#let <name> =``, if present."""
+    match = re.search(
+        rf"^#let[ \t]+{re.escape(name)}[ \t]*=[ \t]*", text, re.MULTILINE
+    )
+    return match.end() if match else None
+
+
+def parse_array(text: str, name: str) -> ParsedArray:
+    """Parse the array bound to ``name`` and record the span of each element."""
+    offset = find_binding(text, name)
+    if offset is None:
+        raise TypstParseError(f"Could not find '#let {name} = (' in source")
+
+    parser = _Parser(text, offset)
+    _, token, start = parser.next_token()
+    if token != "(":
+        raise parser.error(f"Expected '(' after '#let {name} ='", start)
+
+    spans = SpanList()
+    entries = parser.parse_group(start, spans)
+    if len(entries) == 1 and not parser.saw_comma:
+        # A single element without a trailing comma is a parenthesised
+        # expression in Typst, not a one-element array.
+        raise parser.error(f"'{name}' holds a single value; add a trailing comma", start)
+    return ParsedArray(name=name, entries=entries, spans=spans, start=start, end=parser.pos)
+
+
+def load_array(path: Path, name: str) -> ParsedArray:
+    """Read ``path`` as UTF-8 and parse the array bound to ``name``."""
+    return parse_array(path.read_text(encoding="utf-8"), name)
+
+
+def source_digest(text: str) -> str:
+    """Return the content hash used to key cached parses."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_file(cache_dir: Path, path: Path, name: str) -> Path:
+    key = hashlib.sha1(f"{path.resolve()}\0{name}".encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.bin"
+
+
+def _read_cache_record(cache_file: Path) -> Optional[tuple]:
+    try:
+        record = marshal.loads(cache_file.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(record, tuple) or len(record) != 11 or record[0] != _CACHE_TAG:
+        return None
+    return record
+
+
+def store_cached_array(
+    path: Path, parsed: ParsedArray, digest: str, cache_dir: Path = PARSE_CACHE_DIR
+) -> None:
+    """Record ``parsed`` as the parse of ``path`` at its current size and mtime."""
+    try:
+        stat = path.stat()
+        record = (
+            _CACHE_TAG, str(path.resolve()), parsed.name, stat.st_size, stat.st_mtime_ns,
+            time.time_ns(), digest, parsed.entries, parsed.spans.to_bytes(), parsed.start, parsed.end,
+        )
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = _cache_file(cache_dir, path, parsed.name)
+        fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(marshal.dumps(record))
+        os.replace(temp_name, cache_file)
+    except (OSError, ValueError):
+        # The cache is an optimisation only; a failed write just means the
+        # next call parses again.
+        pass
+
+
+def load_array_cached(
+    path: Path, name: str, cache_dir: Optional[Path] = PARSE_CACHE_DIR
+) -> Tuple[ParsedArray, str]:
+    """Parse the array bound to ``name`` in ``path``, reusing a cached parse.
+
+    The cache holds one marshalled record per file and binding, keyed by the
+    file's size, mtime and content hash. When size and mtime match, the file
+    is not read at all; otherwise the content hash decides whether the old
+    parse is still valid. Pass ``cache_dir=None`` to bypass the cache.
+    Returns the parsed array and the content hash of the source.
+    """
+    if cache_dir is None:
+        text = path.read_text(encoding="utf-8")
+        return parse_array(text, name), source_digest(text)
+
+    stat = path.stat()
+    cache_file = _cache_file(cache_dir, path, name)
+    record = _read_cache_record(cache_file)
+    if record is not None and record[1:3] != (str(path.resolve()), name):
+        record = None
+
+    if record is not None:
+        _, _, _, size, mtime_ns, written_ns, digest, entries, spans, start, end = record
+        # A file modified within the mtime granularity of the cache write may
+        # have changed without its stat changing, so confirm it by hash.
+        racy = stat.st_mtime_ns >= written_ns - _RACY_WINDOW_NS
+        if size == stat.st_size and mtime_ns == stat.st_mtime_ns and not racy:
+            return ParsedArray(name, entries, SpanList.from_bytes(spans), start, end), digest
+
+    text = path.read_text(encoding="utf-8")
+    digest = source_digest(text)
+    if record is not None and record[6] == digest:
+        parsed = ParsedArray(name, record[7], SpanList.from_bytes(record[8]), record[9], record[10])
+    else:
+        parsed = parse_array(text, name)
+    store_cached_array(path, parsed, digest, cache_dir)
+    return parsed, digest
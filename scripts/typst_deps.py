@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""Dependency graph of the template's Typst sources.
+
+Each source file is scanned for the files it can read:
+
+- modules pulled in with `#import "..."` and `#include "..."`
+- files passed as literals to `image`, `bibliography`, `read` and the data
+  loaders (`json`, `csv`, `yaml`, `toml`, `xml`, `cbor`, `plugin`)
+- string literals naming an existing asset or `.bib` file, which covers
+  paths handed to the template as arguments (`bibliography_path: "refs.bib"`)
+- `@preview/...` package imports
+
+Comments and raw text are skipped. A file that builds a path at run time
+and passes it to one of these (`image("figures/" + name)`, or a variable bound
+to such an expression) is marked *dynamic*: what it reads cannot be known
+without evaluating it, so every asset and module in the project is treated as
+a possible dependency of the targets that reach it. PDFs are the exception:
+one that no source names is taken to be a compiled document. Passing on a
+parameter or a module (`image(path)` in a helper, `import cetz.draw: *`) is
+not dynamic; the literal the caller passes is found where it is written.
+
+Scans are kept per file with the size and mtime they were made at, in
+`.typst-cache/deps/graph.json`. A refresh only rereads files that changed, so
+answering "which targets does this edit affect?" is cheap enough for watch
+mode and caching.
+
+Usage:
+    python scripts/typst_deps.py closure thesis.typ
+    python scripts/typst_deps.py affected config/glossary.typ
+    python scripts/typst_deps.py graph --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from stat import S_ISREG
+from typing import Dict, Iterable, List, Optional, Set
+
+from typst_data import atomic_write_text, blank_comments
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Relative to the project root
+GRAPH_CACHE = Path(".typst-cache") / "deps" / "graph.json"
+GRAPH_VERSION = 2
+ASSET_SUFFIXES = {
+    ".bib", ".csl", ".csv", ".json", ".yaml", ".yml", ".toml", ".xml", ".cbor", ".txt",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".pdf", ".wasm",
+}
+# A computed path may also name a module
+COMPUTED_SUFFIXES = ASSET_SUFFIXES | {".typ"}
+# Compiled documents land next to their sources, so a PDF only counts as an
+# asset of a target that computes paths when some source names it
+OUTPUT_SUFFIXES = {".pdf"}
+# Not read by a compilation; documentation changes should not affect targets
+SKIP_DIRS = {".git", ".typst-cache", "build", "docs", "node_modules", "__pycache__"}
+# Files changed this recently may change again within the same mtime tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+_STRING = r'"((?:[^"\\\n]|\\.)*)"'
+_MODULE_REF = re.compile(rf"(?<![\w-])(?:import|include)\s+{_STRING}")
+_CALL_REF = re.compile(
+    rf"(?<![\w-])(?:image|bibliography|read|json|csv|yaml|toml|xml|cbor|plugin)\(\s*(?:{_STRING}|\(([^()]*)\))"
+)
+# Non-literal path arguments. `include` in code position only, so prose such
+# as "include the results" does not count
+_PATH_ARGUMENT = re.compile(
+    r"(?:(?:#|^[ \t]*)(?:import|include)\s+(?=[A-Za-z_(\"])"
+    r"|(?<![\w-])(?:image|bibliography|read|json|csv|yaml|toml|xml|cbor|plugin)\(\s*(?=[A-Za-z_(.\"]))",
+    re.MULTILINE,
+)
+_NAME = re.compile(r"[A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*)*")
+_BINDING = re.compile(r"(?<![\w-])let\s+([A-Za-z_][\w-]*)\s*=\s*([^\n]*)")
+# Expressions that build strings
+_COMPUTED = re.compile(r'\+|(?<![\w-])str\(|\.(?:join|replace|slice|trim)\(')
+_LITERAL = re.compile(_STRING)
+_LITERAL_GROUP = re.compile(rf"\(\s*(?:{_STRING}\s*,?\s*)*\)")
+_JOINED = re.compile(r"[ \t]*\+")
+
+
+def default_targets(root: Path = REPO_ROOT) -> List[Path]:
+    """The documents the template builds: the thesis, the sample chapter and the examples."""
+    targets = [root / "thesis.typ", root / "sample-chapter.typ"]
+    targets += sorted((root / "examples").glob("*.typ"))
+    return [path for path in targets if path.is_file()]
+
+
+def _resolve(reference: str, source: Path, root: Path) -> Path:
+    if reference.startswith("/"):
+        return root / reference.lstrip("/")
+    return source.parent / reference
+
+
+@dataclass
+class FileNode:
+    """What one source file references, as scanned at ``mtime_ns``/``size``."""
+
+    mtime_ns: int = 0
+    size: int = -1
+    modules: List[str] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    packages: List[str] = field(default_factory=list)
+    dynamic: bool = False
+
+
+def _builds_paths(text: str) -> bool:
+    """Whether ``text`` passes a path built at run time to an import or a loader."""
+    computed = {name for name, value in _BINDING.findall(text) if _COMPUTED.search(value)}
+    for match in _PATH_ARGUMENT.finditer(text):
+        argument = text[match.end():]
+        literal = _LITERAL.match(argument) or _LITERAL_GROUP.match(argument)
+        if literal is not None:
+            if _JOINED.match(argument, literal.end()):
+                return True
+            continue
+        if argument.startswith(".."):
+            # Spread arguments are passed on from the caller
+            continue
+        name = _NAME.match(argument)
+        if name is None:
+            return True
+        rest = argument[name.end():].lstrip(" \t")
+        if rest[:1] in ("(", "+") or name.group().split(".")[0] in computed:
+            return True
+    return False
+
+
+def scan_references(path: Path, root: Path) -> FileNode:
+    """Scan one source file; paths in the result are absolute and normalised."""
+    stat = path.stat()
+    text = blank_comments(path.read_text(encoding="utf-8", errors="replace"), raw=True)
+    modules: List[str] = []
+    files: List[str] = []
+    packages: List[str] = []
+
+    for match in _MODULE_REF.finditer(text):
+        reference = match.group(1)
+        if _JOINED.match(text, match.end()):
+            # The start of a computed path
+            continue
+        if reference.startswith("@"):
+            packages.append(reference)
+        else:
+            modules.append(os.path.normpath(_resolve(reference, path, root)))
+    for match in _CALL_REF.finditer(text):
+        if _JOINED.match(text, match.end()):
+            continue
+        literals = [match.group(1)] if match.group(1) is not None else _LITERAL.findall(match.group(2))
+        files += [os.path.normpath(_resolve(reference, path, root)) for reference in literals]
+    # Paths passed around as strings, e.g. `bibliography_path: "references.bib"`
+    for reference in _LITERAL.findall(text):
+        if Path(reference).suffix.lower() in ASSET_SUFFIXES and "\n" not in reference:
+            for candidate in (_resolve(reference, path, root), root / reference.lstrip("/")):
+                if candidate.is_file():
+                    files.append(os.path.normpath(candidate))
+                    break
+
+    return FileNode(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        modules=sorted(set(modules)),
+        files=sorted(set(files)),
+        packages=sorted(set(packages)),
+        dynamic=_builds_paths(text),
+    )
+
+
+def project_assets(root: Path) -> List[Path]:
+    """Every asset or module under ``root``, for targets that compute paths."""
+    assets = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS and not name.startswith(".")]
+        for name in filenames:
+            if not name.startswith(".") and os.path.splitext(name)[1].lower() in COMPUTED_SUFFIXES:
+                assets.append(Path(dirpath) / name)
+    return assets
+
+
+@dataclass
+class Closure:
+    """Everything a compilation of one target can read."""
+
+    sources: Set[Path]
+    files: Set[Path]
+    packages: Set[str]
+    dynamic: bool
+
+    @property
+    def paths(self) -> Set[Path]:
+        return self.sources | self.files
+
+
+class DependencyGraph:
+    """Per-file reference scans, refreshed incrementally by size and mtime."""
+
+    def __init__(self, root: Path = REPO_ROOT, persist: bool = True):
+        self.root = root.resolve()
+        self.cache_path = self.root / GRAPH_CACHE if persist else None
+        self.nodes: Dict[str, FileNode] = {}
+        self.scanned = 0
+        self._dirty = False
+        self._assets: Optional[Set[Path]] = None
+        if persist:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != GRAPH_VERSION or data.get("root") != str(self.root):
+            return
+        self.nodes = {name: FileNode(**node) for name, node in data.get("nodes", {}).items()}
+
+    def save(self) -> None:
+        """Write the scans back to the cache file if anything was rescanned."""
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        nodes = {name: vars(node) for name, node in sorted(self.nodes.items())}
+        atomic_write_text(self.cache_path, json.dumps(
+            {"version": GRAPH_VERSION, "root": str(self.root), "nodes": nodes}))
+        self._dirty = False
+
+    def node(self, path: Path) -> Optional[FileNode]:
+        """Return the scan of ``path``, rescanning it if it changed; None if it is not a file."""
+        name = os.path.normpath(path)
+        try:
+            stat = os.stat(name)
+        except OSError:
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            if self.nodes.pop(name, None) is not None:
+                self._dirty = True
+            return None
+        node = self.nodes.get(name)
+        if node is not None and node.mtime_ns == stat.st_mtime_ns and node.size == stat.st_size:
+            return node
+        node = scan_references(Path(name), self.root)
+        self.scanned += 1
+        racy = os.stat(name).st_mtime_ns != node.mtime_ns
+        if racy or node.mtime_ns > time.time_ns() - _RACY_WINDOW_NS:
+            # Rescan next time in case the file is still being written
+            node.mtime_ns = -1
+        self.nodes[name] = node
+        self._dirty = True
+        return node
+
+    def closure(self, target: Path) -> Closure:
+        """Return the sources and files reachable from ``target``."""
+        pending = [os.path.normpath(target.resolve())]
+        sources: Set[Path] = set()
+        files: Set[Path] = set()
+        packages: Set[str] = set()
+        dynamic = False
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            # Missing modules stay in the closure, so creating one is noticed
+            sources.add(Path(name))
+            node = self.node(Path(name))
+            if node is None:
+                continue
+            pending += node.modules
+            files.update(Path(file) for file in node.files)
+            packages.update(node.packages)
+            dynamic = dynamic or node.dynamic
+        return Closure(sources, files, packages, dynamic)
+
+    def sources(self, targets: Optional[Iterable[Path]] = None) -> List[Path]:
+        """Return the existing sources reachable from ``targets`` (default: all targets)."""
+        reachable: Set[Path] = set()
+        for target in (default_targets(self.root) if targets is None else targets):
+            reachable |= self.closure(target).sources
+        return sorted(path for path in reachable if str(path) in self.nodes)
+
+    def assets(self) -> Set[Path]:
+        """Return the assets a computed path may name, leaving out unreferenced outputs."""
+        if self._assets is None:
+            self._assets = {path.resolve() for path in project_assets(self.root)}
+        referenced = self._referenced()
+        return {path for path in self._assets if self._is_input(path, referenced)}
+
+    def forget_assets(self) -> None:
+        """Drop the asset listing, so assets added since are picked up."""
+        self._assets = None
+
+    def affected(self, changed: Iterable[Path], targets: Optional[Iterable[Path]] = None) -> List[Path]:
+        """Return the targets whose compilation can read any of ``changed``."""
+        changed_paths = {Path(os.path.normpath(path.resolve())) for path in changed}
+        closures = [(target, self.closure(target))
+                    for target in (default_targets(self.root) if targets is None else targets)]
+        referenced = self._referenced()
+        changed_assets = {path for path in changed_paths
+                          if path.suffix.lower() in COMPUTED_SUFFIXES and not self._skipped(path)
+                          and self._is_input(path, referenced)}
+        return [target for target, closure in closures
+                if changed_paths & closure.paths or (closure.dynamic and changed_assets)]
+
+    def _referenced(self) -> Set[Path]:
+        return {Path(name) for node in self.nodes.values() for name in node.files}
+
+    @staticmethod
+    def _is_input(path: Path, referenced: Set[Path]) -> bool:
+        return path.suffix.lower() not in OUTPUT_SUFFIXES or path in referenced
+
+    def _skipped(self, path: Path) -> bool:
+        try:
+            parts = path.relative_to(self.root).parts[:-1]
+        except ValueError:
+            return False
+        return any(part in SKIP_DIRS or part.startswith(".") for part in parts)
+
+    def edges(self, targets: Iterable[Path]) -> Dict[str, List[str]]:
+        """Return module edges (source -> imported or included module) reachable from ``targets``."""
+        edges: Dict[str, List[str]] = {}
+        for target in targets:
+            for source in sorted(self.closure(target).sources):
+                node = self.nodes.get(str(source))
+                if node is not None:
+                    edges[self.relative(source)] = [self.relative(Path(module)) for module in node.modules]
+        return edges
+
+    def relative(self, path: Path) -> str:
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+
+def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--no-cache", action="store_true", help="Ignore and do not update the scan cache")
+    common.add_argument("--json", action="store_true", dest="emit_json", help="Print results as JSON")
+    parser = argparse.ArgumentParser(description="Inspect the dependency graph of the Typst sources.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    closure_parser = commands.add_parser("closure", parents=[common], help="List every file a target can read")
+    closure_parser.add_argument("target", type=Path)
+
+    affected_parser = commands.add_parser("affected", parents=[common], help="List the targets affected by changed files")
+    affected_parser.add_argument("changed", type=Path, nargs="+")
+    affected_parser.add_argument("--targets", type=Path, nargs="+",
+                                 help="Targets to consider (default: thesis, sample chapter, examples)")
+
+    graph_parser = commands.add_parser("graph", parents=[common],
+                                       help="Print import/include edges and per-target statistics")
+    graph_parser.add_argument("--targets", type=Path, nargs="+",
+                              help="Targets to consider (default: thesis, sample chapter, examples)")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str]) -> int:
+    args = parse_args(argv)
+    graph = DependencyGraph(persist=not args.no_cache)
+
+    if args.command == "closure":
+        if not args.target.is_file():
+            print(f"Error: {args.target} does not exist", file=sys.stderr)
+            return 1
+        closure = graph.closure(args.target)
+        result = {
+            "sources": sorted(graph.relative(path) for path in closure.sources),
+            "files": sorted(graph.relative(path) for path in closure.files),
+            "packages": sorted(closure.packages),
+            "dynamic": closure.dynamic,
+        }
+        if args.emit_json:
+            print(json.dumps(result, indent=2))
+        else:
+            for path in result["sources"] + result["files"]:
+                print(path)
+            for package in result["packages"]:
+                print(package)
+            if closure.dynamic:
+                print("# computed paths: every project asset may be read", file=sys.stderr)
+
+    elif args.command == "affected":
+        affected = [graph.relative(path) for path in graph.affected(args.changed, args.targets)]
+        if args.emit_json:
+            print(json.dumps(affected, indent=2))
+        else:
+            for path in affected:
+                print(path)
+
+    else:
+        targets = args.targets or default_targets(graph.root)
+        if args.emit_json:
+            print(json.dumps(graph.edges(targets), indent=2))
+        else:
+            for target in targets:
+                closure = graph.closure(target)
+                imports = sum(len(graph.nodes[str(source)].modules)
+                              for source in closure.sources if str(source) in graph.nodes)
+                print(f"{graph.relative(target)}: {len(closure.sources)} sources, {imports} imports/includes, "
+                      f"{len(closure.files)} referenced files, {len(closure.packages)} packages"
+                      + (" (computes paths)" if closure.dynamic else ""))
+
+    graph.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
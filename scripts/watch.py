@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""Watch the template's sources and recompile only what a change affects.
+
+`typst watch` follows one document in one profile, so watching the thesis
+and the sample chapter in several profiles means one watcher per pair, each
+recompiling on every save. This script runs a single watcher instead:
+
+- changes are picked up with inotify on Linux, and by polling the files in
+  the dependency graph elsewhere (or with ``--poll``)
+- bursts of events, such as an editor writing a swap file and renaming it
+  into place, are merged until the tree has been quiet for ``--debounce``
+  milliseconds
+- `typst_deps` maps the changed files to the documents that read them, and
+  each affected document is queued once per watched profile
+- a bounded pool of ``--jobs`` workers compiles the queue; a job that is
+  requested again while queued is merged, and one that is requested again
+  while compiling is killed and restarted with the new sources
+
+Compiles go through the content-addressed cache in `compile_cache.py`, so
+undoing an edit restores the earlier PDF without compiling. PDFs are written
+next to their source: `thesis.pdf` for the default profile and
+`thesis-<profile>.pdf` for the others.
+
+Usage:
+    python scripts/watch.py
+    python scripts/watch.py --profile default --profile draft
+    python scripts/watch.py --target thesis.typ --poll
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from compile_cache import CompileCache
+from preflight import JobCancelled, run
+from typst_deps import SKIP_DIRS, DependencyGraph
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGETS = ("thesis.typ", "sample-chapter.typ")
+PROFILES = ("default", "draft", "screen", "print")
+DEFAULT_DEBOUNCE_MS = 150
+# A batch is flushed after this long even if events keep arriving
+MAX_BATCH_SECONDS = 1.0
+DEFAULT_POLL_INTERVAL = 0.5
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+
+Changes = Tuple[Set[Path], Set[Path]]
+
+
+class WatchJob(NamedTuple):
+    """One document compiled under one profile."""
+
+    target: Path
+    profile: str
+
+    @property
+    def inputs(self) -> Dict[str, str]:
+        return {} if self.profile == "default" else {"profile": self.profile}
+
+    @property
+    def output_path(self) -> Path:
+        suffix = "" if self.profile == "default" else f"-{self.profile}"
+        return self.target.with_name(f"{self.target.stem}{suffix}.pdf")
+
+    @property
+    def label(self) -> str:
+        return f"{self.target.stem}/{self.profile}"
+
+
+def _watched_dir(name: str) -> bool:
+    return name not in SKIP_DIRS and not name.startswith(".")
+
+
+class InotifyWatcher:
+    """Directory watches over the project tree through the Linux inotify API."""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.root = root
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._dirs: Dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_tree(self, top: Path) -> Set[Path]:
+        """Watch ``top`` and the directories below it; return the files found there."""
+        found: Set[Path] = set()
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [name for name in dirnames if _watched_dir(name)]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    continue
+                raise OSError(error, f"Cannot watch {dirpath}: {os.strerror(error)}")
+            self._dirs[wd] = Path(dirpath)
+            found.update(Path(dirpath) / name for name in filenames)
+        return found
+
+    def read(self, timeout: Optional[float]) -> Changes:
+        """Wait up to ``timeout`` seconds (forever if None) for events.
+
+        Returns the files and the directories that changed. A directory means
+        anything beneath it may have changed; after a queue overflow that is
+        the project root.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        files: Set[Path] = set()
+        directories: Set[Path] = set()
+        if not ready:
+            return files, directories
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    directories.add(self.root)
+                    continue
+                parent = self._dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if parent is None:
+                    continue
+                if not name:
+                    # The watched directory itself was deleted or moved
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        directories.add(parent)
+                    continue
+                path = parent / os.fsdecode(name)
+                if not mask & IN_ISDIR:
+                    files.add(path)
+                elif _watched_dir(path.name):
+                    directories.add(path)
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files can land in a new directory before it is watched
+                        files |= self._add_tree(path)
+        return files, directories
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Compares the size and mtime of every file the targets can read."""
+
+    def __init__(self, graph: DependencyGraph, targets: List[Path], interval: float = DEFAULT_POLL_INTERVAL):
+        self.graph = graph
+        self.targets = targets
+        self.interval = interval
+        self._snapshot = self._stat_all()
+
+    def _paths(self) -> Set[Path]:
+        paths: Set[Path] = set()
+        dynamic = False
+        for target in self.targets:
+            closure = self.graph.closure(target)
+            paths |= closure.paths
+            dynamic = dynamic or closure.dynamic
+        if dynamic:
+            # Computed paths may name any asset, including new ones
+            self.graph.forget_assets()
+            paths |= self.graph.assets()
+        return paths
+
+    def _stat_all(self) -> Dict[Path, Optional[Tuple[int, int]]]:
+        snapshot: Dict[Path, Optional[Tuple[int, int]]] = {}
+        for path in self._paths():
+            try:
+                stat = path.stat()
+            except OSError:
+                snapshot[path] = None
+            else:
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read(self, timeout: Optional[float]) -> Changes:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+            snapshot = self._stat_all()
+            changed = {path for path in self._snapshot.keys() | snapshot.keys()
+                       if self._snapshot.get(path) != snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed, set()
+
+    def close(self) -> None:
+        pass
+
+
+def affected_targets(graph: DependencyGraph, targets: List[Path], files: Set[Path],
+                     directories: Set[Path]) -> List[Path]:
+    """Return the targets that can read any of ``files`` or anything under ``directories``."""
+    affected = set(graph.affected(files, targets)) if files else set()
+    for target in targets:
+        if target in affected or not directories:
+            continue
+        closure = graph.closure(target)
+        if closure.dynamic or any(path == directory or directory in path.parents
+                                  for path in closure.paths for directory in directories):
+            affected.add(target)
+    return [target for target in targets if target in affected]
+
+
+class Builder:
+    """Compiles queued jobs on a fixed number of worker threads.
+
+    A job is queued at most once. Requesting a job that is already compiling
+    kills that compile, since its PDF would be out of date, and queues the job
+    again; the restart waits for the killed compile to exit so two compiles
+    never write the same PDF.
+    """
+
+    def __init__(self, workers: int, root: Path, cache: Optional[CompileCache] = None,
+                 timeout: Optional[float] = None):
+        self.root = root
+        self.cache = cache
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._queued: Dict[WatchJob, None] = {}
+        self._running: Dict[WatchJob, threading.Event] = {}
+        self._stopping = False
+        self._print_lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, jobs: Iterable[WatchJob]) -> None:
+        with self._condition:
+            for job in jobs:
+                cancel = self._running.get(job)
+                if cancel is not None and not cancel.is_set():
+                    cancel.set()
+                self._queued.setdefault(job, None)
+            self._condition.notify_all()
+
+    def wait(self) -> None:
+        """Block until no job is queued or compiling."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._stopping or not (self._queued or self._running))
+
+    def close(self) -> None:
+        """Drop queued jobs, kill running compiles and wait for the workers."""
+        with self._condition:
+            self._stopping = True
+            self._queued.clear()
+            for cancel in self._running.values():
+                cancel.set()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _next(self) -> Optional[Tuple[WatchJob, threading.Event]]:
+        with self._condition:
+            while True:
+                if self._stopping:
+                    return None
+                job = next((job for job in self._queued if job not in self._running), None)
+                if job is not None:
+                    del self._queued[job]
+                    cancel = self._running[job] = threading.Event()
+                    return job, cancel
+                self._condition.wait()
+
+    def _work(self) -> None:
+        while True:
+            claimed = self._next()
+            if claimed is None:
+                return
+            job, cancel = claimed
+            try:
+                self._compile(job, cancel)
+            finally:
+                with self._condition:
+                    del self._running[job]
+                    self._condition.notify_all()
+
+    def _report(self, job: WatchJob, message: str) -> None:
+        with self._print_lock:
+            print(f"[{job.label}] {message}", flush=True)
+
+    def _compile(self, job: WatchJob, cancel: threading.Event) -> None:
+        output_path = job.output_path
+        started = time.perf_counter()
+        try:
+            key = None
+            if self.cache is not None:
+                key = self.cache.key(job.target, job.inputs)
+                if self.cache.fetch(key, output_path):
+                    self._report(job, f"{output_path.name} restored from cache")
+                    return
+            command = ["typst", "compile", "--root", str(self.root)]
+            for name, value in job.inputs.items():
+                command += ["--input", f"{name}={value}"]
+            command += [str(job.target), str(output_path)]
+            status, output, _ = run(command, cwd=self.root, timeout=self.timeout, cancel=cancel)
+        except JobCancelled:
+            self._report(job, "superseded by a newer change")
+            return
+        except subprocess.TimeoutExpired:
+            self._report(job, f"timed out after {self.timeout:g}s")
+            return
+        except OSError as exc:
+            self._report(job, f"could not run Typst: {exc}")
+            return
+        elapsed = time.perf_counter() - started
+        if status != 0:
+            self._report(job, f"failed after {elapsed:.2f}s\n{output.rstrip()}")
+            return
+        if self.cache is not None:
+            self.cache.store(key, output_path)
+        if output.strip():
+            self._report(job, output.rstrip())
+        self._report(job, f"compiled {output_path.name} in {elapsed:.2f}s")
+
+
+def open_watcher(graph: DependencyGraph, targets: List[Path], poll: bool,
+                 interval: float) -> "InotifyWatcher | PollingWatcher":
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(graph.root)
+        except OSError as exc:
+            print(f"inotify unavailable ({exc}); polling every {interval:g}s instead", file=sys.stderr)
+    return PollingWatcher(graph, targets, interval)
+
+
+def watch(targets: List[Path], profiles: List[str], workers: int, debounce: float, poll: bool,
+          interval: float, cache: Optional[CompileCache], timeout: Optional[float]) -> None:
+    """Compile every target once, then recompile affected targets until interrupted."""
+    root = REPO_ROOT
+    graph = DependencyGraph(root)
+    outputs = {WatchJob(target, profile).output_path for target in targets for profile in profiles}
+
+    def jobs_for(affected: List[Path]) -> List[WatchJob]:
+        # Profile-major, so every document is refreshed in the first profile first
+        return [WatchJob(target, profile) for profile in profiles for target in affected]
+
+    watcher = open_watcher(graph, targets, poll, interval)
+    builder = Builder(workers, root, cache, timeout)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"Watching {', '.join(graph.relative(target) for target in targets)} "
+          f"in profile(s) {', '.join(profiles)} ({mode}). Press Ctrl+C to stop.", flush=True)
+    builder.request(jobs_for(targets))
+    try:
+        files: Set[Path] = set()
+        directories: Set[Path] = set()
+        first = last = 0.0
+        while True:
+            wait_for = None
+            if files or directories:
+                wait_for = max(0.0, min(last + debounce, first + MAX_BATCH_SECONDS) - time.monotonic())
+            new_files, new_directories = watcher.read(wait_for)
+            # Our own PDFs must not trigger rebuilds of documents that read assets
+            new_files -= outputs
+            now = time.monotonic()
+            if new_files or new_directories:
+                if not (files or directories):
+                    first = now
+                last = now
+                files |= new_files
+                directories |= new_directories
+                if now < min(last + debounce, first + MAX_BATCH_SECONDS):
+                    continue
+            if not (files or directories):
+                continue
+            affected = affected_targets(graph, targets, files, directories)
+            if cache is not None:
+                cache.refresh()
+            graph.save()
+            changed = sorted(graph.relative(path) for path in files | directories)
+            shown = ", ".join(changed[:3]) + (f" and {len(changed) - 3} more" if len(changed) > 3 else "")
+            if affected:
+                print(f"Changed {shown}: rebuilding "
+                      f"{', '.join(graph.relative(target) for target in affected)}", flush=True)
+                builder.request(jobs_for(affected))
+            elif any(not path.name.startswith(".") and path.suffix for path in files):
+                print(f"Changed {shown}: no watched document reads it", flush=True)
+            files, directories = set(), set()
+    finally:
+        builder.close()
+        watcher.close()
+        graph.save()
+        if cache is not None:
+            cache.save()
+
+
+def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompile the documents and profiles a change affects.")
+    parser.add_argument("--target", dest="targets", action="append", type=Path,
+                        help="Document to watch (repeatable; default: thesis.typ and sample-chapter.typ)")
+    parser.add_argument("--profile", dest="profiles", action="append", choices=PROFILES,
+                        help="Build profile to compile (repeatable; default: default)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of compilations to run at once (default: CPU count)")
+    parser.add_argument("--debounce", type=int, default=DEFAULT_DEBOUNCE_MS, metavar="MS",
+                        help=f"Quiet period before rebuilding, in milliseconds (default: {DEFAULT_DEBOUNCE_MS})")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Polling interval (default: {DEFAULT_POLL_INTERVAL:g})")
+    parser.add_argument("--timeout", type=float, help="Kill a compilation after this many seconds")
+    parser.add_argument("--no-cache", action="store_true", help="Always compile instead of reusing cached PDFs")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str]) -> int:
+    args = parse_args(argv)
+    if args.jobs < 1 or args.debounce < 0 or args.poll_interval <= 0:
+        print("Error: --jobs and --poll-interval must be positive and --debounce not negative", file=sys.stderr)
+        return 2
+    targets = [target.resolve() for target in (args.targets or [REPO_ROOT / name for name in DEFAULT_TARGETS])]
+    missing = [str(target) for target in targets if not target.is_file()]
+    if missing:
+        print(f"Error: {', '.join(missing)} does not exist", file=sys.stderr)
+        return 1
+    if shutil.which("typst") is None:
+        print("Error: Typst CLI not found in PATH", file=sys.stderr)
+        return 1
+    profiles = list(dict.fromkeys(args.profiles or ["default"]))
+    cache = None if args.no_cache else CompileCache(root=REPO_ROOT)
+    try:
+        watch(list(dict.fromkeys(targets)), profiles, args.jobs, args.debounce / 1000,
+              args.poll, args.poll_interval, cache, args.timeout)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,26 @@
+"""Regression tests for the helper scripts.
+
+The scripts in `scripts/` are standalone modules rather than a package, so
+that directory is put on the import path. Run with
+``python -m unittest discover -s tests -t .`` or ``python -m pytest tests``.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+STUB_TYPST = REPO_ROOT / "benchmarks" / "stub_typst.py"
+
+
+def install_stub_typst(directory: Path) -> Path:
+    """Put a `typst` running the benchmark stub in ``directory``, for tests without typst."""
+    path = directory / "typst"
+    path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{STUB_TYPST}" "$@"\n', encoding="utf-8")
+    path.chmod(0o755)
+    return path
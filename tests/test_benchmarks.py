@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.generate import INDEX_TERM_RATIO, MAIN_DOCUMENT, ThesisSize, generate_project, source_bytes
+from benchmarks.sweep import (BenchmarkError, Measurement, _fit, compile_case, find_growth, growth_exponent,
+                              linear_misfit, run_sweep)
+from manage_terms import load_entries
+
+from . import STUB_TYPST
+
+SCALES = (1, 2, 4, 8)
+
+
+def measurement(scale: int, wall_seconds: float) -> Measurement:
+    return Measurement(profile="default", dimension="chapters", scale=scale, chapters=scale, figures_per_chapter=2,
+                       citations=20, abbreviations=25, glossary_entries=25, index_marks=60, source_bytes=1000 * scale,
+                       wall_seconds=wall_seconds, cpu_seconds=None, max_rss_bytes=None, pdf_bytes=100, pages=1)
+
+
+class FitTest(unittest.TestCase):
+    def test_fit_and_misfit_of_a_line(self):
+        slope, intercept = _fit([1, 2, 4, 8], [3, 5, 9, 17])
+        self.assertAlmostEqual(slope, 2)
+        self.assertAlmostEqual(intercept, 1)
+        self.assertAlmostEqual(linear_misfit(SCALES, [3, 5, 9, 17]), 0)
+        self.assertGreater(linear_misfit(SCALES, [scale ** 2 for scale in SCALES]), 5)
+
+    def test_growth_exponent(self):
+        self.assertAlmostEqual(growth_exponent(SCALES, [0.5 + 0.1 * scale for scale in SCALES]), 1.0)
+        self.assertAlmostEqual(growth_exponent(SCALES, [0.5 + 0.1 * scale ** 2 for scale in SCALES]), 2.0)
+        self.assertEqual(growth_exponent(SCALES, [4, 3, 2, 1]), 0.0)
+        self.assertIsNone(growth_exponent([1, 2, 2], [1, 2, 3]))
+
+    def test_only_measurable_superlinear_growth_is_flagged(self):
+        cases = {
+            "linear": [0.2 + 0.1 * scale for scale in SCALES],
+            "quadratic": [0.2 + 0.1 * scale ** 2 for scale in SCALES],
+            # Curved, but the bend is well under the timing noise floor
+            "flat": [0.2, 0.2002, 0.201, 0.26],
+        }
+        for name, values in cases.items():
+            with self.subTest(name):
+                growth = find_growth([measurement(scale, value) for scale, value in zip(SCALES, values)])
+                wall = next(entry for entry in growth if entry.metric == "wall_seconds")
+                self.assertEqual(wall.superlinear, name == "quadratic")
+                # Metrics that were not measured are not fitted
+                cpu = next(entry for entry in growth if entry.metric == "cpu_seconds")
+                self.assertIsNone(cpu.exponent)
+
+
+class GenerateTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_project_matches_its_size(self):
+        size = ThesisSize(chapters=3, glossary_entries=7, index_marks=12)
+        project = self.dir / "project"
+        (project / "stale").mkdir(parents=True)
+        main = generate_project(size, project)
+
+        self.assertEqual(main, project / MAIN_DOCUMENT)
+        self.assertFalse((project / "stale").exists())
+        self.assertEqual(sorted(path.name for path in (project / "chapters").glob("*.typ")),
+                         ["chapter-001.typ", "chapter-002.typ", "chapter-003.typ"])
+        chapters = "".join(path.read_text(encoding="utf-8") for path in (project / "chapters").glob("*.typ"))
+        self.assertEqual(chapters.count("#index-term("), size.index_marks)
+        # The compiled tables are current for the extended term lists, so the thesis uses them
+        glossary = project / "config" / "glossary.typ"
+        layout = (project / "config" / "glossary-compiled.typ").read_text(encoding="utf-8")
+        self.assertIn(f"glossary-count = {len(load_entries(str(glossary), 'glossary', use_cache=False))}", layout)
+        self.assertIn(f"glossary-source-size = {glossary.stat().st_size}", layout)
+        index = (project / "config" / "index-terms.typ").read_text(encoding="utf-8")
+        self.assertEqual(index.count("(term: "), size.index_marks // INDEX_TERM_RATIO)
+
+    def test_sources_grow_with_scale(self):
+        sizes = [source_bytes(generate_project(ThesisSize().scaled("citations", scale), self.dir / str(scale)).parent)
+                 for scale in (1, 2, 4)]
+        self.assertEqual(sizes, sorted(set(sizes)))
+        with self.assertRaises(ValueError):
+            generate_project(ThesisSize(chapters=0), self.dir / "empty")
+
+
+class SweepTest(unittest.TestCase):
+    def test_sweep_compiles_every_case_with_the_stub(self):
+        typst = [sys.executable, str(STUB_TYPST)]
+        seen = []
+        with tempfile.TemporaryDirectory() as tmp:
+            measurements = run_sweep(typst, Path(tmp), ("default", "draft"), ("glossary_entries",), (1, 2),
+                                     ThesisSize(glossary_entries=100), on_result=seen.append)
+
+            self.assertEqual(seen, measurements)
+            self.assertEqual([(case.profile, case.scale, case.glossary_entries) for case in measurements],
+                             [("default", 1, 100), ("draft", 1, 100), ("default", 2, 200), ("draft", 2, 200)])
+            self.assertLess(measurements[0].source_bytes, measurements[2].source_bytes)
+            self.assertLess(measurements[0].pages, measurements[2].pages)
+            self.assertTrue((Path(tmp) / "glossary_entries-x2" / "draft.pdf").is_file())
+
+            document = Path(tmp) / "glossary_entries-x1" / MAIN_DOCUMENT
+            document.write_text('#panic("broken")\n', encoding="utf-8")
+            with self.assertRaisesRegex(BenchmarkError, "panicked"):
+                compile_case(typst, document, "default", document.with_suffix(".pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import build_index
+from build_index import build_table, scan_file, scan_sources
+
+CHAPTER = """// #index-term("Commented out")
+= Introduction
+The #index-term("zeta") and #index-term("Alpha", category: "Greek", subterm: "beta").
+Again #index-term("Alpha", subterm: "alef") and #index-term(computed).
+```typst
+#index-term("Only an example")
+```
+#optional-index-with-subentries(entries: (
+  "Machine Learning": ("supervised": "15", "unsupervised": "45"),
+))
+#optional-index-glossary-page(index-entries: ("Éclair": "3"))
+"""
+
+
+class ScanTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.chapter = self.dir / "chapter.typ"
+        self.chapter.write_text(CHAPTER, encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_marks_from_calls_and_helpers(self):
+        _, marks, dynamic = scan_file(str(self.chapter))
+
+        self.assertEqual(marks, [
+            ("zeta", None, None, 3),
+            ("Alpha", "Greek", "beta", 3),
+            ("Alpha", None, "alef", 4),
+            ("Machine Learning", None, "supervised", 8),
+            ("Machine Learning", None, "unsupervised", 8),
+            ("Éclair", "manual", None, 11),
+        ])
+        self.assertEqual(dynamic, 1)
+
+    def test_table_is_collated_with_sorted_subterms(self):
+        records, _ = scan_sources([self.chapter], jobs=1)
+        table = build_table(records, "en")
+
+        self.assertEqual([entry["term"] for entry in table], ["Alpha", "Éclair", "Machine Learning", "zeta"])
+        self.assertEqual(table[0]["category"], "Greek")
+        self.assertEqual(table[0]["subterms"], ["alef", "beta"])
+        self.assertEqual([entry["letter"] for entry in table], ["A", "E", "M", "Z"])
+
+    def test_write_then_check(self):
+        output = self.dir / "index-terms.typ"
+        argv = ["--paths", str(self.dir), "--output", str(output), "--jobs", "1"]
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(build_index.main(argv), 0)
+            self.assertIn('(term: "Alpha", category: "Greek", subterms: ("alef", "beta"), letter: "A", marks: 2),',
+                          output.read_text(encoding="utf-8"))
+            self.assertEqual(build_index.main(argv + ["--check"]), 0)
+
+            self.chapter.write_text(CHAPTER + '#index-term("New")\n', encoding="utf-8")
+            self.assertEqual(build_index.main(argv + ["--check"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import compile_cache
+from compile_cache import CompileCache, compile_cached
+
+from . import install_stub_typst
+
+# Both documents compute an image path, so any asset may be a dependency
+THESIS = '#let figure-path = "figures/" + "plot.png"\n#image(figure-path)\n'
+SAMPLE = '#let figure-path = "figures/" + "plot.png"\n#image(figure-path)\nSample chapter.\n'
+
+
+class CompileCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.root = base / "project"
+        self.cache_dir = base / "cache"
+        (self.root / "figures").mkdir(parents=True)
+        (self.root / "figures" / "plot.png").write_bytes(b"png")
+        (self.root / "thesis.typ").write_text(THESIS, encoding="utf-8")
+        (self.root / "sample-chapter.typ").write_text(SAMPLE, encoding="utf-8")
+        install_stub_typst(base)
+        patcher = mock.patch.dict(os.environ, {"PATH": f"{base}{os.pathsep}{os.environ['PATH']}"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def compile(self, name: str) -> bool:
+        """Compile like `make`, one process (and so one fresh cache) per document."""
+        cache = CompileCache(self.cache_dir, root=self.root)
+        source = self.root / f"{name}.typ"
+        status, output, cached = compile_cached(cache, source, source.with_suffix(".pdf"), {}, self.root)
+        cache.save()
+        self.assertEqual(status, 0, output)
+        return cached
+
+    def test_outputs_of_other_targets_do_not_change_keys(self):
+        self.assertFalse(self.compile("thesis"))
+        self.assertFalse(self.compile("sample-chapter"))
+        for _ in range(2):
+            self.assertTrue(self.compile("thesis"))
+            self.assertTrue(self.compile("sample-chapter"))
+
+    def test_referenced_pdf_is_still_hashed(self):
+        figure = self.root / "figures" / "diagram.pdf"
+        figure.write_bytes(b"%PDF-1.7 one")
+        (self.root / "thesis.typ").write_text(THESIS + '#let diagram = "figures/diagram.pdf"\n',
+                                              encoding="utf-8")
+        cache = CompileCache(self.cache_dir, root=self.root)
+        before = cache.key(self.root / "thesis.typ")
+        figure.write_bytes(b"%PDF-1.7 two")
+
+        self.assertNotEqual(cache.key(self.root / "thesis.typ"), before)
+
+    def test_files_are_hashed_outside_the_lock(self):
+        cache = CompileCache(self.cache_dir, root=self.root)
+        real_digest = compile_cache.file_digest
+
+        def file_digest(path):
+            self.assertFalse(cache._lock.locked())
+            return real_digest(path)
+
+        with mock.patch("compile_cache.file_digest", side_effect=file_digest) as digest:
+            cache.key(self.root / "thesis.typ")
+        self.assertTrue(digest.called)
+
+    def test_save_drops_digests_of_deleted_files(self):
+        old = self.root / "figures" / "old.png"
+        old.write_bytes(b"old")
+        for path in self.root.rglob("*"):
+            os.utime(path, ns=(0, 0))
+        cache = CompileCache(self.cache_dir, root=self.root)
+        cache.key(self.root / "thesis.typ")
+        cache.save()
+        self.assertIn(str(old), json.loads((self.cache_dir / "digests.json").read_text(encoding="utf-8")))
+
+        old.unlink()
+        CompileCache(self.cache_dir, root=self.root).save()
+        digests = json.loads((self.cache_dir / "digests.json").read_text(encoding="utf-8"))
+        self.assertNotIn(str(old), digests)
+        self.assertIn(str(self.root / "thesis.typ"), digests)
+
+    def test_cli_keys_relative_to_root(self):
+        """A copy of the project elsewhere reuses the PDFs compiled for the original."""
+        copy = self.root.with_name("copy")
+        shutil.copytree(self.root, copy)
+
+        def compile(root: Path) -> str:
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                status = compile_cache.main(["--cache-dir", str(self.cache_dir), "compile", "--root", str(root),
+                                             str(root / "thesis.typ"), str(root / "thesis.pdf")])
+            self.assertEqual(status, 0, stdout.getvalue())
+            return stdout.getvalue()
+
+        compile(self.root)
+        self.assertIn("cached", compile(copy))
+        self.assertTrue((copy / ".typst-cache").is_dir())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from manage_abbreviations import (AbbreviationManager, AbbreviationStore, ImportConflict, iter_csv_rows,
+                                  iter_json_array, iter_jsonl_rows, write_csv, write_json, write_jsonl)
+from term_records import Abbreviation
+
+CONFIG = """#let abbreviations = (
+  (key: "Algorithm", short: "Algo", long: "A step-by-step procedure."),
+  (key: "Machine Learning", short: "ML", long: "Learning from data."),
+  (key: "Random Forest", short: "RF", long: "An ensemble of decision trees."),
+)
+"""
+
+
+class ScanUsageTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "config").mkdir()
+        self.config = self.root / "config" / "abbreviations.typ"
+        self.config.write_text(CONFIG, encoding="utf-8")
+        self.manager = AbbreviationManager(self.config)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, text: str) -> None:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def test_generated_and_config_files_are_skipped(self):
+        self.write("config/abbreviations-compiled.typ",
+                   "// Generated by scripts/manage_abbreviations.py compile; do not edit by hand.\n"
+                   '#let shorts = ("Algo", "ML", "RF")\n')
+        self.write("config/glossary.typ", "Random Forest and ML.\n")
+        self.write("chapters/intro.typ", "We use #abbrev(\"ML\") throughout.\n")
+
+        report = self.manager.scan_usage([self.root], jobs=1)
+
+        self.assertEqual(report["files_scanned"], 1)
+        self.assertEqual(report["totals"], {"ML": 1})
+        self.assertEqual([entry["short"] for entry in report["unused"]], ["Algo", "RF"])
+
+    def test_keys_inside_identifiers_and_comments_do_not_count(self):
+        self.write("utils/style.typ", "\n".join([
+            "// Algorithm environment",
+            '#let algorithm-counter = counter("algorithm")',
+            "#let algorithm(body) = figure(kind: \"algorithm\", body)",
+            "#algorithm[An algorithm for machine learning.]",
+        ]) + "\n")
+
+        report = self.manager.scan_usage([self.root], jobs=1)
+
+        self.assertEqual(report["totals"], {"Algo": 1, "ML": 1})
+
+
+class ImportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self._tmp.name) / "abbreviations.typ"
+        self.config.write_text(CONFIG, encoding="utf-8")
+        self.manager = AbbreviationManager(self.config, use_cache=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_json_array_is_read_in_chunks(self):
+        rows = [{"key": f"Term {i}", "short": f"T{i}", "long": "x" * i} for i in range(50)]
+        stream = io.StringIO(" [\n" + ",\n".join(map(str, rows)).replace("'", '"') + "\n] ")
+
+        self.assertEqual(list(iter_json_array(stream, chunk_size=7)), rows)
+
+    def test_json_input_must_be_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"key": "a"}')))
+
+    def test_csv_and_jsonl_rows(self):
+        csv_rows = iter_csv_rows(io.StringIO(
+            "Term,Abbreviation,Definition,Notes\nSupport Vector Machine,SVM,A classifier,n\n"))
+        self.assertEqual(list(csv_rows), [{"key": "Support Vector Machine", "short": "SVM", "long": "A classifier"}])
+        jsonl_rows = iter_jsonl_rows(io.StringIO('{"key": "a", "short": "A"}\n\n{"key": "b", "short": "B"}\n'))
+        self.assertEqual([row["short"] for row in jsonl_rows], ["A", "B"])
+
+    def test_conflicts_are_skipped_within_and_against_the_file(self):
+        counts = self.manager.import_abbreviations([
+            {"key": "Gradient Boosting", "short": "GB"},
+            {"key": "Gradient Boosted Trees", "short": "GB"},
+            {"key": "Machine Learning", "short": "MLE"},
+            {"key": "", "short": "X"},
+            "not a row",
+        ])
+
+        self.assertEqual(counts, {"added": 1, "overwritten": 0, "skipped": 2, "invalid": 2})
+        self.assertEqual(self.manager.abbreviations.get("GB").key, "Gradient Boosting")
+
+    def test_overwrite_and_fail(self):
+        counts = self.manager.import_abbreviations(
+            [{"key": "Machine Learning", "short": "ML", "long": "Updated."}], on_conflict="overwrite")
+        self.assertEqual(counts["overwritten"], 1)
+        self.assertEqual(self.manager.abbreviations.get("ML").long, "Updated.")
+
+        with self.assertRaises(ImportConflict):
+            self.manager.import_abbreviations([{"key": "Other", "short": "RF"}], on_conflict="fail")
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self._tmp.name) / "abbreviations.typ"
+        self.config.write_text(CONFIG, encoding="utf-8")
+        self.manager = AbbreviationManager(self.config, use_cache=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_rows_stream_in_file_order_or_sorted(self):
+        rows = self.manager.iter_export_rows()
+        self.assertEqual(next(rows)["short"], "Algo")
+        self.assertEqual([row["short"] for row in self.manager.iter_export_rows(sort_by="short", reverse=True)],
+                         ["RF", "ML", "Algo"])
+        self.assertEqual(list(self.manager.iter_export_rows(fields=["short"]))[1], {"short": "ML"})
+
+    def test_json_round_trips_through_import(self):
+        for write, read in ((write_json, iter_json_array), (write_jsonl, iter_jsonl_rows)):
+            stream = io.StringIO()
+            self.assertEqual(write(stream, self.manager.iter_export_rows(), None), 3)
+            stream.seek(0)
+            self.assertEqual(list(read(stream)), list(self.manager.iter_export_rows()))
+        stream = io.StringIO()
+        write_json(stream, iter(()), None)
+        self.assertEqual(json.loads(stream.getvalue()), [])
+
+    def test_csv_headers_map_back_on_import(self):
+        stream = io.StringIO()
+        write_csv(stream, self.manager.iter_export_rows(), None)
+        stream.seek(0)
+
+        self.assertEqual([row["short"] for row in iter_csv_rows(stream)], ["Algo", "ML", "RF"])
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self._tmp.name) / "abbreviations.typ"
+        self.config.write_text(CONFIG, encoding="utf-8")
+        self.manager = AbbreviationManager(self.config, use_cache=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def shorts(self) -> list:
+        return [entry.short for entry in self.manager.abbreviations]
+
+    def test_operations_see_earlier_ones(self):
+        ok, results = self.manager.apply_batch([
+            {"op": "add", "key": "Gradient Boosting", "short": "GB", "long": "Boosted trees."},
+            {"op": "update", "short": "GB", "new_short": "GBM"},
+            {"op": "remove", "short": "RF"},
+            {"op": "update", "short": "ML", "long": "Learning from data."},
+        ])
+
+        self.assertTrue(ok, results)
+        self.assertEqual([result["status"] for result in results], ["ok"] * 4)
+        self.assertTrue(results[3]["message"].startswith("unchanged"))
+        self.assertEqual(self.shorts(), ["Algo", "ML", "GBM"])
+
+    def test_one_failure_rolls_back_everything(self):
+        ok, results = self.manager.apply_batch([
+            {"op": "remove", "short": "ML"},
+            {"op": "add", "key": "Random Forest", "short": "RFS"},
+            "not an operation",
+            {"op": "rename", "short": "Algo"},
+        ])
+
+        self.assertFalse(ok)
+        self.assertEqual([result["status"] for result in results], ["ok", "error", "error", "error"])
+        self.assertEqual(self.shorts(), ["Algo", "ML", "RF"])
+
+    def test_existing_validation_errors_do_not_block_edits(self):
+        self.config.write_text(CONFIG.replace("(key: \"Random Forest\", short: \"RF\"",
+                                              "(key: \"Machine Learning\", short: \"RF\""), encoding="utf-8")
+        manager = AbbreviationManager(self.config, use_cache=False)
+
+        ok, results = manager.apply_batch([{"op": "update", "short": "Algo", "long": "Steps."}])
+
+        self.assertTrue(ok, results)
+        self.assertEqual(manager.abbreviations.get("Algo").long, "Steps.")
+
+
+class CompileTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self._tmp.name) / "abbreviations.typ"
+        self.config.write_text(CONFIG, encoding="utf-8")
+        self.compiled = Path(self._tmp.name) / "abbreviations-compiled.typ"
+        self.manager = AbbreviationManager(self.config, use_cache=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_module_records_count_and_size_not_a_copy(self):
+        self.assertEqual(self.manager.compile_abbreviations(), self.compiled)
+        text = self.compiled.read_text(encoding="utf-8")
+
+        self.assertIn("#let abbreviation-count = 3\n", text)
+        self.assertIn(f"#let abbreviation-source-size = {self.config.stat().st_size}\n", text)
+        self.assertIn('"ML": 1,', text)
+        self.assertNotIn("Learning from data", text)
+        self.assertIn("#let order-by-short = (0, 1, 2)", text)
+
+    def test_saves_refresh_an_existing_module(self):
+        self.manager.compile_abbreviations()
+        self.manager.add_abbreviation("Support Vector Machine", "SVM", "A margin classifier.")
+        self.assertIsNone(self.manager.compile_abbreviations())
+        self.manager.save_abbreviations()
+
+        text = self.compiled.read_text(encoding="utf-8")
+        self.assertIn("#let abbreviation-count = 4\n", text)
+        self.assertIn(f"#let abbreviation-source-size = {self.config.stat().st_size}\n", text)
+
+    def test_refuses_a_file_changed_since_loading(self):
+        self.config.write_text(CONFIG + "\n", encoding="utf-8")
+
+        self.assertIsNone(self.manager.compile_abbreviations())
+        self.assertFalse(self.compiled.exists())
+
+
+class SaveTest(unittest.TestCase):
+    """Saves patch the changed entries and copy everything else verbatim."""
+
+    SOURCE = """// Abbreviations used in the thesis
+#let abbreviations = (
+  // Methods
+  (key: "Algorithm",   short: "Algo", long: "A step-by-step procedure."),
+  "stray element",
+  (key: "Machine Learning", short: "ML", long: "Learning from data."),
+  (key: "Random Forest", short: "RF", long: "An ensemble of decision trees."),
+)
+
+#let extra = 1
+"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self._tmp.name) / "abbreviations.typ"
+        self.config.write_text(self.SOURCE, encoding="utf-8")
+        patcher = mock.patch("manage_abbreviations.PARSE_CACHE_DIR", Path(self._tmp.name) / "cache")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_untouched_text_survives(self):
+        manager = AbbreviationManager(self.config)
+        self.assertTrue(manager.remove_abbreviation("ML"))
+        self.assertTrue(manager.add_abbreviation("Support Vector Machine", "SVM", "A margin classifier."))
+        self.assertTrue(manager.save_abbreviations())
+
+        text = self.config.read_text(encoding="utf-8")
+        self.assertTrue(text.startswith("// Abbreviations used in the thesis\n"))
+        self.assertIn("  // Methods\n", text)
+        self.assertIn('(key: "Algorithm",   short: "Algo"', text)
+        self.assertIn('"stray element"', text)
+        self.assertNotIn('"ML"', text)
+        self.assertTrue(text.endswith(")\n\n#let extra = 1\n"))
+        self.assertLess(text.index('"stray element"'), text.index('"RF"'))
+
+        reloaded = AbbreviationManager(self.config)
+        self.assertEqual([entry.short for entry in reloaded.abbreviations], ["Algo", "RF", "SVM"])
+
+    def test_skipped_elements_survive_repeated_saves(self):
+        manager = AbbreviationManager(self.config)
+        manager.remove_abbreviation("Algo")
+        self.assertTrue(manager.save_abbreviations())
+        manager.add_abbreviation("Gradient Boosting", "GB", "Boosted trees.")
+        self.assertTrue(manager.save_abbreviations())
+
+        # Loaded from the parse cache written by the last save
+        reloaded = AbbreviationManager(self.config)
+        self.assertEqual([entry.short for entry in reloaded.abbreviations], ["ML", "RF", "GB"])
+        reloaded.remove_abbreviation("RF")
+        self.assertTrue(reloaded.save_abbreviations())
+        text = self.config.read_text(encoding="utf-8")
+        self.assertEqual(text.count('"stray element"'), 1)
+        self.assertLess(text.index('"stray element"'), text.index('"ML"'))
+
+    def test_no_change_leaves_file_alone(self):
+        manager = AbbreviationManager(self.config)
+        self.assertFalse(manager.save_abbreviations())
+        self.assertEqual(self.config.read_text(encoding="utf-8"), self.SOURCE)
+
+    def test_refuses_to_save_over_outside_edits(self):
+        manager = AbbreviationManager(self.config)
+        manager.remove_abbreviation("RF")
+        self.config.write_text(self.SOURCE.replace("Learning", "Learning patterns"), encoding="utf-8")
+
+        self.assertFalse(manager.save_abbreviations())
+        self.assertIn('"RF"', self.config.read_text(encoding="utf-8"))
+
+
+class AbbreviationStoreTest(unittest.TestCase):
+    def test_duplicates_are_indexed_and_removed_by_id(self):
+        entries = [Abbreviation(f"Term {i}", f"T{i}") for i in range(1000)]
+        entries += [Abbreviation("Another term", "T999"), Abbreviation("Lower", "t999")]
+        store = AbbreviationStore(entries)
+
+        self.assertEqual(store.duplicate_shorts(), {"T999": 2})
+        self.assertEqual(store.case_variants(), [["T999", "t999"]])
+        self.assertEqual(store.remove("T999").key, "Term 999")
+        self.assertEqual(store.get("T999").key, "Another term")
+        self.assertEqual(store.duplicate_shorts(), {})
+        self.assertEqual(len(store), 1001)
+        self.assertEqual([entry.key for entry in store.find_folded("T999")], ["Another term", "Lower"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import locale
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from manage_terms import (analyze_links, build_glossary_layout, collation_key, find_near_duplicates, load_entries,
+                          term_grams, write_backlinks)
+from typst_data import load_array
+from term_records import GlossaryTerm
+from typst_data import TypstParseError
+
+from . import SCRIPTS_DIR
+
+
+class LoadFailureTest(unittest.TestCase):
+    """A config file that cannot be read must fail, not look empty."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.glossary = Path(self._tmp.name) / "glossary.typ"
+        self.glossary.write_text('#let glossary-entries = (\n  (term: "A", definition: "x"\n',
+                                 encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_load_entries_raises(self):
+        with self.assertRaises(TypstParseError):
+            load_entries(str(self.glossary), "glossary", use_cache=False)
+
+    def test_validate_exits_non_zero(self):
+        result = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "manage_terms.py"), "validate", "--type", "glossary",
+             "--no-cache", "--input", str(self.glossary)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False,
+        )
+        self.assertEqual(result.returncode, 1, result.stdout)
+        self.assertNotIn("Validation passed", result.stdout)
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_punctuation_and_case_are_ignored(self):
+        self.assertEqual(term_grams("Peer-review"), term_grams("peer  Review"))
+        pairs = find_near_duplicates([GlossaryTerm("Peer-review"), GlossaryTerm("Thesis"),
+                                      GlossaryTerm("Peer Review")])
+        self.assertEqual(pairs, [{"entries": [0, 2], "terms": ["Peer-review", "Peer Review"], "score": 1.0}])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        words = ["data", "model", "neural", "network", "learning", "deep", "graph", "theory"]
+        terms = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 3))) + rng.choice(["", "s", "ing"])
+                 for _ in range(150)]
+        entries = [GlossaryTerm(term) for term in terms]
+
+        for threshold in (0.6, 0.75, 0.9):
+            expected = set()
+            for i in range(len(terms)):
+                for j in range(i + 1, len(terms)):
+                    a, b = term_grams(terms[i]), term_grams(terms[j])
+                    shared = len(a & b)
+                    if shared >= 2 and 2 * shared / (len(a) + len(b)) >= threshold:
+                        expected.add((i, j))
+            found = {tuple(pair["entries"]) for pair in find_near_duplicates(entries, threshold=threshold)}
+            self.assertEqual(found, expected, threshold)
+
+
+class RelatedLinksTest(unittest.TestCase):
+    ENTRIES = [
+        GlossaryTerm("Thesis", category="Academic", related=("Research", "Dissertation")),
+        GlossaryTerm("Research", category="Research", related=("Thesis", "Method")),
+        GlossaryTerm("Method", category="Research", related=("Approach",)),
+        GlossaryTerm("Approach", category="Research", related=("Method",)),
+        GlossaryTerm("Citation", category="Academic"),
+    ]
+
+    def test_report(self):
+        report = analyze_links(self.ENTRIES)
+
+        self.assertEqual(report["terms"], 5)
+        self.assertEqual(report["links"], 6)
+        self.assertEqual(report["dangling"], [["Thesis", "Dissertation"]])
+        self.assertEqual(report["asymmetric"], [["Research", "Method"]])
+        self.assertEqual(sorted(map(sorted, report["cycles"])), [["Approach", "Method"], ["Research", "Thesis"]])
+        self.assertEqual(report["components"], [["Thesis", "Research", "Method", "Approach"], ["Citation"]])
+        self.assertEqual(report["isolated_categories"], [])
+        self.assertEqual(report["reverse"], {"Research": ["Thesis"], "Thesis": ["Research"],
+                                             "Method": ["Research", "Approach"], "Approach": ["Method"]})
+
+    def test_deep_chain_does_not_recurse(self):
+        chain = [GlossaryTerm(f"T{i}", related=(f"T{i + 1}",)) for i in range(5000)]
+        chain.append(GlossaryTerm("T5000", related=("T0",)))
+
+        self.assertEqual(len(analyze_links(chain)["cycles"][0]), 5001)
+
+    def test_backlink_module_parses(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "glossary-links.typ"
+            write_backlinks(analyze_links(self.ENTRIES), str(path))
+
+            self.assertEqual(load_array(path, "glossary-link-source").entries[0],
+                             ["Thesis", ["Research", "Dissertation"]])
+            self.assertIn('"Method": ("Research", "Approach"),', path.read_text(encoding="utf-8"))
+
+
+class NonStringValuesTest(unittest.TestCase):
+    """Wrong value types are validation errors, not crashes."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def validate(self, data_type: str, text: str) -> subprocess.CompletedProcess:
+        path = self.dir / ("abbreviations.typ" if data_type == "abbreviations" else "glossary.typ")
+        path.write_text(text, encoding="utf-8")
+        return subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "manage_terms.py"), "validate", "--type", data_type,
+             "--no-cache", "--input", str(path)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False,
+        )
+
+    def test_abbreviations(self):
+        result = self.validate("abbreviations", "#let abbreviations = (\n"
+                               '  (key: 1, short: 2, long: "x", category: ("a",)),\n'
+                               '  (key: "b", short: "B", long: 3),\n)\n')
+
+        self.assertEqual(result.returncode, 1, result.stdout)
+        self.assertIn("Entry 0 field 'key' must be a non-empty string", result.stdout)
+        self.assertIn("Entry 1 field 'long' must be a non-empty string", result.stdout)
+        self.assertNotIn("Traceback", result.stdout)
+
+    def test_glossary(self):
+        result = self.validate("glossary", "#let glossary-entries = (\n"
+                               "  (term: 1, definition: 2, related: 3),\n)\n")
+
+        self.assertEqual(result.returncode, 1, result.stdout)
+        self.assertIn("Entry 0 field 'term' must be a non-empty string", result.stdout)
+        self.assertNotIn("Traceback", result.stdout)
+
+
+class GlossaryLayoutTest(unittest.TestCase):
+    TERMS = [
+        GlossaryTerm("zeta", "z", "Greek"),
+        GlossaryTerm("Élan", "e"),
+        GlossaryTerm("beta", "b", "Greek"),
+        GlossaryTerm("Alpha", "a", "Basics"),
+    ]
+
+    def test_dictionary_order_groups_and_pages(self):
+        with mock.patch.dict(sys.modules, {"icu": None}):
+            layout = build_glossary_layout(self.TERMS, "en", page_size=3)
+
+        self.assertEqual(layout["collation"], "unicode")
+        # Case and accents do not split the alphabet
+        self.assertEqual(layout["order_by_term"], [3, 2, 1, 0])
+        self.assertEqual(layout["category_order"], ["Basics", "General", "Greek"])
+        self.assertEqual(layout["category_groups"]["Greek"], [2, 0])
+        # Uncategorised entries sort last by category, the rest keep config order
+        self.assertEqual(layout["order_by_category"], [3, 0, 2, 1])
+        self.assertEqual(layout["pages"], [[3, 2, 1], [0]])
+
+    def test_zh_never_falls_back_to_code_points(self):
+        with mock.patch.dict(sys.modules, {"icu": None}), \
+                mock.patch("manage_terms.libc_locale.setlocale", side_effect=locale.Error):
+            with self.assertRaisesRegex(ValueError, "PyICU"):
+                collation_key("zh")
+
+    def test_build_and_check(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Path(tmp)
+            glossary = config / "glossary.typ"
+            glossary.write_text('#let glossary-entries = (\n  (term: "b", definition: "x"),\n'
+                                '  (term: "A", definition: "y"),\n)\n', encoding="utf-8")
+
+            def run(*extra: str) -> subprocess.CompletedProcess:
+                return subprocess.run(
+                    [sys.executable, str(SCRIPTS_DIR / "manage_terms.py"), "build", "--type", "glossary",
+                     "--no-cache", "--config-dir", str(config), *extra],
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False)
+
+            self.assertEqual(run().returncode, 0)
+            module = (config / "glossary-compiled.typ").read_text(encoding="utf-8")
+            self.assertIn("#let glossary-count = 2\n", module)
+            self.assertIn(f"#let glossary-source-size = {glossary.stat().st_size}\n", module)
+            self.assertIn("#let order-by-term = (1, 0)\n", module)
+            self.assertEqual(run("--check").returncode, 0)
+
+            glossary.write_text(glossary.read_text(encoding="utf-8").replace('"x"', '"xx"'), encoding="utf-8")
+            result = run("--check")
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("out of date", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
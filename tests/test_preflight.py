@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import preflight
+from preflight import BUILD_DIR, CompileJob
+
+from . import REPO_ROOT, install_stub_typst
+
+
+class CompileJobPathTest(unittest.TestCase):
+    def test_same_file_name_in_different_directories(self):
+        first = CompileJob(REPO_ROOT / "examples" / "chapter.typ", "print")
+        second = CompileJob(REPO_ROOT / "chapters" / "chapter.typ", "print")
+
+        self.assertNotEqual(first.log_path, second.log_path)
+        self.assertNotEqual(first.output_path, second.output_path)
+        self.assertEqual(first.log_path, BUILD_DIR / "print" / "examples" / "chapter.log")
+        self.assertEqual(first.output_path, BUILD_DIR / "print" / "examples" / "chapter-print.pdf")
+
+    def test_top_level_document(self):
+        job = CompileJob(REPO_ROOT / "thesis.typ", "default")
+
+        self.assertEqual(job.output_path, BUILD_DIR / "default" / "thesis.pdf")
+
+
+class StubProjectTestCase(unittest.TestCase):
+    """Runs preflight on a temporary project, compiled by the stub typst."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.root = base / "project"
+        self.root.mkdir()
+        install_stub_typst(base)
+        for patcher in (mock.patch.dict(os.environ, {"PATH": f"{base}{os.pathsep}{os.environ['PATH']}"}),
+                        mock.patch("preflight.REPO_ROOT", self.root),
+                        mock.patch("preflight.BUILD_DIR", self.root / "build" / "preflight")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, text: str) -> Path:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def make_slow(self, mebibytes: int) -> None:
+        """Make every compile take the stub about ``mebibytes`` seconds."""
+        self.write("filler.typ", "// " + "x" * (mebibytes << 20) + "\n")
+
+
+class MainOutputTest(StubProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("thesis.typ", '#include "chapters/intro.typ"\n')
+        self.write("chapters/intro.typ", "= Introduction\n")
+
+    def test_text_output_lists_every_artefact(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = preflight.main(["--document", str(self.root / "thesis.typ"),
+                                     "--extra", str(self.root / "chapters" / "intro.typ"),
+                                     "--profile", "default", "--profile", "print", "--no-cache", "--jobs", "2"])
+
+        self.assertEqual(status, 0, stdout.getvalue())
+        summary = stdout.getvalue().split("Preflight successful: 4 artefacts compiled.\n", 1)[1]
+        listed = [line.split(" (", 1)[0] for line in summary.splitlines() if line.startswith("  - ")]
+        self.assertEqual(sorted(listed), [
+            "  - build/preflight/default/chapters/intro.pdf",
+            "  - build/preflight/default/thesis.pdf",
+            "  - build/preflight/print/chapters/intro-print.pdf",
+            "  - build/preflight/print/thesis-print.pdf",
+        ])
+
+
+class CompileAllTest(StubProjectTestCase):
+    def test_timeout_kills_the_compile(self):
+        self.make_slow(2)
+        document = self.write("thesis.typ", "= Thesis\n")
+        started = time.monotonic()
+        with self.assertRaisesRegex(preflight.PreflightError, "timed out after 0.3s"):
+            preflight.compile_document(document, "default", timeout=0.3)
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertIn("[timed out after 0.3s]", CompileJob(document, "default").log_path.read_text(encoding="utf-8"))
+        self.assertFalse(CompileJob(document, "default").output_path.exists())
+
+    def test_failures_are_reported_together_without_fail_fast(self):
+        jobs = [CompileJob(self.write(f"{name}.typ", text), "default")
+                for name, text in (("broken", '#panic("no")\n'), ("thesis", "= Thesis\n"), ("other", '#panic("x")\n'))]
+        with self.assertRaises(preflight.PreflightError) as caught:
+            preflight.compile_all(jobs, 1)
+
+        message = str(caught.exception)
+        self.assertIn("broken.typ", message)
+        self.assertIn("other.typ", message)
+        self.assertNotIn("cancelled", message)
+        self.assertTrue(jobs[1].output_path.is_file())
+
+    def test_fail_fast_skips_queued_jobs(self):
+        jobs = [CompileJob(self.write(f"{name}.typ", text), "default")
+                for name, text in (("broken", '#panic("no")\n'), ("thesis", "= Thesis\n"), ("other", "= Other\n"))]
+        finished = []
+        with self.assertRaises(preflight.PreflightError) as caught:
+            preflight.compile_all(jobs, 1, fail_fast=True, on_result=lambda job, outcome: finished.append(job))
+
+        self.assertIn("2 remaining job(s) cancelled by --fail-fast.", str(caught.exception))
+        self.assertEqual(finished, jobs[:1])
+        self.assertFalse(jobs[1].output_path.exists())
+
+    def test_fail_fast_kills_running_jobs(self):
+        self.make_slow(3)
+        jobs = [CompileJob(self.write(f"{name}.typ", text), "default")
+                for name, text in (("thesis", "= Thesis\n"), ("broken", '#panic("no")\n'), ("other", "= Other\n"))]
+        outcomes = {}
+        started = time.monotonic()
+        with self.assertRaises(preflight.PreflightError) as caught:
+            preflight.compile_all(jobs, 2, fail_fast=True,
+                                  on_result=lambda job, outcome: outcomes.update({job.name.name: outcome}))
+
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertIn("2 remaining job(s) cancelled by --fail-fast.", str(caught.exception))
+        # The running job is killed; the queued one is cancelled, whether or not it got to start
+        self.assertIsInstance(outcomes["thesis"], preflight.JobCancelled)
+        self.assertIsInstance(outcomes.get("other"), (preflight.JobCancelled, type(None)))
+        self.assertIn("[cancelled]", jobs[0].log_path.read_text(encoding="utf-8"))
+        self.assertFalse(jobs[0].output_path.exists())
+        self.assertFalse(jobs[2].output_path.exists())
+
+    def test_cancel_before_start(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(preflight.JobCancelled):
+            preflight.compile_document(self.write("thesis.typ", "= Thesis\n"), "default", cancel=cancel)
+        self.assertFalse((self.root / "build").exists())
+
+
+class PlaceholderScanTest(StubProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.thesis = self.write("thesis.typ", '#import "config/meta.typ": title\n'
+                                               '#include "chapters/intro.typ"\n'
+                                               "= <title>\n")
+        self.write("config/meta.typ", '#let title = "<author> and <school>"\n')
+        self.write("chapters/intro.typ", "Intro über TODO: <degree>\n")
+        self.write("chapters/unused.typ", "<department>\n")
+
+    def found(self, **kwargs) -> list:
+        return [str(placeholder) for placeholder in preflight.scan_for_placeholders(self.thesis, **kwargs)]
+
+    def test_scans_the_include_closure_in_order(self):
+        self.assertEqual(self.found(), [
+            "chapters/intro.typ:1:18: placeholder '<degree>'",
+            "config/meta.typ:1:15: placeholder '<author>'",
+            "config/meta.typ:1:28: placeholder '<school>'",
+            "thesis.typ:3:3: placeholder '<title>'",
+        ])
+        self.assertTrue((self.root / ".typst-cache").is_dir())
+
+    def test_threads_and_memory_maps_give_the_same_findings(self):
+        expected = self.found()
+        self.assertEqual(self.found(workers=4), expected)
+        with mock.patch("preflight.MMAP_THRESHOLD", 1):
+            self.assertEqual(self.found(workers=2), expected)
+
+    def test_extra_strings_and_regexes(self):
+        pattern = preflight.placeholder_pattern(["<author> and"], [r"TODO:?"])
+        self.assertEqual(self.found(pattern=pattern), [
+            "chapters/intro.typ:1:12: placeholder 'TODO:'",
+            "chapters/intro.typ:1:18: placeholder '<degree>'",
+            "config/meta.typ:1:15: placeholder '<author> and'",
+            "config/meta.typ:1:28: placeholder '<school>'",
+            "thesis.typ:3:3: placeholder '<title>'",
+        ])
+
+    def test_bad_patterns_and_documents(self):
+        with self.assertRaisesRegex(preflight.PreflightError, "Invalid placeholder pattern"):
+            preflight.placeholder_pattern(regexes=["(unclosed"])
+        with self.assertRaisesRegex(preflight.PreflightError, "empty string"):
+            preflight.placeholder_pattern(regexes=["x*"])
+        with self.assertRaisesRegex(preflight.PreflightError, "does not exist"):
+            preflight.scan_for_placeholders(self.root / "missing.typ")
+
+
+class BaselineTest(unittest.TestCase):
+    @staticmethod
+    def metrics(document: str, wall: float, cached: bool = False) -> dict:
+        return {"profile": "default", "document": document, "cached": cached, "wall_seconds": wall,
+                "cpu_seconds": wall, "max_rss_bytes": 1024, "pdf_bytes": 2048, "pages": 3}
+
+    def test_write_keeps_other_jobs_and_old_figures_for_cache_hits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baseline" / "preflight.json"
+            preflight.write_baseline(path, [self.metrics("thesis.typ", 2.0), self.metrics("intro.typ", 1.0)])
+            preflight.write_baseline(path, [self.metrics("thesis.typ", 3.0), self.metrics("intro.typ", 9.0, True)])
+
+            stored = preflight.load_baseline(path)
+            self.assertEqual(stored["default/thesis.typ"]["wall_seconds"], 3.0)
+            self.assertEqual(stored["default/intro.typ"]["wall_seconds"], 1.0)
+            self.assertEqual(sorted(p.name for p in path.parent.iterdir()), ["preflight.json"])
+
+    def test_failed_write_leaves_the_old_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "preflight.json"
+            preflight.write_baseline(path, [self.metrics("thesis.typ", 2.0)])
+            before = path.read_text(encoding="utf-8")
+
+            with mock.patch("typst_data.os.replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    preflight.write_baseline(path, [self.metrics("thesis.typ", 5.0)])
+
+            self.assertEqual(path.read_text(encoding="utf-8"), before)
+            self.assertEqual(json.loads(before)["metrics"]["default/thesis.typ"]["wall_seconds"], 2.0)
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["preflight.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
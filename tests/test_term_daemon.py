@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from term_daemon import (INVALID_PARAMS, METHOD_NOT_FOUND, SERVER_ERROR, RpcError, TermClient, TermServer,
+                         TermService, handle_message)
+
+ABBREVIATIONS = """#let abbreviations = (
+  (key: "Machine Learning", short: "ML", long: "Learning from data."),
+  (key: "Markov Chain", short: "MC", long: "A memoryless process."),
+  (key: 42, short: "N", long: "Not a string key."),
+)
+"""
+GLOSSARY = """#let glossary-entries = (
+  (term: "Thesis", definition: "A long piece of writing."),
+  (term: "Theory", definition: "A system of ideas."),
+)
+"""
+
+
+class TermServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.abbreviations = self.dir / "abbreviations.typ"
+        self.abbreviations.write_text(ABBREVIATIONS, encoding="utf-8")
+        self.glossary = self.dir / "glossary.typ"
+        self.glossary.write_text(GLOSSARY, encoding="utf-8")
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.service = TermService(self.abbreviations, self.glossary)
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def call(self, method: str, params=None) -> dict:
+        request = {"jsonrpc": "2.0", "id": 1, "method": method}
+        if params is not None:
+            request["params"] = params
+        with contextlib.redirect_stderr(io.StringIO()):
+            return handle_message(self.service, self.lock, json.dumps(request).encode())
+
+    def test_lookup_and_search(self):
+        self.assertEqual(self.call("lookup", {"short": "ML"})["result"]["key"], "Machine Learning")
+        self.assertEqual(self.call("lookup", ["MC"])["result"]["key"], "Markov Chain")
+        self.assertIsNone(self.call("lookup", {"term": "Missing"})["result"])
+
+        result = self.call("search", {"prefix": "m"})["result"]
+        self.assertEqual([entry["short"] for entry in result["abbreviations"]], ["ML", "MC"])
+        result = self.call("search", {"prefix": "THE", "source": "glossary", "limit": 1})["result"]
+        self.assertEqual([entry["term"] for entry in result["glossary"]], ["Theory"])
+
+    def test_error_codes(self):
+        self.assertEqual(self.call("nope")["error"]["code"], METHOD_NOT_FOUND)
+        self.assertEqual(self.call("lookup", {"abbrev": "ML"})["error"]["code"], INVALID_PARAMS)
+        self.assertEqual(self.call("ping", ["extra"])["error"]["code"], INVALID_PARAMS)
+        self.assertEqual(self.call("ping", 5)["error"]["code"], INVALID_PARAMS)
+        # A TypeError inside a method is a server error, not a bad call
+        error = self.call("lookup", {"short": ["ML"]})["error"]
+        self.assertEqual(error["code"], SERVER_ERROR)
+        self.assertIn("unhashable", error["message"])
+
+    def test_notification_gets_no_reply(self):
+        line = json.dumps({"jsonrpc": "2.0", "method": "ping"}).encode()
+        self.assertIsNone(handle_message(self.service, self.lock, line))
+
+    def test_edits_are_saved_and_outside_changes_reloaded(self):
+        self.assertEqual(self.call("add", {"key": "Random Forest", "short": "RF"})["result"]["total"], 4)
+        self.assertIn('short: "RF"', self.abbreviations.read_text(encoding="utf-8"))
+        self.assertEqual(self.call("add", {"key": "Other", "short": "RF"})["error"]["code"], SERVER_ERROR)
+
+        self.glossary.write_text(GLOSSARY.replace("Theory", "Thermodynamics"), encoding="utf-8")
+        stat = self.glossary.stat()
+        os.utime(self.glossary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.call("lookup", {"term": "Thermodynamics"})["result"]["term"], "Thermodynamics")
+
+
+class TermServerTest(unittest.TestCase):
+    def test_round_trip_over_the_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "abbreviations.typ").write_text(ABBREVIATIONS, encoding="utf-8")
+            (directory / "glossary.typ").write_text(GLOSSARY, encoding="utf-8")
+            with contextlib.redirect_stderr(io.StringIO()):
+                service = TermService(directory / "abbreviations.typ", directory / "glossary.typ")
+            socket_path = directory / "daemon.sock"
+            with TermServer(socket_path, service) as server:
+                thread = threading.Thread(target=server.serve_forever, daemon=True)
+                thread.start()
+                try:
+                    with TermClient(socket_path) as client:
+                        self.assertEqual(client.call("ping"), "pong")
+                        self.assertEqual(client.call("lookup", {"short": "MC"})["key"], "Markov Chain")
+                        with self.assertRaises(RpcError):
+                            client.call("lookup", {})
+                finally:
+                    server.shutdown()
+                    thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import unittest
+
+from term_records import Abbreviation, GlossaryTerm
+
+
+class RecordTest(unittest.TestCase):
+    def test_abbreviation_round_trip_keeps_unknown_fields(self):
+        data = {"key": "Machine Learning", "short": "ML", "long": "x", "category": "Methods", "plural": "MLs"}
+        entry = Abbreviation.from_dict(data)
+
+        self.assertEqual(entry.extra, (("plural", "MLs"),))
+        self.assertEqual(entry.to_dict(), data)
+        self.assertEqual(Abbreviation.from_dict({"key": "A", "short": "B"}).to_dict(),
+                         {"key": "A", "short": "B", "long": ""})
+
+    def test_glossary_terms_share_interned_strings(self):
+        first = GlossaryTerm.from_dict({"term": "".join(["The", "sis"]), "definition": "x",
+                                        "category": "".join(["Acad", "emic"])})
+        second = GlossaryTerm.from_dict({"term": "Research", "definition": "y", "category": "Academic",
+                                         "related": ["".join(["Th", "esis"])]})
+
+        self.assertIs(first.category, second.category)
+        self.assertIs(second.related[0], first.term)
+        self.assertEqual(second.to_dict()["related"], ["Thesis"])
+        self.assertNotIn("related", first.to_dict())
+
+    def test_records_are_compact(self):
+        entry = GlossaryTerm("Thesis")
+        self.assertFalse(hasattr(entry, "__dict__"))
+        with self.assertRaises(AttributeError):
+            entry.term = "Other"
+
+    def test_wrong_types_are_kept_for_validation(self):
+        self.assertEqual(Abbreviation.from_dict({"key": 1, "short": None}).key, 1)
+        self.assertEqual(GlossaryTerm.from_dict({"term": "A", "related": "B"}).related, ("B",))
+
+
+if __name__ == "__main__":
+    unittest.main()
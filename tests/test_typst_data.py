@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import typst_data
+from typst_data import TypstParseError, blank_comments, load_array_cached, parse_arguments, parse_array
+
+
+def _entries(body: str) -> list:
+    return parse_array(f"#let items = (\n{body},\n)\n", "items").entries
+
+
+class FlatEntryTest(unittest.TestCase):
+    """The regex fast path must agree with the full parser or step aside."""
+
+    def test_parentheses_inside_array_strings(self):
+        self.assertEqual(
+            _entries('(key: "a", related: ("foo (bar)", "baz"), long: "x")'),
+            [{"key": "a", "related": ["foo (bar)", "baz"], "long": "x"}],
+        )
+
+    def test_key_like_text_inside_array_strings(self):
+        self.assertEqual(
+            _entries('(key: "a", related: ("see: (x)", "y"))'),
+            [{"key": "a", "related": ["see: (x)", "y"]}],
+        )
+
+    def test_key_like_text_inside_strings(self):
+        self.assertEqual(_entries('(key: "a", long: "note: (b)")'), [{"key": "a", "long": "note: (b)"}])
+
+    def test_single_string_and_one_element_array(self):
+        self.assertEqual(
+            _entries('(a: ("x"), b: ("y",), c: ())'),
+            [{"a": "x", "b": ["y"], "c": []}],
+        )
+
+    def test_escapes(self):
+        self.assertEqual(_entries(r'(key: "say \"hi\" (\u{263A})")'), [{"key": 'say "hi" (☺)'}])
+
+
+class SourceScanTest(unittest.TestCase):
+    def test_blank_comments_keeps_offsets(self):
+        text = ('a // note\n#link("https://x.org") /* one /* two */ still */ b\n'
+                '`// raw` "// string" c\n```\n#import "x.typ"\n```\n')
+        blanked = blank_comments(text)
+
+        self.assertEqual(len(blanked), len(text))
+        self.assertEqual(blanked.count("\n"), text.count("\n"))
+        self.assertNotIn("note", blanked)
+        self.assertNotIn("still", blanked)
+        self.assertIn('#link("https://x.org")', blanked)
+        self.assertIn('`// raw` "// string" c', blanked)
+        self.assertIn('#import "x.typ"', blanked)
+        self.assertNotIn("import", blank_comments(text, raw=True))
+
+    def test_parse_arguments(self):
+        text = 'f("term", category: "C", entries: ("A": ("x": "1"),), subterm: none) rest'
+        positional, named, end = parse_arguments(text, 2)
+
+        self.assertEqual(positional, ["term"])
+        self.assertEqual(named, {"category": "C", "entries": {"A": {"x": "1"}}, "subterm": None})
+        self.assertEqual(text[end:], " rest")
+        with self.assertRaises(TypstParseError):
+            parse_arguments("f(term)", 2)
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name) / "cache"
+        self.path = Path(self._tmp.name) / "items.typ"
+        self.write('(key: "a"),')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, body: str, age_seconds: int = 60) -> None:
+        self.path.write_text(f"#let items = (\n  {body}\n)\n", encoding="utf-8")
+        # Old enough that size and mtime alone can be trusted
+        mtime = self.path.stat().st_mtime - age_seconds
+        os.utime(self.path, (mtime, mtime))
+
+    def test_unchanged_file_is_not_read_or_parsed(self):
+        first, digest = load_array_cached(self.path, "items", self.cache_dir)
+        with mock.patch.object(Path, "read_text", side_effect=AssertionError("read")):
+            second, cached_digest = load_array_cached(self.path, "items", self.cache_dir)
+
+        self.assertEqual(second.entries, first.entries)
+        self.assertEqual(list(second.spans), list(first.spans))
+        self.assertEqual(cached_digest, digest)
+
+    def test_same_size_edit_is_noticed(self):
+        load_array_cached(self.path, "items", self.cache_dir)
+        # Same size, and an mtime inside the racy window of the cache write
+        self.write('(key: "b"),', age_seconds=0)
+
+        self.assertEqual(load_array_cached(self.path, "items", self.cache_dir)[0].entries, [{"key": "b"}])
+
+    def test_touched_file_reuses_the_parse(self):
+        load_array_cached(self.path, "items", self.cache_dir)
+        os.utime(self.path)
+        with mock.patch.object(typst_data, "parse_array", side_effect=AssertionError("parsed")):
+            parsed, _ = load_array_cached(self.path, "items", self.cache_dir)
+
+        self.assertEqual(parsed.entries, [{"key": "a"}])
+
+    def test_corrupt_cache_is_ignored(self):
+        load_array_cached(self.path, "items", self.cache_dir)
+        for cache_file in self.cache_dir.iterdir():
+            cache_file.write_bytes(b"garbage")
+
+        self.assertEqual(load_array_cached(self.path, "items", self.cache_dir)[0].entries, [{"key": "a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from typst_deps import DependencyGraph, scan_references
+
+
+class ScanTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scan(self, text: str):
+        path = self.root / "source.typ"
+        path.write_text(text, encoding="utf-8")
+        return scan_references(path, self.root)
+
+    def test_comments_and_raw_text_are_skipped(self):
+        node = self.scan('#import "kept.typ": *\n'
+                         '// #import "line.typ": *\n'
+                         '/* #include "block.typ" */\n'
+                         '```\n#include "raw.typ"\nimport numpy as np\n```\n')
+
+        self.assertEqual(node.modules, [str(self.root / "kept.typ")])
+        self.assertFalse(node.dynamic)
+
+    def test_only_paths_built_at_run_time_are_dynamic(self):
+        passed_on = ('#import "@preview/cetz:0.3.1"\n'
+                     '#let thesis-image(path, ..args) = image(path, ..args)\n'
+                     '#let refs(path) = bibliography(path, style: "apa")\n'
+                     '#bibliography(("a.bib", "b.bib"))\n'
+                     '#let figure-path = "figures/plot.png"\n#image(figure-path)\n'
+                     '#canvas({\n  import cetz.draw: *\n})\n')
+        self.assertFalse(self.scan(passed_on).dynamic)
+
+        for built in ('#image("figures/" + name + ".png")\n',
+                      '#let figure-path = "figures/" + name\n#image(figure-path, width: 50%)\n',
+                      '#include str(chapter) + ".typ"\n',
+                      '#let chapter = "chapters/" + name\n#include chapter\n'):
+            with self.subTest(built=built):
+                self.assertTrue(self.scan(built).dynamic)
+
+
+class AffectedTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        files = {
+            "thesis.typ": '#import "lib.typ": *\n#include "chapters/one.typ"\n#image("figures/one.png")\n',
+            "sample-chapter.typ": '#import "lib.typ": *\n#include "chapters/two.typ"\n',
+            "lib.typ": "#let helper(path) = image(path)\n",
+            "chapters/one.typ": "= One\n",
+            "chapters/two.typ": '= Two\n#helper("figures/two.png")\n',
+            "chapters/unused.typ": "= Unused\n",
+            "figures/one.png": "",
+            "figures/two.png": "",
+        }
+        for name, text in files.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        self.graph = DependencyGraph(self.root, persist=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def affected(self, *names: str):
+        return [self.graph.relative(path) for path in self.graph.affected([self.root / name for name in names])]
+
+    def test_targets_are_told_apart(self):
+        self.assertEqual(self.affected("chapters/one.typ"), ["thesis.typ"])
+        self.assertEqual(self.affected("figures/two.png"), ["sample-chapter.typ"])
+        self.assertEqual(self.affected("lib.typ"), ["thesis.typ", "sample-chapter.typ"])
+        self.assertEqual(self.affected("chapters/unused.typ"), [])
+        self.assertNotIn(self.root / "thesis.typ", self.graph.closure(self.root / "sample-chapter.typ").paths)
+
+    def test_dynamic_target_may_read_any_asset_or_module(self):
+        (self.root / "sample-chapter.typ").write_text(
+            '#import "lib.typ": *\n#include "chapters/" + "two.typ"\n', encoding="utf-8")
+
+        self.assertEqual(self.affected("chapters/unused.typ"), ["sample-chapter.typ"])
+        self.assertEqual(self.affected("figures/one.png"), ["thesis.typ", "sample-chapter.typ"])
+
+
+if __name__ == "__main__":
+    unittest.main()
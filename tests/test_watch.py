@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from compile_cache import CompileCache
+from watch import Builder, WatchJob
+
+from . import install_stub_typst
+
+SOURCE = '#let figure-path = "figures/" + "plot.png"\n#image(figure-path)\n'
+
+
+class BuilderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.root = base / "project"
+        (self.root / "figures").mkdir(parents=True)
+        (self.root / "figures" / "plot.png").write_bytes(b"png")
+        self.targets = []
+        for name in ("thesis", "sample-chapter"):
+            target = self.root / f"{name}.typ"
+            target.write_text(f"{SOURCE}{name}\n", encoding="utf-8")
+            self.targets.append(target)
+        install_stub_typst(base)
+        patcher = mock.patch.dict(os.environ, {"PATH": f"{base}{os.pathsep}{os.environ['PATH']}"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = CompileCache(base / "cache", root=self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_targets_hit_the_cache_after_each_other_compiled(self):
+        jobs = [WatchJob(target, profile) for profile in ("default", "draft") for target in self.targets]
+        builder = Builder(1, self.root, self.cache)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                builder.request(jobs)
+                builder.wait()
+                # As after a change batch: relist assets, now including the outputs
+                self.cache.refresh()
+                builder.request(jobs)
+                builder.wait()
+        finally:
+            builder.close()
+
+        self.assertEqual(self.cache.misses, len(jobs))
+        self.assertEqual(self.cache.hits, len(jobs))
+        for job in jobs:
+            self.assertTrue(job.output_path.is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()